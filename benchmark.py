@@ -0,0 +1,644 @@
+"""
+Benchmarks for the Iowa Events Scraper
+======================================
+Run:  python benchmark.py                    # micro-benchmarks vs. the original code
+      python benchmark.py pipeline           # scrape/filter/dedup/export at 1k, 100k, 1M events
+      python benchmark.py pipeline --sizes 1k,100k --output bench.json --compare previous.json
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import tempfile
+import time
+import timeit
+import threading
+import tracemalloc
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from dataclasses import asdict, make_dataclass, replace
+from datetime import date, timedelta
+
+import scraper_v5_comprehensive as scraper
+from scraper_v5_comprehensive import (
+    IowaEventsScraper, parse_date_range, TODAY, FIELDS, Event, EventStore, write_json, write_csv, _intern, _STR_FIELDS,
+    IOWA_COORDS, SOURCES, Source, GeoIndex, EventIndex, deduplicate,
+)
+
+
+def static_events() -> list:
+    """Every event in the static source tables, past ones included."""
+    s = IowaEventsScraper()
+    s._is_future_event = lambda _: True
+    for src in SOURCES.values():
+        getattr(s, src.parser)()
+    return s.events
+
+
+# ==================== SYNTHETIC DATA ====================
+WORDS = ("iowa state county city river valley prairie summer winter spring fall classic open invitational "
+         "festival fair market show expo night day weekend family kids youth jazz blues rock country music "
+         "art film food beer wine rodeo race run marathon bike ride hockey soccer softball baseball basketball "
+         "volleyball wrestling pickleball golf tennis swim track football cup series championship league "
+         "heritage harvest pumpkin holiday lights parade fireworks carnival concert symphony theatre comedy "
+         "gala dinner luncheon breakfast summit meeting mixer tour walk trail farm zoo science museum library "
+         "tulip balloon kite dam bridge lake park downtown main street old new grand great big little").split()
+CATEGORIES = ("kids_athletics", "sports", "family", "running", "fair", "community", "entertainment",
+              "college_sports", "high_school_sports")
+
+
+def synthetic_events(n, seed=42, dup_rate=0.1, towns=500) -> list:
+    """``n`` plausible events; ``dup_rate`` of them re-list an earlier event
+    from another source with a longer title and a month-only date."""
+    rng = random.Random(seed)
+    coords = dict(IOWA_COORDS)
+    coords.update((f"Town {i}", (41 + rng.random() * 2.5, -96 + rng.random() * 5)) for i in range(towns))
+    cities = list(coords)
+    start = date(2026, 1, 1)
+    events = []
+    for i in range(n):
+        if events and rng.random() < dup_rate:
+            e = events[rng.randrange(len(events))]
+            first = parse_date_range(e.date).start
+            events.append(replace(e, title=f"{e.title} Tournament", date=f"{first:%B %Y}",
+                                  time=None, source="Travel Iowa", age_group="All ages"))
+            continue
+        d = start + timedelta(days=rng.randrange(365))
+        span = rng.choice((0, 0, 0, 1, 2, 6))
+        end = d + timedelta(days=span)
+        if not span:
+            dt = f"{d:%B} {d.day}, {d.year}"
+        elif end.month == d.month:
+            dt = f"{d:%B} {d.day}-{end.day}, {d.year}"
+        else:
+            dt = f"{d:%B} {d.day} - {end:%B} {end.day}, {end.year}"
+        city = rng.choice(cities)
+        lat, lng = coords[city]
+        events.append(Event(
+            title=" ".join(rng.sample(WORDS, rng.randint(2, 4))).title(), date=dt,
+            time=rng.choice(("All day", "7:00 PM", "8:00 AM", None)), location=f"{city}, IA",
+            venue=f"{city} Events Center", category=rng.choice(CATEGORIES), subcategory=None,
+            source="Synthetic", source_url="https://example.com/events/", city=city,
+            latitude=lat, longitude=lng,
+        ))
+    return events
+
+
+# ==================== DATE PARSING ====================
+def legacy_is_future_event(date_str: str) -> bool:
+    """The original `_is_future_event`, kept here as the comparison baseline."""
+    if not date_str:
+        return True
+    months = {
+        'january': 1, 'february': 2, 'march': 3, 'april': 4,
+        'may': 5, 'june': 6, 'july': 7, 'august': 8,
+        'september': 9, 'october': 10, 'november': 11, 'december': 12,
+        'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'jun': 6,
+        'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+    }
+    date_lower = date_str.lower()
+    for month_name, month_num in months.items():
+        if month_name in date_lower:
+            year_match = re.search(r'20(\d{2})', date_str)
+            if year_match:
+                year = int(f"20{year_match.group(1)}")
+                day_match = re.search(r'(\d{1,2})', date_str)
+                day = int(day_match.group(1)) if day_match else 1
+                try:
+                    event_date = date(year, month_num, min(day, 28))
+                    return event_date >= TODAY
+                except:
+                    pass
+    return True
+
+
+def source_date_strings():
+    """Every distinct date string the static source tables produce."""
+    return sorted({e.date for e in static_events()})
+
+
+def bench_date_parser(rows=100_000, repeat=3):
+    dates = source_date_strings()
+    column = [dates[i % len(dates)] for i in range(rows)]
+    current = IowaEventsScraper()._is_future_event
+
+    def run_legacy():
+        for d in column:
+            legacy_is_future_event(d)
+
+    def run_current():
+        for d in column:
+            current(d)
+
+    parse_date_range.cache_clear()
+    legacy = min(timeit.repeat(run_legacy, number=1, repeat=repeat))
+    now = min(timeit.repeat(run_current, number=1, repeat=repeat))
+    print(f"Date filter over {rows:,} rows ({len(dates)} distinct strings)")
+    print(f"  legacy _is_future_event: {legacy:8.3f}s  {legacy / rows * 1e6:6.2f} us/row")
+    print(f"  parse_date_range:        {now:8.3f}s  {now / rows * 1e6:6.2f} us/row  ({legacy / now:.1f}x)")
+    diffs = [d for d in dates if legacy_is_future_event(d) != current(d)]
+    if diffs:
+        print(f"  {len(diffs)} strings filtered differently (legacy misreads ranges / clamps days):")
+        for d in diffs:
+            print(f"    {d!r}: legacy={legacy_is_future_event(d)} parsed={parse_date_range(d)}")
+
+
+# ==================== WRITERS ====================
+def legacy_save_json(f, events):
+    data = {"scraped_at": "", "total_events": len(events), "events": [asdict(e) for e in events]}
+    json.dump(data, f, indent=2)
+
+
+def legacy_save_csv(f, events):
+    w = csv.DictWriter(f, fieldnames=list(FIELDS))
+    w.writeheader()
+    for e in events:
+        w.writerow(asdict(e))
+
+
+def bench_writers(rows=100_000, repeat=3):
+    base = static_events()
+    events = [base[i % len(base)] for i in range(rows)]
+    cases = [
+        ("json  legacy asdict+dump", lambda f: legacy_save_json(f, events)),
+        ("json  streaming", lambda f: write_json(f, events, "")),
+        ("json  streaming compact", lambda f: write_json(f, events, "", indent=False)),
+        ("csv   legacy DictWriter", lambda f: legacy_save_csv(f, events)),
+        ("csv   streaming", lambda f: write_csv(f, events)),
+    ]
+    print(f"Writers over {rows:,} events")
+    for name, fn in cases:
+        t = min(timeit.repeat(lambda: fn(io.StringIO()), number=1, repeat=repeat))
+        print(f"  {name:26s} {t:8.3f}s")
+    bench_export(events, repeat)
+
+
+def bench_export(events, repeat=3):
+    """json + csv + jsonl and their .gz copies: one file after another vs ``export``."""
+    with tempfile.TemporaryDirectory() as d:
+        paths = [os.path.join(d, f"events{ext}") for ext in (".json", ".csv", ".jsonl")]
+        paths += [f"{p}.gz" for p in paths]
+        out = IowaEventsScraper()
+        out.events = events
+        writers = {".json": out.save_to_json, ".csv": out.save_to_csv, ".jsonl": out.save_to_jsonl}
+
+        def one_by_one():
+            for p in paths:
+                writers[scraper.export_format(p)](p)
+
+        scraper.logger.disabled = True
+        try:
+            print(f"Export of {len(paths)} files ({', '.join(os.path.basename(p) for p in paths)})")
+            for name, fn in (("save_to_* one by one", one_by_one), ("export (shared rows)", lambda: out.export(paths))):
+                t = min(timeit.repeat(fn, number=1, repeat=repeat))
+                print(f"  {name:26s} {t:8.3f}s")
+        finally:
+            scraper.logger.disabled = False
+
+
+# ==================== MEMORY ====================
+# The original Event: a plain dataclass with a per-instance __dict__
+LegacyEvent = make_dataclass("LegacyEvent", [(f, object) for f in FIELDS])
+
+
+def _measure(build):
+    tracemalloc.start()
+    obj = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size
+
+
+def bench_memory(rows=200_000):
+    base = [asdict(e) for e in static_events()]
+    # Round-trip through JSON so every row owns fresh string objects, as when
+    # aggregating shard files; titles get a suffix so they stay distinct.
+    text = json.dumps([dict(base[i % len(base)], title=f"{base[i % len(base)]['title']} #{i}") for i in range(rows)])
+
+    def legacy():
+        return [LegacyEvent(**d) for d in json.loads(text)]
+
+    def slots():
+        return [Event(**{k: (_intern(v) if k in _STR_FIELDS and k not in ("title", "description") else v)
+                         for k, v in d.items()}) for d in json.loads(text)]
+
+    def columnar():
+        store = EventStore()
+        for d in json.loads(text):
+            store.append(Event(**d))
+        return store
+
+    print(f"Resident memory for {rows:,} events")
+    baseline = None
+    for name, build in (("dataclass (original)", legacy), ("slots + interned", slots), ("EventStore columnar", columnar)):
+        obj, size = _measure(build)
+        assert len(obj) == rows
+        baseline = baseline or size
+        print(f"  {name:22s} {size / rows:8.1f} bytes/event  ({baseline / size:.1f}x)")
+        del obj
+
+
+# ==================== DEDUPLICATION ====================
+def bench_dedup(rows=500_000, dup_rate=0.1):
+    events = synthetic_events(rows, dup_rate=dup_rate)
+    parse_date_range.cache_clear()
+    t = time.perf_counter()
+    unique = deduplicate(events)
+    elapsed = time.perf_counter() - t
+    print(f"Dedup over {rows:,} events: {elapsed:.2f}s ({elapsed / rows * 1e6:.1f} us/event), "
+          f"{rows - len(unique):,} merged")
+    # one city of near-identical undated or year-long titles: every pair shares
+    # three words, so only the prefix filter keeps this from being quadratic
+    for label in ("TBA", "2026"):
+        similar = [Event(title=f"Open Gym Night {i}", date=label, time=None, location="Bettendorf, IA",
+                         venue="TBK", category="kids_athletics", subcategory=None, source="TBK",
+                         source_url="https://example.com/open-gym", city="Bettendorf") for i in range(6000)]
+        t = time.perf_counter()
+        deduplicate(similar)
+        print(f"  6,000 similar titles dated {label!r}: {time.perf_counter() - t:.2f}s")
+
+
+def bench_merge(rows=200_000, shards=8):
+    """k-way merge of shard partial files vs deduplicating everything in memory."""
+    events = synthetic_events(rows)
+    with tempfile.TemporaryDirectory() as d:
+        paths = []
+        for k in range(shards):
+            part = scraper.assign_ids(deduplicate(events[k::shards]))
+            paths.append(os.path.join(d, f"part-{k + 1}-of-{shards}.jsonl"))
+            scraper.write_partial(paths[-1], part, {"shard": f"{k + 1}/{shards}"})
+        print(f"Merging {shards} partial files of {rows:,} events")
+        cases = (("load all + deduplicate",
+                  lambda: len(deduplicate([e for p in paths for e in scraper.read_partial(p)[1]]))),
+                 ("streaming merge_partials", lambda: sum(1 for _ in scraper.merge_partials(paths))))
+        for name, run in cases:
+            parse_date_range.cache_clear()
+            tracemalloc.start()
+            t = time.perf_counter()
+            n = run()
+            elapsed = time.perf_counter() - t
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"  {name:26s} {elapsed:8.2f}s  peak {peak / 2**20:7.1f} MiB  {n:,} events")
+
+
+# ==================== GEO ====================
+def bench_radius(rows=1_000_000, queries=1000, miles=10):
+    index = GeoIndex(synthetic_events(rows))
+    rng = random.Random(1)
+    points = [(41 + rng.random() * 2.5, -96 + rng.random() * 5) for _ in range(queries)]
+    t = time.perf_counter()
+    found = sum(len(index.within(lat, lng, miles)) for lat, lng in points)
+    elapsed = time.perf_counter() - t
+    print(f"Radius queries ({miles} mi) over {rows:,} events: {elapsed / queries * 1e3:.3f} ms/query, "
+          f"{found / queries:.0f} events/query")
+    t = time.perf_counter()
+    for lat, lng in points:
+        index.within(lat, lng, miles, limit=50)
+    print(f"  nearest 50 only: {(time.perf_counter() - t) / queries * 1e3:.3f} ms/query")
+
+
+# ==================== QUERY ====================
+def bench_query(rows=1_000_000, queries=200):
+    events = synthetic_events(rows)
+    t = time.perf_counter()
+    index = EventIndex(events)
+    print(f"EventIndex over {rows:,} events: built in {time.perf_counter() - t:.2f}s")
+    rng = random.Random(7)
+    cities = list(IOWA_COORDS)
+    cases = []
+    for _ in range(queries):
+        first = date(2026, 1, 1) + timedelta(days=rng.randrange(330))
+        cases.append(dict(category=rng.choice(("kids_athletics", "sports", "family")), city=rng.choice(cities),
+                          start=first, end=first + timedelta(days=30)))
+    t = time.perf_counter()
+    hits = sum(len(index.select(**q)) for q in cases)
+    print(f"  category+city+30-day window: {(time.perf_counter() - t) / queries * 1e3:.3f} ms/query "
+          f"({hits / queries:.0f} hits)")
+    t = time.perf_counter()
+    for q in cases:
+        index.facets(("category", "city"), start=q["start"], end=q["end"])
+    print(f"  facets over a 30-day window: {(time.perf_counter() - t) / queries * 1e3:.3f} ms/query")
+    t = time.perf_counter()
+    for c in cities:
+        [e for e in events if e.category == "sports" and e.city == c]
+    print(f"  linear scan for comparison:  {(time.perf_counter() - t) / len(cities) * 1e3:.3f} ms/query")
+
+
+# ==================== SEARCH ====================
+def bench_search(rows=1_000_000, queries=50):
+    events = synthetic_events(rows)
+    t = time.perf_counter()
+    buf = scraper.pack_search_index(events)
+    print(f"Search index over {rows:,} events: built in {time.perf_counter() - t:.2f}s, {len(buf) / 2**20:.0f} MiB")
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.search")
+        with open(path, "wb") as f:
+            f.write(buf)
+        del buf
+        t = time.perf_counter()
+        index = scraper.SearchIndex.open(path)
+        print(f"  memory-mapped open:          {(time.perf_counter() - t) * 1e3:.3f} ms")
+        rng = random.Random(11)
+        cases = [f"{rng.choice(WORDS)} {rng.choice(list(IOWA_COORDS))} " for _ in range(queries)]
+        t = time.perf_counter()
+        hits = sum(len(index.search(q, 20)) for q in cases)
+        print(f"  word + city, top 20:         {(time.perf_counter() - t) / queries * 1e3:.3f} ms/query "
+              f"({hits / queries:.0f} hits)")
+        t = time.perf_counter()
+        for q in cases[:5]:
+            words = q.casefold().split()
+            [e for e in events if all(w in f"{e.title} {e.venue} {e.city}".casefold() for w in words)]
+        print(f"  substring scan for comparison: {(time.perf_counter() - t) / 5 * 1e3:.3f} ms/query")
+        del index
+
+
+# ==================== HTML PARSING ====================
+def tribe_page(n, seed=3) -> bytes:
+    """A The Events Calendar list page with ``n`` events and page chrome."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        title = " ".join(rng.choice(WORDS) for _ in range(4)).title()
+        day = date(2026, 1, 1) + timedelta(days=rng.randrange(365))
+        rows.append(
+            f'<div class="tribe-events-calendar-list__event-row"><article class="tribe-events-calendar-list__event '
+            f'tribe-events-calendar-list__event--featured post-{i} type-tribe_events">'
+            f'<div class="tribe-events-calendar-list__event-featured-image-wrapper"><img src="/img/{i}.jpg" alt=""></div>'
+            f'<header><time class="tribe-events-calendar-list__event-datetime" datetime="{day}">'
+            f'<span class="tribe-event-date-start">{day:%B %d} @ 7:00 pm</span></time>'
+            f'<h3 class="tribe-events-calendar-list__event-title"><a href="/event/{i}/">{title}</a></h3>'
+            f'<address class="tribe-events-calendar-list__event-venue"><span class="tribe-events-calendar-list__'
+            f'event-venue-title">{rng.choice(WORDS).title()} Hall</span> <span class="tribe-locality">'
+            f'{rng.choice(list(IOWA_COORDS))}</span></address></header>'
+            f'<div class="tribe-events-calendar-list__event-description"><p>{" ".join(rng.choices(WORDS, k=40))}'
+            f'</p></div></article></div>')
+    nav = "".join(f'<li><a href="/page/{i}">{w}</a></li>' for i, w in enumerate(WORDS))
+    return (f'<!DOCTYPE html><html><head><title>Events</title><link rel="stylesheet" href="/s.css"></head>'
+            f'<body><nav><ul>{nav}</ul></nav><div class="tribe-events-calendar-list">{"".join(rows)}</div>'
+            f'<footer>{nav}</footer></body></html>').encode()
+
+
+def _bs4_events(body, features):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(body, features)
+    found = []
+    for item in soup.select(".tribe-events-calendar-list__event"):
+        link = item.select_one(".tribe-events-calendar-list__event-title a")
+        when = item.select_one("time.tribe-events-calendar-list__event-datetime")
+        venue = item.select_one(".tribe-events-calendar-list__event-venue-title")
+        city = item.select_one(".tribe-locality")
+        desc = item.select_one(".tribe-events-calendar-list__event-description")
+        found.append({"name": link.get_text(" ", strip=True), "startDate": when.get("datetime"),
+                      "url": link.get("href"), "description": desc.get_text(" ", strip=True),
+                      "location": {"name": venue.get_text(strip=True), "address": {"addressLocality": city.get_text()}}})
+    return found
+
+
+def _lxml_tree_events(body):
+    from lxml import etree
+    sel = scraper.compile_selectors("tribe")
+    tree = etree.fromstring(body, etree.HTMLParser(encoding="utf-8"))
+    return [scraper._html_node(el, sel.fields) for el in tree.iter() if el.get("class") and sel.item(el)]
+
+
+def bench_html(sizes=(50, 2000), repeat=3):
+    """Same fixture page through BeautifulSoup, an lxml tree and the streaming parser."""
+    for n in sizes:
+        body = tribe_page(n)
+        cases = [
+            ("BeautifulSoup html.parser", lambda: _bs4_events(body, "html.parser")),
+            ("BeautifulSoup lxml builder", lambda: _bs4_events(body, "lxml")),
+            ("lxml tree + XPath", lambda: _lxml_tree_events(body)),
+            ("lxml streaming (page_events)", lambda: scraper.page_events(body, "tribe")),
+        ]
+        print(f"HTML parsing, {n:,} events ({len(body) / 1024:,.0f} KiB page)")
+        baseline = None
+        for name, fn in cases:
+            assert len(fn()) == n, name
+            t = min(timeit.repeat(fn, number=1, repeat=repeat))
+            baseline = baseline or t
+            print(f"  {name:30s} {t * 1e3:9.2f} ms  ({baseline / t:5.1f}x)")
+
+
+# ==================== POLITE FETCHING ====================
+class ThrottlingServer(ThreadingHTTPServer):
+    """Fake origin for ``Fetcher(base_url=...)``: serves ``/<host>/<path>`` and
+    answers 429 + Retry-After once a host gets more than ``limit`` requests in
+    any one-second window. ``crawl_delay`` maps hosts to a robots.txt Crawl-delay."""
+
+    daemon_threads = True
+
+    def __init__(self, limit=5, crawl_delay=None):
+        super().__init__(("127.0.0.1", 0), ThrottlingHandler)
+        self.limit = limit
+        self.crawl_delay = crawl_delay or {}
+        self.recent = defaultdict(deque)
+        self.counts = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def admit(self, host) -> bool:
+        now = time.monotonic()
+        with self.lock:
+            window = self.recent[host]
+            while window and window[0] <= now - 1:
+                window.popleft()
+            if len(window) >= self.limit:
+                self.counts[429] += 1
+                return False
+            window.append(now)
+            self.counts[200] += 1
+            return True
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        host, _, path = self.path.lstrip("/").partition("/")
+        if path == "robots.txt":
+            delay = self.server.crawl_delay.get(host)
+            body = f"User-agent: *\nCrawl-delay: {delay}\n" if delay else "User-agent: *\nDisallow:\n"
+            self._send(200, body.encode())
+        elif self.server.admit(host):
+            self._send(200, b"<html><body>ok</body></html>")
+        else:
+            self._send(429, b"slow down", {"Retry-After": "1"})
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        for k, v in {"Content-Length": str(len(body)), **(headers or {})}.items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def bench_fetch(pages=30, hosts=3, limit=5):
+    """Naive vs. polite fetching against a server that throttles each host to ``limit``/s."""
+    targets = [(f"s{i}", f"https://host{i % hosts}.test/page/{i}") for i in range(pages)]
+    cases = [
+        ("naive (no limit, no retries)", dict(rate=1000, burst=1000, retries=0, robots=False)),
+        ("retries only", dict(rate=1000, burst=1000, retries=5, robots=False)),
+        (f"token bucket at {limit}/s", dict(rate=limit, burst=1, retries=5)),
+        (f"token bucket at {limit * 3}/s, adaptive", dict(rate=limit * 3, burst=limit, retries=5)),
+        ("Crawl-delay 1s on host0", dict(rate=limit, burst=1, retries=5)),
+    ]
+    print(f"Fetching {pages} pages over {hosts} hosts, server allows {limit} req/s per host")
+    for name, opts in cases:
+        server = ThrottlingServer(limit, {"host0.test": 1} if "Crawl-delay" in name else None)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        fetcher = scraper.Fetcher(max_workers=16, per_host=8, timeout=30,
+                                  base_url=f"http://127.0.0.1:{server.server_port}", **opts)
+        t = time.perf_counter()
+        results = fetcher.fetch_all(targets)
+        elapsed = time.perf_counter() - t
+        fetcher.close()
+        server.shutdown()
+        server.server_close()
+        ok = sum(r.ok for r in results.values())
+        print(f"  {name:34s} {elapsed:6.2f}s  {ok:3d}/{pages} ok  {server.counts[429]:4d} x 429  "
+              f"{ok / elapsed:5.1f} pages/s")
+
+
+# ==================== PIPELINE ====================
+def parse_size(text: str) -> int:
+    """'1k' -> 1000, '1M' -> 1000000"""
+    text = text.strip()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1].lower(), 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def synthetic_sources(events, shards=8) -> list:
+    """Register ``shards`` throwaway sources that together emit ``events``."""
+    sources = []
+    for k in range(shards):
+        def add(self, chunk=events[k::shards]):
+            self.events.extend(e for e in chunk if self._is_future_event(e.date))
+        name = f"add_bench_shard_{k}"
+        setattr(IowaEventsScraper, name, add)
+        sources.append(Source(f"bench_{k}", f"Synthetic {k}", "https://example.com/", name, "community"))
+    return sources
+
+
+def pipeline_stages(n, workdir):
+    """(stage, callable) pairs for one pipeline size, built on fresh synthetic data."""
+    events = synthetic_events(n)
+    sources = synthetic_sources(events)
+    dates = [e.date for e in events]
+    out = IowaEventsScraper()
+    out.events = events
+
+    def scrape():
+        IowaEventsScraper().scrape_all(sources=sources)
+
+    def is_future():
+        parse_date_range.cache_clear()
+        keep = out._is_future_event
+        for d in dates:
+            keep(d)
+
+    return [
+        ("scrape_all", scrape),
+        ("_is_future_event", is_future),
+        ("_deduplicate", lambda: out._deduplicate(events)),
+        ("save_to_json", lambda: out.save_to_json(os.path.join(workdir, "events.json"))),
+        ("save_to_csv", lambda: out.save_to_csv(os.path.join(workdir, "events.csv"))),
+    ]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def run_pipeline(sizes, memory=True, repeat=1) -> dict:
+    """Time (best of ``repeat``) and, with ``memory``, separately trace the peak allocation of each stage.
+
+    ``TODAY`` is pinned to the synthetic data's first day so results do not
+    drift as the calendar moves.
+    """
+    scraper.TODAY = date(2026, 1, 1)
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in sizes:
+            for stage, fn in pipeline_stages(n, workdir):
+                best = min(timeit.repeat(fn, number=1, repeat=repeat))
+                row = {"stage": stage, "events": n, "seconds": round(best, 6)}
+                if memory:
+                    tracemalloc.start()
+                    fn()
+                    row["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                results.append(row)
+                peak = f"  peak {row['peak_bytes'] / 2**20:8.1f} MiB" if memory else ""
+                print(f"  {stage:18s} {n:>10,} events  {row['seconds']:9.3f}s{peak}")
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "today": scraper.TODAY.isoformat(),
+        "results": results,
+    }
+
+
+def compare(current: dict, previous: dict):
+    before = {(r["stage"], r["events"]): r for r in previous["results"]}
+    print(f"\nvs {previous.get('commit', '?')} (ratio > 1 means slower now)")
+    for r in current["results"]:
+        old = before.get((r["stage"], r["events"]))
+        if not old:
+            continue
+        line = f"  {r['stage']:18s} {r['events']:>10,}  time x{r['seconds'] / max(old['seconds'], 1e-9):5.2f}"
+        if "peak_bytes" in r and "peak_bytes" in old:
+            line += f"  memory x{r['peak_bytes'] / max(old['peak_bytes'], 1):5.2f}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Iowa Events Scraper benchmarks")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("micro", help="micro-benchmarks against the original implementations (default)")
+    pipe = sub.add_parser("pipeline", help="time and memory-profile each pipeline stage")
+    pipe.add_argument("--sizes", default="1k,100k,1M", help="comma-separated event counts (k/M suffixes)")
+    pipe.add_argument("--output", default="bench_results.json", help="where to write machine-readable results")
+    pipe.add_argument("--compare", metavar="FILE", help="earlier results file to compare against")
+    pipe.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    pipe.add_argument("--repeat", type=int, default=1, help="time each stage N times and keep the best")
+    args = parser.parse_args()
+
+    scraper.logger.disabled = True
+    if args.command == "pipeline":
+        report = run_pipeline([parse_size(x) for x in args.sizes.split(",")], not args.no_memory, args.repeat)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+        if args.compare:
+            with open(args.compare, encoding="utf-8") as f:
+                compare(report, json.load(f))
+        return
+
+    bench_date_parser()
+    bench_writers()
+    bench_memory()
+    bench_dedup()
+    bench_merge()
+    bench_radius()
+    bench_query()
+    bench_search()
+    bench_html()
+    bench_fetch()
+
+
+if __name__ == "__main__":
+    main()
@@ -17,15 +17,44 @@ Sources included:
 - Iowa Wolves Basketball
 """
 
+import io
 import json
 import csv
 import re
+import os
+import sys
+import math
+import hashlib
+import struct
+import time
+import argparse
+import random
+import bisect
+import heapq
+import itertools
+import calendar
+import difflib
+import threading
 from datetime import datetime, date
-from dataclasses import dataclass, asdict
-from typing import Optional, List
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict, replace
+from array import array
+from functools import lru_cache
+from operator import attrgetter
+from json.encoder import encode_basestring_ascii
+from typing import TYPE_CHECKING, Callable, Optional, List, Dict, Iterable, Iterator, Tuple, NamedTuple
+from urllib.parse import urljoin, urlsplit, parse_qs
 import logging
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+if TYPE_CHECKING:   # annotation-only; imported for real where they are used
+    import sqlite3
+    from urllib.robotparser import RobotFileParser
+    from lxml import etree
+
+# requests, lxml, sqlite3, pyarrow, http.server and the executor pools are
+# imported where they are used, so importing this module (or running a
+# command that never fetches) stays fast.
 logger = logging.getLogger(__name__)
 
 TODAY = date.today()
@@ -67,8 +96,189 @@ IOWA_COORDS = {
     "Moline": (41.5067, -90.5151),
 }
 
+USER_AGENT = "iowa-events-scraper/5 (+https://github.com/cwalter51/iowa-events-scraper)"
+# Bump when a change to page or date parsing changes the events a page yields;
+# fetch cache entries parsed by another version are re-parsed, and a static
+# date table compiled by another version is ignored until compile-static.
+PARSER_VERSION = 2
 
-@dataclass
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+GAZETTEER_PATH = os.path.join(DATA_DIR, "iowa_places.csv")
+STATIC_PATH = os.path.join(DATA_DIR, "static_events.json")
+
+
+class Region(NamedTuple):
+    code: str                                  # state suffix in "City, XX" locations
+    name: str
+    coords: Dict[str, Tuple[float, float]]     # city centroids seeding the geocoder
+    gazetteer: str                             # places/venues CSV for the geocoder
+
+
+REGIONS: Dict[str, Region] = {"IA": Region("IA", "Iowa", IOWA_COORDS, GAZETTEER_PATH)}
+DEFAULT_REGION = "IA"
+
+# ==================== DATE PARSING ====================
+_MONTH = r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+_DAY = r"\d{1,2}(?:st|nd|rd|th)?"
+_DASH = r"\s*(?:-|\u2013|\u2014|to|through|thru)\s*"
+_ISO = r"\d{4}-\d{2}-\d{2}"
+# the later days of a list such as "June 5 & 12" or "June 26, 30 and July 3"
+_LIST_ITEM = rf"\s*(?:,|&|\band\b)\s*(?:({_MONTH})\s+)?({_DAY})\b"
+_LIST_ITEM_RE = re.compile(_LIST_ITEM, re.I)
+
+DATE_RE = re.compile(
+    rf"\b(?P<iso1>{_ISO})(?:{_DASH}(?P<iso2>{_ISO}))?(?![\d-])"
+    rf"|\b(?P<m1>{_MONTH})\s+(?P<d1>{_DAY})(?:,?\s*(?P<y1>\d{{4}}))?"
+    rf"(?:{_DASH}(?:(?P<m2>{_MONTH})\s+)?(?P<d2>{_DAY})|(?P<more>(?:{_LIST_ITEM})+))?"
+    rf",?\s+(?P<y>\d{{4}})\b"
+    rf"|\b(?P<mm1>{_MONTH})(?:{_DASH}(?P<mm2>{_MONTH}))?,?\s+(?P<my>\d{{4}})\b"
+    rf"|\b(?P<season>spring|summer|fall|autumn|winter)\s+(?P<sy>\d{{4}})\b"
+    rf"|\b(?P<yy>20\d{{2}})\b",
+    re.I,
+)
+
+MONTHS = {m: i for i, m in enumerate(("jan", "feb", "mar", "apr", "may", "jun",
+                                      "jul", "aug", "sep", "oct", "nov", "dec"), 1)}
+
+# (start month, end month, start year offset) -- winter 2026 is Dec 2025 through Feb 2026
+SEASONS = {
+    "spring": (3, 5, 0),
+    "summer": (6, 8, 0),
+    "fall": (9, 11, 0),
+    "autumn": (9, 11, 0),
+    "winter": (12, 2, -1),
+}
+
+
+class DateRange(NamedTuple):
+    start: date
+    end: date
+    precision: str  # "day", "month", "season" or "year"
+
+
+def _day(year, month, day):
+    return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+def _month_end(year, month):
+    return date(year, month, calendar.monthrange(year, month)[1])
+
+
+@lru_cache(maxsize=65536)
+def parse_date_range(date_str: str) -> Optional[DateRange]:
+    """Parse the free-form date strings used by sources into a DateRange.
+
+    "January 30 - February 1, 2026", "June 5 & 12, 2026", "2026-05-02",
+    "June-August 2026", "Spring 2026", "July 2026 (Sundays/Mondays)" and
+    "2026 Monthly" are all understood; a list of days spans its first to its
+    last. Anything without a recognisable year, or naming a day that does not
+    exist ("May 2, 0000", "2026-02-30"), returns None. Memoized per string,
+    and strings pre-resolved in the static tables skip the regex entirely.
+    """
+    if date_str in RESOLVED_DATES:
+        return RESOLVED_DATES[date_str]
+    m = DATE_RE.search(date_str)
+    if not m:
+        return None
+    try:
+        return _date_range(m.groupdict())
+    except ValueError:    # year 0, month 13, Feb 30 in ISO form
+        return None
+
+
+def _date_range(g: Dict[str, Optional[str]]) -> Optional[DateRange]:
+    if g["iso1"]:
+        start = date.fromisoformat(g["iso1"])
+        end = date.fromisoformat(g["iso2"]) if g["iso2"] else start
+        return DateRange(start, end, "day") if start <= end else None
+    if g["m1"]:
+        year = int(g["y"])
+        m1 = MONTHS[g["m1"][:3].lower()]
+        m2 = MONTHS[g["m2"][:3].lower()] if g["m2"] else m1
+        d1 = int(re.match(r"\d+", g["d1"]).group())
+        d2 = int(re.match(r"\d+", g["d2"]).group()) if g["d2"] else d1
+        for month, day in _LIST_ITEM_RE.findall(g["more"] or ""):
+            m2 = MONTHS[month[:3].lower()] if month else m2
+            d2 = int(re.match(r"\d+", day).group())
+        if d1 < 1 or d2 < 1:
+            return None
+        end = _day(year, m2, d2)
+        start = _day(int(g["y1"]) if g["y1"] else year, m1, d1)
+        if start > end and not g["y1"]:
+            start = _day(year - 1, m1, d1)
+        return DateRange(start, end, "day")
+    if g["mm1"]:
+        year = int(g["my"])
+        m1 = MONTHS[g["mm1"][:3].lower()]
+        m2 = MONTHS[g["mm2"][:3].lower()] if g["mm2"] else m1
+        start_year = year - 1 if m2 < m1 else year
+        return DateRange(date(start_year, m1, 1), _month_end(year, m2), "month")
+    if g["season"]:
+        year = int(g["sy"])
+        m1, m2, offset = SEASONS[g["season"].lower()]
+        return DateRange(date(year + offset, m1, 1), _month_end(year, m2), "season")
+    year = int(g["yy"])
+    return DateRange(date(year, 1, 1), date(year, 12, 31), "year")
+
+
+# ==================== STATIC TABLES ====================
+# Date strings resolved ahead of time by compile_static_tables(); consulted
+# before the regex in parse_date_range. Only a table compiled by the current
+# PARSER_VERSION is loaded, so it always agrees with the regex and results do
+# not depend on whether it was loaded yet.
+RESOLVED_DATES: Dict[str, Optional[DateRange]] = {}
+
+
+@lru_cache(maxsize=1)
+def static_tables() -> Dict[str, List[dict]]:
+    """Per-source rows from data/static_events.json, loaded once per process.
+
+    Loading also seeds ``RESOLVED_DATES`` with the file's pre-parsed ranges,
+    unless they were compiled by another ``PARSER_VERSION``.
+    """
+    with open(STATIC_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("parser_version") != PARSER_VERSION:
+        logger.warning(f"{STATIC_PATH} dates were compiled by parser version {data.get('parser_version')}, "
+                       f"not {PARSER_VERSION}; parsing them at runtime until compile-static is rerun")
+        return data["sources"]
+    for text, rng in data.get("dates", {}).items():
+        RESOLVED_DATES[text] = DateRange(date.fromisoformat(rng[0]), date.fromisoformat(rng[1]), rng[2]) if rng else None
+    return data["sources"]
+
+
+def compile_static_tables(path=STATIC_PATH) -> int:
+    """Re-resolve every date string in the static tables and rewrite ``path``.
+
+    Run after editing rows or the date parser. Rows are kept one per line so
+    table edits stay readable in diffs. Returns the number of date strings.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    RESOLVED_DATES.clear()
+    parse_date_range.cache_clear()
+    static_tables.cache_clear()
+    texts = sorted({r["date"] for rows in data["sources"].values() for r in rows if r.get("date")})
+    dates = {}
+    for text in texts:
+        rng = parse_date_range(text)
+        dates[text] = [rng.start.isoformat(), rng.end.isoformat(), rng.precision] if rng else None
+    lines = ['{', f' "about": {json.dumps(data.get("about", ""))},', f' "parser_version": {PARSER_VERSION},',
+             ' "sources": {']
+    for n, (key, rows) in enumerate(data["sources"].items()):
+        lines.append(f'  {json.dumps(key)}: [')
+        lines += [f'   {json.dumps(r)}' + ("," if i < len(rows) - 1 else "") for i, r in enumerate(rows)]
+        lines.append("  ]" + ("," if n < len(data["sources"]) - 1 else ""))
+    lines += [' },', ' "dates": {']
+    lines += [f'  {json.dumps(k)}: {json.dumps(v)}' + ("," if i < len(dates) - 1 else "")
+              for i, (k, v) in enumerate(dates.items())]
+    lines += [' }', '}']
+    with atomic_open(path) as f:
+        f.write("\n".join(lines) + "\n")
+    return len(dates)
+
+
+@dataclass(slots=True)
 class Event:
     title: str
     date: str
@@ -86,481 +296,3045 @@ class Event:
     registration_url: Optional[str] = None
     latitude: Optional[float] = None
     longitude: Optional[float] = None
+    id: Optional[str] = None
+    recurrence: Optional[str] = None   # RRULE subset, e.g. "FREQ=WEEKLY;BYDAY=SU,MO", bounded by ``date``
+
+
+# ==================== RECURRENCE ====================
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+_WEEKDAY_RE = re.compile(r"\b(mon|tues|wednes|thurs|fri|satur|sun)days\b", re.I)
+_FREQ_RE = re.compile(r"\b(daily|weekly|monthly)\b", re.I)
+_BYDAY_RE = re.compile(r"^([+-]?\d)?(MO|TU|WE|TH|FR|SA|SU)$")
+
+
+class RRule(NamedTuple):
+    freq: str                          # "DAILY", "WEEKLY" or "MONTHLY"
+    interval: int = 1
+    byday: Tuple[Tuple[int, int], ...] = ()   # (nth, weekday); nth 0 = every such weekday
+    bymonthday: Tuple[int, ...] = ()
+
+
+def infer_recurrence(title: str, date_str: Optional[str]) -> Optional[str]:
+    """RRULE for listings like "(monthly)", "2026 Monthly" or "July 2026 (Sundays/Mondays)".
+
+    Only month, season or year dates get one; an exact day or day range is
+    taken as given, whatever the title says ("Sunday Funday, May 3, 2026").
+    """
+    rng = parse_date_range(date_str) if date_str else None
+    if rng is None or rng.precision == "day":
+        return None
+    text = f"{title} {date_str}"
+    days = {m.group(1)[:2].upper() for m in _WEEKDAY_RE.finditer(text)}
+    if re.search(r"\bweekends\b", text, re.I):
+        days |= {"SA", "SU"}
+    if days:
+        return f"FREQ=WEEKLY;BYDAY={','.join(sorted(days, key=WEEKDAYS.index))}"
+    m = _FREQ_RE.search(text)
+    return f"FREQ={m.group(1).upper()}" if m else None
+
+
+@lru_cache(maxsize=1024)
+def parse_rrule(rule: str) -> RRule:
+    parts = dict(p.split("=", 1) for p in rule.upper().split(";") if "=" in p)
+    freq = parts.get("FREQ")
+    if freq not in ("DAILY", "WEEKLY", "MONTHLY"):
+        raise ValueError(f"Unsupported recurrence {rule!r}")
+    byday = []
+    for token in filter(None, parts.get("BYDAY", "").split(",")):
+        m = _BYDAY_RE.match(token)
+        if not m:
+            raise ValueError(f"Bad BYDAY {token!r} in {rule!r}")
+        byday.append((int(m.group(1) or 0), WEEKDAYS.index(m.group(2))))
+    monthdays = tuple(int(d) for d in filter(None, parts.get("BYMONTHDAY", "").split(",")))
+    return RRule(freq, max(1, int(parts.get("INTERVAL", 1))), tuple(byday), monthdays)
+
+
+def _month_days(year, month, rule: RRule) -> List[date]:
+    last = calendar.monthrange(year, month)[1]
+    days = {date(year, month, d if d > 0 else last + 1 + d) for d in rule.bymonthday if 1 <= abs(d) <= last}
+    for nth, wd in rule.byday:
+        first = (wd - date(year, month, 1).weekday()) % 7 + 1
+        matches = list(range(first, last + 1, 7))
+        if nth == 0:
+            days.update(date(year, month, d) for d in matches)
+        elif -len(matches) <= nth <= len(matches) and nth:
+            days.add(date(year, month, matches[nth - 1 if nth > 0 else nth]))
+    return sorted(days)
+
+
+def occurrences(e: Event, start: Optional[date] = None, end: Optional[date] = None) -> Iterator[DateRange]:
+    """Lazily yield the event's occurrences that overlap ``start``..``end``.
+
+    A one-off event yields its parsed range once. A recurring one expands
+    ``recurrence`` inside its ``date`` range, beginning at the window rather
+    than at the first instance: day-level rules yield single days, a bare
+    monthly rule yields whole months. Undated events yield nothing.
+    """
+    bounds = parse_date_range(e.date) if e.date else None
+    if bounds is None:
+        return
+    lo = max(bounds.start, start) if start else bounds.start
+    hi = min(bounds.end, end) if end else bounds.end
+    if lo > hi:
+        return
+    if not e.recurrence:
+        yield bounds
+        return
+    rule = parse_rrule(e.recurrence)
+    if rule.freq == "DAILY":
+        step = rule.interval
+        day = bounds.start.toordinal()
+        day += -(-(lo.toordinal() - day) // step) * step
+        for d in range(day, hi.toordinal() + 1, step):
+            yield DateRange(date.fromordinal(d), date.fromordinal(d), "day")
+    elif rule.freq == "WEEKLY":
+        weekdays = sorted({wd for _, wd in rule.byday} or {bounds.start.weekday()})
+        anchor = bounds.start.toordinal() - bounds.start.weekday()   # Monday of the first week
+        week = anchor + (lo.toordinal() - anchor) // 7 // rule.interval * rule.interval * 7
+        while week <= hi.toordinal():
+            for wd in weekdays:
+                if lo.toordinal() <= week + wd <= hi.toordinal():
+                    day = date.fromordinal(week + wd)
+                    yield DateRange(day, day, "day")
+            week += 7 * rule.interval
+    else:
+        first = bounds.start.year * 12 + bounds.start.month - 1
+        month = first + ((lo.year * 12 + lo.month - 1) - first) // rule.interval * rule.interval
+        while month <= hi.year * 12 + hi.month - 1:
+            year, mon = divmod(month, 12)
+            if rule.byday or rule.bymonthday:
+                for day in _month_days(year, mon + 1, rule):
+                    if lo <= day <= hi:
+                        yield DateRange(day, day, "day")
+            else:
+                yield DateRange(max(date(year, mon + 1, 1), bounds.start),
+                                min(_month_end(year, mon + 1), bounds.end), "month")
+            month += rule.interval
+
+
+def iter_occurrences(events: Iterable[Event], start: Optional[date] = None,
+                     end: Optional[date] = None) -> Iterator[Tuple[DateRange, Event]]:
+    """``(occurrence, event)`` pairs in date order across ``events``, generated lazily.
+
+    Each event's generator is merged on demand, so a calendar page only
+    expands the instances it actually shows.
+    """
+    def stream(i, e):
+        for occ in occurrences(e, start, end):
+            yield occ.start, i, occ, e
+
+    for _, _, occ, e in heapq.merge(*(stream(i, e) for i, e in enumerate(events))):
+        yield occ, e
+
+
+# ==================== OUTPUT ====================
+FIELDS = ('title', 'date', 'time', 'location', 'venue', 'category', 'subcategory', 'source', 'source_url',
+          'description', 'city', 'teams', 'age_group', 'registration_url', 'latitude', 'longitude', 'id',
+          'recurrence')
+
+event_row = attrgetter(*FIELDS)
+
+
+# Same text json.dumps produces for the str/float/int/None values Event holds
+# (finite floats repr identically), without its per-call encoder setup.
+_JSON_ENCODE = {str: encode_basestring_ascii, float: float.__repr__, int: int.__repr__, type(None): lambda v: "null"}
+
+
+def _json_value(v) -> str:
+    encode = _JSON_ENCODE.get(type(v))
+    return encode(v) if encode else json.dumps(v)
+
+
+_JSON_KEYS = tuple(f'"{k}": ' for k in FIELDS)
+_JSON_KEYS_COMPACT = tuple(f'"{k}":' for k in FIELDS)
+
+
+class ExportRow(NamedTuple):
+    """One event serialized once and shared by every writer."""
+    values: tuple            # field values in FIELDS order (CSV)
+    json: Tuple[str, ...]    # the same values as JSON text
+
+
+def export_row(e: Event) -> ExportRow:
+    values = event_row(e)
+    return ExportRow(values, tuple(map(_json_value, values)))
+
+
+def _json_fields(row: ExportRow, keys) -> Iterator[str]:
+    return map(str.__add__, keys, row.json)
+
+
+def write_json_rows(f, rows: Iterable[ExportRow], scraped_at: str, indent=True, total: Optional[int] = None) -> int:
+    """``write_json`` over pre-serialized rows; ``total`` goes in the header when known."""
+    if indent:
+        keys, nl, pad, colon = _JSON_KEYS, "\n", "  ", ": "
+        head, field_sep, tail, item_sep = "    {\n      ", ",\n      ", "\n    }", ",\n"
+    else:
+        keys, nl, pad, colon = _JSON_KEYS_COMPACT, "", "", ":"
+        head, field_sep, tail, item_sep = "{", ",", "}", ","
+    f.write(f'{{{nl}{pad}"scraped_at"{colon}{_json_value(scraped_at)},{nl}')
+    if total is not None:
+        f.write(f'{pad}"total_events"{colon}{total},{nl}')
+    f.write(f'{pad}"events"{colon}[')
+    n = 0
+    for row in rows:
+        f.write((item_sep if n else nl) + head + field_sep.join(_json_fields(row, keys)) + tail)
+        n += 1
+    f.write(f"{nl}{pad}]" if n else "]")
+    if total is None:
+        f.write(f',{nl}{pad}"total_events"{colon}{n}')
+    f.write(f"{nl}}}")
+    return n
+
+
+def write_jsonl_rows(f, rows: Iterable[ExportRow]) -> int:
+    n = 0
+    for row in rows:
+        f.write("{" + ",".join(_json_fields(row, _JSON_KEYS_COMPACT)) + "}\n")
+        n += 1
+    return n
+
+
+def write_csv_rows(f, rows: Iterable[ExportRow]) -> int:
+    w = csv.writer(f)
+    w.writerow(FIELDS)
+    n = 0
+    for row in rows:
+        w.writerow(row.values)
+        n += 1
+    return n
+
+
+def write_json(f, events: Iterable[Event], scraped_at: str, indent=True) -> int:
+    """Stream ``{"scraped_at", "total_events", "events": [...]}`` to ``f``.
+
+    Each event is written from its flat field tuple as soon as it is pulled,
+    so ``events`` may be a generator. The text matches ``json.dump(indent=2)``,
+    or ``separators=(",", ":")`` with ``indent=False``. If ``events`` has no
+    length up front, ``total_events`` is written after the list instead.
+    """
+    total = len(events) if hasattr(events, "__len__") else None
+    return write_json_rows(f, map(export_row, events), scraped_at, indent, total)
+
+
+def write_jsonl(f, events: Iterable[Event]) -> int:
+    """One compact JSON object per line."""
+    return write_jsonl_rows(f, map(export_row, events))
+
+
+def write_csv(f, events: Iterable[Event]) -> int:
+    return write_csv_rows(f, map(export_row, events))
+
+
+@contextmanager
+def _tmp_writer(path: str, newline=None, binary=False):
+    """Text file at ``<path>.tmp``, gzip-compressed when ``path`` ends in .gz.
+
+    Compression is level 6, as with the gzip CLI. The header records
+    ``path``'s name and a zero mtime, so unchanged events give byte-identical
+    archives. ``binary`` files are written as given, whatever the suffix.
+    """
+    tmp = f"{path}.tmp"
+    if binary:
+        with open(tmp, "wb") as f:
+            yield f
+        return
+    if not path.endswith(".gz"):
+        with open(tmp, "w", encoding="utf-8", newline=newline) as f:
+            yield f
+        return
+    import gzip
+    with open(tmp, "wb") as raw, gzip.GzipFile(path, "wb", 6, raw, mtime=0) as gz, \
+            io.TextIOWrapper(gz, encoding="utf-8", newline=newline) as f:
+        yield f
+
+
+def _discard(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+@contextmanager
+def atomic_open(path: str, newline=None, binary=False):
+    """Write ``path`` via ``<path>.tmp`` and rename it into place on success.
+
+    Readers see either the old file or the complete new one. On error the
+    temp file is removed and ``path`` is untouched.
+    """
+    try:
+        with _tmp_writer(path, newline, binary) as f:
+            yield f
+    except BaseException:
+        _discard(f"{path}.tmp")
+        raise
+    os.replace(f"{path}.tmp", path)
+
+
+EXPORT_FORMATS = (".json", ".jsonl", ".csv")
+EXPORT_CHUNK = 2048
+
+
+def export_format(path: str) -> str:
+    """``.json``, ``.jsonl`` or ``.csv`` for ``path``, looking past a ``.gz`` suffix."""
+    ext = os.path.splitext(path[:-3] if path.endswith(".gz") else path)[1]
+    if ext not in EXPORT_FORMATS:
+        raise ValueError(f"{path}: unknown export format; use {', '.join(EXPORT_FORMATS)} (optionally .gz)")
+    return ext
+
+
+def export(paths: Iterable[str], events: Iterable[Event], scraped_at: str, indent=True,
+           chunk=EXPORT_CHUNK) -> int:
+    """Write ``events`` to every path at once, serializing each event only once.
+
+    Events are turned into ``ExportRow`` chunks on the calling thread and
+    handed to one writer thread per path through a short queue, so memory
+    stays bounded and compression and disk writes overlap. Files are written
+    to ``<path>.tmp`` and renamed into place only after every writer has
+    finished; if any fails, none are replaced. Returns the number of events.
+    """
+    import queue
+    paths = list(paths)
+    formats = [export_format(p) for p in paths]
+    total = len(events) if hasattr(events, "__len__") else None
+    queues = [queue.Queue(maxsize=4) for _ in paths]
+    errors: List[BaseException] = []
+
+    def write(path, fmt, q):
+        done = False
+
+        def rows():
+            nonlocal done
+            for batch in iter(q.get, None):
+                yield from batch
+            done = True
+
+        try:
+            with _tmp_writer(path, "" if fmt == ".csv" else None) as f:
+                if fmt == ".json":
+                    write_json_rows(f, rows(), scraped_at, indent, total)
+                elif fmt == ".jsonl":
+                    write_jsonl_rows(f, rows())
+                else:
+                    write_csv_rows(f, rows())
+        except Exception as e:
+            errors.append(e)
+            if not done:
+                for _ in iter(q.get, None):   # keep the producer from blocking on a full queue
+                    pass
+
+    threads = [threading.Thread(target=write, args=args, name=f"export-{os.path.basename(args[0])}", daemon=True)
+               for args in zip(paths, formats, queues)]
+    for t in threads:
+        t.start()
+    n = 0
+    it = iter(events)
+    try:
+        while batch := [export_row(e) for e in itertools.islice(it, chunk)]:
+            for q in queues:
+                q.put(batch)
+            n += len(batch)
+    except BaseException as e:
+        errors.append(e)
+    finally:
+        for q in queues:
+            q.put(None)
+        for t in threads:
+            t.join()
+    if errors:
+        for p in paths:
+            _discard(f"{p}.tmp")
+        raise errors[0]
+    for p in paths:
+        os.replace(f"{p}.tmp", p)
+    return n
+
+
+# ==================== COLUMNAR STORE ====================
+_STR_FIELDS = tuple(f for f in FIELDS if f not in ("latitude", "longitude"))
+_NAN = float("nan")
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+
+class EventStore:
+    """Columnar, dictionary-encoded storage for large resident event sets.
+
+    Every string column is an ``array('I')`` of codes into that column's
+    vocabulary (code 0 is None), so a city or source URL repeated across a
+    million events is stored once. Coordinates live in ``array('d')`` with
+    NaN for missing. Indexing or iterating rebuilds ``Event`` objects on demand.
+    """
+
+    def __init__(self, events: Iterable[Event] = ()):
+        self._codes = {f: array('I') for f in _STR_FIELDS}
+        self._vocab: Dict[str, List[Optional[str]]] = {f: [None] for f in _STR_FIELDS}
+        self._lookup: Dict[str, Dict[Optional[str], int]] = {f: {None: 0} for f in _STR_FIELDS}
+        self._lat = array('d')
+        self._lng = array('d')
+        self.extend(events)
+
+    def __len__(self):
+        return len(self._lat)
+
+    def _encode(self, name, value) -> int:
+        lookup = self._lookup[name]
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(self._vocab[name])
+            self._vocab[name].append(value)
+        return code
+
+    def append(self, e: Event):
+        for name in _STR_FIELDS:
+            self._codes[name].append(self._encode(name, getattr(e, name)))
+        self._lat.append(_NAN if e.latitude is None else e.latitude)
+        self._lng.append(_NAN if e.longitude is None else e.longitude)
+
+    def extend(self, events: Iterable[Event]):
+        for e in events:
+            self.append(e)
+
+    def column(self, name) -> List:
+        """Decoded values of one column."""
+        if name in ("latitude", "longitude"):
+            return [None if math.isnan(v) else v for v in (self._lat if name == "latitude" else self._lng)]
+        vocab = self._vocab[name]
+        return [vocab[c] for c in self._codes[name]]
+
+    def __getitem__(self, i) -> Event:
+        if i < 0:
+            i += len(self)
+        values = {f: self._vocab[f][self._codes[f][i]] for f in _STR_FIELDS}
+        lat, lng = self._lat[i], self._lng[i]
+        return Event(**values, latitude=None if math.isnan(lat) else lat, longitude=None if math.isnan(lng) else lng)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+# ==================== DEDUPLICATION ====================
+_WORD_RE = re.compile(r"[a-z0-9]+")
+TITLE_STOPWORDS = frozenset({"the", "a", "an", "of", "at", "and", "in", "on", "for"})
+PRECISION_RANK = {"day": 0, "month": 1, "season": 2, "year": 3}
+TITLE_MATCH = 0.8   # share of the shorter title's words both titles must have
+
+
+@lru_cache(maxsize=65536)
+def title_tokens(title: str) -> frozenset:
+    return frozenset(w for w in _WORD_RE.findall(title.lower()) if w not in TITLE_STOPWORDS)
+
+
+def _block_key(e: Event) -> str:
+    return (e.city or e.venue or e.location or "").lower()
+
+
+def titles_match(a: frozenset, b: frozenset) -> bool:
+    if a == b:
+        return True
+    shorter = min(len(a), len(b))
+    return shorter >= 2 and len(a & b) >= TITLE_MATCH * shorter
+
+
+def merge_events(events: List[Event]) -> Event:
+    """Fold duplicates into one record that keeps the richest fields.
+
+    The event with the most populated fields is the base, its gaps are filled
+    from the others, the most precise date (and its time) wins, and the
+    longest title is kept.
+    """
+    if len(events) == 1:
+        return events[0]
+    base = max(events, key=lambda e: sum(v is not None for v in event_row(e)))
+    fills = {f: next((getattr(e, f) for e in events if getattr(e, f) is not None), None)
+             for f in FIELDS if getattr(base, f) is None}
+
+    def date_rank(e):
+        rng = parse_date_range(e.date) if e.date else None
+        if rng is None:
+            return (len(PRECISION_RANK), 0)
+        return (PRECISION_RANK[rng.precision], (rng.end - rng.start).days)
+
+    dated = min(events, key=date_rank)
+    fills["date"] = dated.date
+    fills["time"] = dated.time or base.time or fills.get("time")
+    fills["title"] = max((e.title for e in events), key=len)
+    return replace(base, **fills)
+
+
+def deduplicate(events: List[Event]) -> List[Event]:
+    """Merge events describing the same happening, even across sources.
+
+    Events are blocked by city (venue when there is no city) and swept in
+    start order, so only date-overlapping events are live. Each event is
+    compared only with live events sharing one of its rarer title words
+    (a prefix filter: a title match needs at least two shared words, so the
+    most common word alone never makes a candidate). Exact repeats (same
+    words, same dates) are folded up front. Two events match when their
+    parsed date ranges overlap (or their raw dates are equal when
+    unparseable) and their normalized titles match.
+
+    Clusters stay consistent as they grow. Day-precise events whose ranges
+    do not all overlap never end up together. A month or year listing joins
+    at most one cluster of day-precise events, so a "2026" listing cannot
+    chain separate weekends into one record. Output keeps first-occurrence
+    order.
+    """
+    n = len(events)
+    parent = list(range(n))
+    fine: List[Optional[Tuple[date, date]]] = [None] * n   # per root: common range of its day-precise members
+    precise = [False] * n
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        ri, rj = find(i), find(j)
+        if ri == rj:
+            return
+        fi, fj = fine[ri], fine[rj]
+        if fi and fj:
+            if not (precise[i] and precise[j]):
+                return   # only two day-precise events may join two dated clusters
+            lo, hi = max(fi[0], fj[0]), min(fi[1], fj[1])
+            if lo > hi:
+                return
+            fj = (lo, hi)
+        parent[ri] = rj
+        fine[rj] = fj or fi
+
+    tokens = [title_tokens(e.title) for e in events]
+    blocks: Dict[str, List[int]] = defaultdict(list)
+    for i, e in enumerate(events):
+        blocks[_block_key(e)].append(i)
+
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        freq = Counter(t for i in members for t in tokens[i])
+        reps: Dict[tuple, int] = {}
+        ranged, loose = [], defaultdict(list)
+        for i in members:
+            rng = parse_date_range(events[i].date) if events[i].date else None
+            key = (tokens[i], rng or events[i].date)
+            if rng and rng.precision == "day":
+                precise[i] = True
+                fine[i] = (rng.start, rng.end)
+            if key in reps:   # exact repeat: same words and dates
+                union(i, reps[key])
+                continue
+            reps[key] = i
+            if rng:
+                ranged.append((rng.start, rng.end, i))
+            else:
+                loose[events[i].date].append(i)
+
+        # a match with a title of size s shares ceil(0.8 * min(s, k)) words, so one of the
+        # k - that + 1 rarest words must be among the other title's indexed words
+        sizes = {len(tokens[i]) for i in members}
+        spans = {k: [(s, k - math.ceil(TITLE_MATCH * min(s, k)) + 1 if min(s, k) >= 2 else 1)
+                     for s in sizes if min(s, k) >= 2 or s == k] for k in sizes}
+
+        def keys(i) -> Tuple[List[tuple], List[tuple]]:
+            """(probe, index) keys: rarest words first, tagged with title size."""
+            k = len(tokens[i])
+            w = sorted(tokens[i], key=lambda t: (freq[t], t)) or [""]
+            probe = [(t, s) for s, cut in spans[k] for t in w[:cut]]
+            # any match shares >= 2 words, so the most common word alone never needs indexing
+            return probe, [(t, k) for t in w[:max(1, k - 1)]]
+
+        def link(i, candidates: Iterable[int]):
+            seen = set()
+            for j in candidates:
+                if j not in seen:
+                    seen.add(j)
+                    if find(i) != find(j) and titles_match(tokens[i], tokens[j]):
+                        union(i, j)
+
+        def alive(bucket: List[Tuple[date, int]], start: date) -> Iterator[int]:
+            dead = 0
+            for e_end, j in bucket:
+                if e_end >= start:
+                    yield j
+                else:
+                    dead += 1
+            if dead * 2 > len(bucket):   # compact once half the bucket has ended
+                bucket[:] = [(e_end, j) for e_end, j in bucket if e_end >= start]
+
+        ranged.sort()
+        live: Dict[tuple, List[Tuple[date, int]]] = defaultdict(list)
+        for start, end, i in ranged:
+            probe, own = keys(i)
+            link(i, (j for key in probe if key in live for j in alive(live[key], start)))
+            for key in own:
+                live[key].append((end, i))
+        for group in loose.values():
+            index: Dict[tuple, List[int]] = defaultdict(list)
+            for i in group:
+                probe, own = keys(i)
+                link(i, (j for key in probe for j in index.get(key, ())))
+                for key in own:
+                    index[key].append(i)
+
+    clusters: Dict[int, List[Event]] = {}
+    for i, e in enumerate(events):
+        clusters.setdefault(find(i), []).append(e)
+    return [merge_events(group) for group in clusters.values()]
+
+
+# ==================== CHANGESETS ====================
+def event_key(e: Event) -> str:
+    """Normalized identity of an event: title words, start date and place.
+
+    Time, description, coordinates and source are left out so that filling
+    in a time or moving to a richer source shows up as an update, not as a
+    removal plus an addition.
+    """
+    rng = parse_date_range(e.date) if e.date else None
+    start = rng.start.isoformat() if rng else (e.date or "").strip().lower()
+    return "\x1f".join((" ".join(_WORD_RE.findall(e.title.lower())), start, _block_key(e)))
+
+
+def event_id(e: Event) -> str:
+    return hashlib.blake2b(event_key(e).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def assign_ids(events: List[Event]) -> List[Event]:
+    """Set ``id`` on every event from its content hash.
+
+    Events sharing a key (two showtimes on the same day) are ordered by
+    time, source and venue and get ``-2``, ``-3``... suffixes so ids stay
+    unique and stable between runs.
+    """
+    groups: Dict[str, List[Event]] = defaultdict(list)
+    for e in events:
+        groups[event_id(e)].append(e)
+    for base, members in groups.items():
+        if len(members) > 1:
+            members.sort(key=lambda e: (e.time or "", e.source, e.venue or ""))
+        for n, e in enumerate(members, 1):
+            e.id = base if n == 1 else f"{base}-{n}"
+    return events
+
+
+def load_snapshot(filename) -> Tuple[Optional[str], Dict[str, dict]]:
+    """``(scraped_at, {id: row})`` from a previous iowa_events.json.
+
+    Snapshots written before events carried ids get them assigned here.
+    A missing or unreadable file is an empty snapshot.
+    """
+    try:
+        with open(filename, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None, {}
+    rows = [{k: d.get(k) for k in FIELDS} for d in data.get("events", [])]
+    if any(r["id"] is None for r in rows):
+        events = assign_ids([Event(**{k: v for k, v in r.items() if k != "id"}) for r in rows])
+        rows = [dict(zip(FIELDS, event_row(e))) for e in events]
+    return data.get("scraped_at"), {r["id"]: r for r in rows}
+
+
+class ChangeTracker:
+    """Diffs events against ``previous`` rows as they stream past ``watch``.
+
+    Only the changed rows and the seen ids are kept, so a changeset can be
+    computed on the way into the writers without holding the events.
+    """
+
+    def __init__(self, previous: Dict[str, dict], previous_at: Optional[str] = None):
+        self.previous = previous
+        self.previous_at = previous_at
+        self.added: List[dict] = []
+        self.updated: List[dict] = []
+        self.seen = set()
+
+    @classmethod
+    def from_snapshot(cls, filename) -> "ChangeTracker":
+        previous_at, rows = load_snapshot(filename)
+        return cls(rows, previous_at)
+
+    def watch(self, events: Iterable[Event]) -> Iterator[Event]:
+        for e in events:
+            row = dict(zip(FIELDS, event_row(e)))
+            self.seen.add(e.id)
+            old = self.previous.get(e.id)
+            if old is None:
+                self.added.append(row)
+            elif old != row:
+                self.updated.append(row)
+            yield e
+
+    def changes(self) -> Dict[str, list]:
+        """Events added or changed since ``previous``, and ids no longer present."""
+        return {"added": self.added, "updated": self.updated, "removed": sorted(self.previous.keys() - self.seen)}
+
+
+def diff_snapshot(previous: Dict[str, dict], events: Iterable[Event]) -> Dict[str, list]:
+    """Events added or changed since ``previous``, and ids no longer present."""
+    tracker = ChangeTracker(previous)
+    for _ in tracker.watch(events):
+        pass
+    return tracker.changes()
+
+
+# ==================== SQLITE ====================
+_SQL_COLUMNS = tuple(f for f in FIELDS if f != "id")
+SQLITE_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    {", ".join(f"{c} {'REAL' if c in ('latitude', 'longitude') else 'TEXT'}" for c in _SQL_COLUMNS)},
+    start_date TEXT,
+    end_date TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    removed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS events_dates ON events (start_date, end_date);
+CREATE INDEX IF NOT EXISTS events_city ON events (city);
+CREATE INDEX IF NOT EXISTS events_category ON events (category);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scraped_at TEXT NOT NULL,
+    total_events INTEGER,
+    added INTEGER,
+    updated INTEGER,
+    removed INTEGER
+);
+CREATE TABLE IF NOT EXISTS event_history (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    event_id TEXT NOT NULL,
+    change TEXT NOT NULL,
+    row TEXT
+);
+CREATE INDEX IF NOT EXISTS event_history_event ON event_history (event_id);
+"""
+_SQL_UPSERT = (
+    f"INSERT INTO events (id, {', '.join(_SQL_COLUMNS)}, start_date, end_date, first_seen, last_seen) "
+    f"VALUES ({', '.join('?' * (len(_SQL_COLUMNS) + 5))}) "
+    f"ON CONFLICT (id) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in _SQL_COLUMNS)}, "
+    "start_date = excluded.start_date, end_date = excluded.end_date, "
+    "last_seen = excluded.last_seen, removed_at = NULL"
+)
+
+
+def _sql_params(e: Event, scraped_at: str) -> tuple:
+    rng = parse_date_range(e.date) if e.date else None
+    start, end = (rng.start.isoformat(), rng.end.isoformat()) if rng else (None, None)
+    return (e.id, *(getattr(e, c) for c in _SQL_COLUMNS), start, end, scraped_at, scraped_at)
+
+
+def write_sqlite(conn: "sqlite3.Connection", events: Iterable[Event], scraped_at: str) -> Dict[str, int]:
+    """Upsert ``events`` by id in one transaction and record the run.
+
+    ``events`` holds the live rows and is read once, so it may be a stream;
+    ids missing from this run are marked with ``removed_at`` rather than
+    deleted. Each run adds a ``runs`` row and an ``event_history`` row per
+    added, updated or removed event, so any event's past versions can be
+    replayed. Events need ids (``assign_ids``). Returns the changeset counts.
+    """
+    conn.executescript(SQLITE_SCHEMA)
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(events)")}
+    for c in _SQL_COLUMNS:
+        if c not in existing:   # databases created before the column existed
+            conn.execute(f"ALTER TABLE events ADD COLUMN {c} {'REAL' if c in ('latitude', 'longitude') else 'TEXT'}")
+    cur = conn.execute(f"SELECT id, {', '.join(_SQL_COLUMNS)} FROM events WHERE removed_at IS NULL")
+    tracker = ChangeTracker({row[0]: dict(zip(("id",) + _SQL_COLUMNS, row)) for row in cur})
+    with conn:
+        run_id = conn.execute("INSERT INTO runs (scraped_at) VALUES (?)", (scraped_at,)).lastrowid
+        conn.executemany(_SQL_UPSERT, (_sql_params(e, scraped_at) for e in tracker.watch(events)))
+        changes = tracker.changes()
+        conn.execute("UPDATE runs SET total_events = ?, added = ?, updated = ?, removed = ? WHERE run_id = ?",
+                     (len(tracker.seen), *(len(changes[k]) for k in ("added", "updated", "removed")), run_id))
+        conn.executemany("UPDATE events SET removed_at = ? WHERE id = ?",
+                         ((scraped_at, i) for i in changes["removed"]))
+        conn.executemany(
+            "INSERT INTO event_history (run_id, event_id, change, row) VALUES (?, ?, ?, ?)",
+            [(run_id, r["id"], kind, json.dumps(r)) for kind in ("added", "updated") for r in changes[kind]]
+            + [(run_id, i, "removed", None) for i in changes["removed"]])
+    return {k: len(v) for k, v in changes.items()}
+
+
+# ==================== PARQUET ====================
+PARQUET_DICT_FIELDS = ("location", "venue", "category", "subcategory", "source", "source_url", "city", "age_group")
+PARQUET_BATCH = 65536
+
+
+def _pyarrow():
+    """Import pyarrow on first use; it is only needed for Parquet export."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet export needs pyarrow: pip install pyarrow") from None
+    return pyarrow, pyarrow.parquet
+
+
+def parquet_schema():
+    pa, _ = _pyarrow()
+    columns = []
+    for name in FIELDS:
+        if name in ("latitude", "longitude"):
+            kind = pa.float64()
+        elif name in PARQUET_DICT_FIELDS:
+            kind = pa.dictionary(pa.int32(), pa.string())
+        else:
+            kind = pa.string()
+        columns.append(pa.field(name, kind))
+        if name == "date":
+            columns += [pa.field("start_date", pa.date32()), pa.field("end_date", pa.date32()),
+                        pa.field("date_precision", pa.dictionary(pa.int8(), pa.string()))]
+    return pa.schema(columns)
+
+
+def write_parquet(path, events: Iterable[Event], batch_size=PARQUET_BATCH) -> int:
+    """Write events as typed Parquet, one row group per ``batch_size`` events.
+
+    Besides the raw ``date`` text, the parsed range is stored as ``start_date``
+    / ``end_date`` (date32, null when unparseable) and ``date_precision``.
+    Repetitive text columns are dictionary-encoded and coordinates are
+    float64. Only one batch of columns is held at a time, so ``events`` may
+    be a generator of any size. ``path`` may also be an open binary file.
+    """
+    pa, pq = _pyarrow()
+    schema = parquet_schema()
+    names = schema.names
+    n = 0
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        cols = {name: [] for name in names}
+
+        def flush():
+            writer.write_batch(pa.record_batch([pa.array(cols[f.name], type=f.type) for f in schema], schema=schema),
+                               row_group_size=batch_size)
+            for values in cols.values():
+                values.clear()
+
+        for e in events:
+            for name, value in zip(FIELDS, event_row(e)):
+                cols[name].append(value)
+            rng = parse_date_range(e.date) if e.date else None
+            cols["start_date"].append(rng.start if rng else None)
+            cols["end_date"].append(rng.end if rng else None)
+            cols["date_precision"].append(rng.precision if rng else None)
+            n += 1
+            if n % batch_size == 0:
+                flush()
+        if n % batch_size or not n:
+            flush()
+    return n
+
+
+# ==================== SHARDS ====================
+def parse_shard(text: str) -> Tuple[int, int]:
+    """``"2/8"`` -> ``(2, 8)``; shards are numbered from 1."""
+    index, _, count = text.partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise ValueError(f"shard must look like 2/8, not {text!r}") from None
+    if not 1 <= index <= count:
+        raise ValueError(f"shard {index} is outside 1..{count}")
+    return index, count
+
+
+def shard_sources(sources: List["Source"], index: int, count: int) -> List["Source"]:
+    """Sources of shard ``index`` of ``count``, picked by a hash of the key.
+
+    The split depends only on the key, so every node computes the same one,
+    and registering a new source never moves existing sources between shards.
+    """
+    return [s for s in sources
+            if int.from_bytes(hashlib.blake2b(s.key.encode(), digest_size=4).digest(), "big") % count == index - 1]
+
+
+def merge_key(e: Event) -> tuple:
+    """Partial files are sorted by this: dedup block (city) first, then start date."""
+    rng = parse_date_range(e.date) if e.date else None
+    return (_block_key(e), rng.start.isoformat() if rng else "", e.title, e.id or "")
+
+
+def write_partial(path: str, events: List[Event], header: dict) -> int:
+    """Write one shard's events as JSON lines sorted by ``merge_key``.
+
+    The first line is ``{"partial": header}`` (shard, sources, today...).
+    """
+    with atomic_open(path) as f:
+        f.write(json.dumps({"partial": {**header, "events": len(events)}}) + "\n")
+        return write_jsonl_rows(f, map(export_row, sorted(events, key=merge_key)))
+
+
+def read_partial(path: str) -> Tuple[dict, Iterator[Event]]:
+    """``(header, events)`` of a partial file; events are read lazily, in file order."""
+    f = open(path, encoding="utf-8")
+    try:
+        header = json.loads(f.readline()).get("partial")
+    except ValueError:
+        header = None
+    if header is None:
+        f.close()
+        raise ValueError(f"{path} is not a partial result file")
+
+    def events():
+        with f:
+            for line in f:
+                row = json.loads(line)
+                yield Event(**{k: row.get(k) for k in FIELDS})
+    return header, events()
+
+
+def merge_partials(paths: Iterable[str]) -> Iterator[Event]:
+    """Deduplicated union of several partial files, streamed.
+
+    The files are k-way merged on ``merge_key``, so all events of one dedup
+    block (a city) arrive together. Each block is deduplicated and given ids
+    as soon as it ends. Memory holds one block plus one line per file.
+    Duplicates only ever share a block, so the same events get merged as
+    when deduplicating everything at once. Output is ordered by city, then
+    start date.
+    """
+    paths = list(paths)
+    headers, streams = zip(*map(read_partial, paths)) if paths else ((), ())
+    days = {h.get("today") for h in headers}
+    if len(days) > 1:
+        logger.warning(f"Partials were scraped with different cutoff days: {', '.join(sorted(map(str, days)))}")
+    for _, block in itertools.groupby(heapq.merge(*streams, key=merge_key), key=_block_key):
+        yield from assign_ids(deduplicate(list(block)))
+
+
+# ==================== GEOCODING ====================
+EARTH_RADIUS_MILES = 3958.8
+_ABBREVIATIONS = ((r"\bst\b", "saint"), (r"\bmt\b", "mount"), (r"\bft\b", "fort"))
+
+
+def normalize_place(name: str) -> str:
+    """'St. Charles, IA' -> 'saint charles'"""
+    name = re.sub(r",\s*([a-z]{2}|iowa)$", "", name.strip().lower())
+    name = re.sub(r"[^a-z0-9 ]+", " ", name.replace("'", ""))
+    for pattern, full in _ABBREVIATIONS:
+        name = re.sub(pattern, full, name)
+    return " ".join(name.split())
+
+
+class Geocoder:
+    """Offline lookup of Iowa places and venues.
+
+    Backed by the bundled gazetteer (every county seat, fair town and venue
+    the sources use, plus ``IOWA_COORDS``). Names are normalized and, failing
+    an exact hit, fuzzy-matched. Gazetteer rows without coordinates
+    ("Statewide", "Various") are known non-places and never geocode. Every
+    answer, misses included, is kept in a JSON cache tagged with a digest of
+    the gazetteer, so repeat lookups skip the matching and a gazetteer edit
+    starts a fresh cache. Safe to share between threads; ``save`` writes a
+    consistent copy of the cache.
+    """
+
+    def __init__(self, gazetteer=GAZETTEER_PATH, cache_path=".cache/geocode_cache.json",
+                 coords: Optional[Dict[str, Tuple[float, float]]] = None):
+        coords = IOWA_COORDS if coords is None else coords
+        self.places: Dict[str, Optional[Tuple[float, float]]] = {normalize_place(k): v for k, v in coords.items()}
+        self.venues: Dict[str, Tuple[float, float]] = {}
+        with open(gazetteer, "rb") as f:
+            raw = f.read()
+        for row in csv.DictReader(io.StringIO(raw.decode("utf-8"), newline="")):
+            table = self.venues if row["kind"] == "venue" else self.places
+            table[normalize_place(row["name"])] = (
+                (float(row["latitude"]), float(row["longitude"])) if row["latitude"] else None)
+        self.digest = hashlib.blake2b(raw + repr(sorted(coords.items())).encode(), digest_size=8).hexdigest()
+        self.cache_path = cache_path
+        self.cache: Dict[str, Optional[List[float]]] = {}
+        self.hits = self.misses = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        if cache_path:
+            try:
+                with open(cache_path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("gazetteer") == self.digest:
+                    self.cache = data["places"]
+            except (OSError, ValueError, AttributeError, KeyError):
+                pass
+
+    def _place(self, name: str) -> Optional[Tuple[float, float]]:
+        with self._lock:
+            cached = name in self.cache
+            if cached:
+                self.hits += 1
+                hit = self.cache[name]
+            else:
+                self.misses += 1
+        if cached:
+            return tuple(hit) if hit else None
+        key = normalize_place(name)
+        if key in self.places:
+            hit = self.places[key]
+        else:
+            close = difflib.get_close_matches(key, self.places, n=1, cutoff=0.88)
+            hit = self.places[close[0]] if close else None
+        with self._lock:
+            self.cache[name] = list(hit) if hit else None
+            self._dirty = True
+        return hit
+
+    def lookup(self, city: Optional[str], venue: Optional[str] = None) -> Tuple[Optional[float], Optional[float]]:
+        """Coordinates of ``venue`` when it is a known venue, else of ``city``."""
+        if venue:
+            hit = self.venues.get(normalize_place(venue))
+            if hit:
+                return hit
+        if city:
+            hit = self._place(city)
+            if hit:
+                return hit
+        return None, None
+
+    def locate(self, events: Iterable[Event]):
+        """Fill in the coordinates of ``events`` that have none, in place."""
+        for e in events:
+            if e.latitude is None:
+                e.latitude, e.longitude = self.lookup(e.city, e.venue)
+
+    def save(self):
+        if not self.cache_path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps({"gazetteer": self.digest, "places": self.cache})
+            self._dirty = False
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        try:
+            with atomic_open(self.cache_path) as f:
+                f.write(data)
+        except OSError:
+            self._dirty = True
+            raise
+
+
+_GEOCODERS: Dict[str, Geocoder] = {}
+_GEOCODERS_LOCK = threading.Lock()
+
+
+def default_geocoder(region: str = DEFAULT_REGION) -> Geocoder:
+    """The shared geocoder of ``region``; regions besides Iowa cache to their own file."""
+    with _GEOCODERS_LOCK:   # build each region's geocoder once, even when threads race here
+        geocoder = _GEOCODERS.get(region)
+        if geocoder is None:
+            r = REGIONS[region]
+            cache = (".cache/geocode_cache.json" if region == DEFAULT_REGION
+                     else f".cache/geocode_cache_{region.lower()}.json")
+            geocoder = _GEOCODERS[region] = Geocoder(r.gazetteer, cache, r.coords)
+        return geocoder
+
+
+def haversine_miles(lat1, lng1, lat2, lng2) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((p2 - p1) / 2) ** 2
+         + math.cos(p1) * math.cos(p2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
+
+
+class GeoIndex:
+    """Grid index for "events within N miles of (lat, lng)" queries.
+
+    Events sharing a coordinate (most events sit on a city or venue point) are
+    grouped, so a query costs one distance check per distinct point in the
+    grid cells overlapping its bounding box rather than one per event.
+    """
+
+    def __init__(self, events: Iterable[Event], cell_deg=0.25):
+        self.events = list(events)
+        self.cell_deg = cell_deg
+        self._points: Dict[Tuple[float, float], List[int]] = defaultdict(list)
+        for i, e in enumerate(self.events):
+            if e.latitude is not None and e.longitude is not None:
+                self._points[(e.latitude, e.longitude)].append(i)
+        self._cells: Dict[Tuple[int, int], List[Tuple[float, float]]] = defaultdict(list)
+        for point in self._points:
+            self._cells[self._cell(*point)].append(point)
+
+    def _cell(self, lat, lng) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lng / self.cell_deg))
+
+    def within(self, lat: float, lng: float, miles: float, limit: Optional[int] = None) -> List[Tuple[float, Event]]:
+        """(distance, event) pairs within ``miles``, nearest first, at most ``limit`` of them.
+
+        ``miles`` is capped at half the earth's circumference. Non-finite
+        coordinates or a negative radius or limit raise ``ValueError``.
+        """
+        if not all(map(math.isfinite, (lat, lng, miles))) or miles < 0 or (limit is not None and limit < 0):
+            raise ValueError("near and miles must be finite, miles and limit non-negative")
+        miles = min(miles, math.pi * EARTH_RADIUS_MILES)
+        dlat = miles / 69.0
+        dlng = miles / max(69.0 * math.cos(math.radians(lat)), 1e-6)
+        (i0, j0), (i1, j1) = self._cell(lat - dlat, lng - dlng), self._cell(lat + dlat, lng + dlng)
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > len(self._cells):   # wide box: scan occupied cells only
+            cells = [c for c in self._cells if i0 <= c[0] <= i1 and j0 <= c[1] <= j1]
+        else:
+            cells = itertools.product(range(i0, i1 + 1), range(j0, j1 + 1))
+        found = []
+        for cell in cells:
+            for plat, plng in self._cells.get(cell, ()):
+                if abs(plat - lat) > dlat or abs(plng - lng) > dlng:
+                    continue
+                d = haversine_miles(lat, lng, plat, plng)
+                if d <= miles:
+                    found.append((d, self._points[(plat, plng)]))
+        found.sort(key=lambda x: x[0])
+        out = []
+        for d, idx in found:
+            out.extend((d, self.events[k]) for k in idx[:None if limit is None else limit - len(out)])
+            if limit is not None and len(out) >= limit:
+                break
+        return out
+
+
+# ==================== QUERY ====================
+INDEXED_FIELDS = ("category", "subcategory", "city", "source", "age_group")
+# Interval index classes by event length in days; the last one takes the rest
+_SPAN_CLASSES = (0, 3, 7, 31, 92, 366)
+
+
+class EventIndex:
+    """Secondary indexes over a scraped event set for filtered and faceted reads.
+
+    Keeps a value -> id-set map for each of ``INDEXED_FIELDS`` and an interval
+    index over parsed date ranges: events are split by length, and each class
+    is sorted by start so a date window becomes a couple of bisects. Combined
+    filters intersect the prebuilt sets, then check dates on the survivors;
+    recurring events must also have an occurrence inside the window::
+
+        idx = EventIndex(events)
+        idx.select(category="kids_athletics", city="Bettendorf",
+                   start=date(2026, 5, 1), end=date(2026, 6, 30))
+        idx.facets(("category", "city"), start=date(2026, 7, 1))
+    """
+
+    def __init__(self, events: Iterable[Event]):
+        self.events = list(events)
+        self._columns = {f: [getattr(e, f) for e in self.events] for f in INDEXED_FIELDS}
+        self._index: Dict[str, Dict[Optional[str], set]] = {}
+        for name, column in self._columns.items():
+            index = self._index[name] = defaultdict(set)
+            for i, v in enumerate(column):
+                index[v].add(i)
+        self._recurring = {i for i, e in enumerate(self.events) if e.recurrence}
+        self._starts = array('l')
+        self._ends = array('l')
+        classes = [[] for _ in range(len(_SPAN_CLASSES) + 1)]
+        for i, e in enumerate(self.events):
+            rng = parse_date_range(e.date) if e.date else None
+            s, t = (rng.start.toordinal(), rng.end.toordinal()) if rng else (0, -1)
+            self._starts.append(s)
+            self._ends.append(t)
+            if rng:
+                classes[bisect.bisect_left(_SPAN_CLASSES, t - s)].append((s, t, i))
+        self._spans = []
+        for members in classes:
+            if members:
+                members.sort()
+                self._spans.append((max(t - s for s, t, _ in members),
+                                    array('l', (m[0] for m in members)),
+                                    array('l', (m[1] for m in members)),
+                                    array('l', (m[2] for m in members))))
+
+    def __len__(self):
+        return len(self.events)
+
+    def _field_ids(self, name, value) -> set:
+        if name not in self._index:
+            raise ValueError(f"{name} is not indexed; choose from {', '.join(INDEXED_FIELDS)}")
+        index = self._index[name]
+        if value is None or isinstance(value, str):
+            return index.get(value, set())
+        return set().union(*(index.get(v, ()) for v in value))
+
+    def _date_ids(self, lo: int, hi: int) -> set:
+        ids = set()
+        for longest, starts, ends, members in self._spans:
+            first = bisect.bisect_left(starts, lo - longest)
+            inside = bisect.bisect_left(starts, lo)
+            last = bisect.bisect_right(starts, hi)
+            ids.update(members[k] for k in range(first, min(inside, last)) if ends[k] >= lo)
+            ids.update(members[max(inside, first):last])
+        return ids
+
+    def _match(self, start: Optional[date], end: Optional[date], filters) -> Iterable[int]:
+        dated = start is not None or end is not None
+        lo = start.toordinal() if start else 1
+        hi = end.toordinal() if end else date.max.toordinal()
+        sets = sorted((self._field_ids(name, value) for name, value in filters.items()), key=len)
+        if not sets:
+            if not dated:
+                return range(len(self.events))
+            matched = self._date_ids(lo, hi)
+        else:
+            matched = sets[0].intersection(*sets[1:])
+            if dated:
+                starts, ends = self._starts, self._ends
+                matched = [i for i in matched if starts[i] <= hi and ends[i] >= lo]
+        if dated and self._recurring:
+            # The interval index holds each recurring event's outer range;
+            # keep it only if an actual occurrence falls in the window.
+            window = date.fromordinal(lo), date.fromordinal(hi)
+            matched = [i for i in matched
+                       if i not in self._recurring or next(occurrences(self.events[i], *window), None)]
+        return matched
+
+    def ids(self, start: Optional[date] = None, end: Optional[date] = None, **filters) -> List[int]:
+        """Positions of events matching every filter, in scrape order.
+
+        Each keyword names an indexed field and takes one value or a list of
+        accepted values. ``start``/``end`` keep events whose date range
+        overlaps them; undated events never match a date filter.
+        """
+        return sorted(self._match(start, end, filters))
+
+    def select(self, start: Optional[date] = None, end: Optional[date] = None, **filters) -> List[Event]:
+        return [self.events[i] for i in self.ids(start, end, **filters)]
+
+    def facets(self, fields: Iterable[str] = INDEXED_FIELDS, start: Optional[date] = None,
+               end: Optional[date] = None, **filters) -> Dict[str, Dict[str, int]]:
+        """Per-value counts of ``fields`` over the matching events, largest first."""
+        out = {}
+        matched = self._match(start, end, filters) if (filters or start or end) else None
+        for name in fields:
+            if name not in self._index:
+                raise ValueError(f"{name} is not indexed; choose from {', '.join(INDEXED_FIELDS)}")
+            if matched is None:
+                counts = {v: len(ids) for v, ids in self._index[name].items()}
+            else:
+                counts = Counter(map(self._columns[name].__getitem__, matched))
+            counts.pop(None, None)
+            out[name] = dict(sorted(counts.items(), key=lambda kv: -kv[1]))
+        return out
+
+
+# ==================== SEARCH ====================
+# Searched fields and their term-frequency weights (a title hit counts triple)
+SEARCH_FIELDS = (("title", 3), ("venue", 2), ("city", 1), ("subcategory", 1), ("category", 1), ("description", 1))
+SEARCH_MAGIC = b"IEVSRCH1"
+# magic, docs, terms, total weighted tokens, then (start, end) byte offsets of
+# the 7 sections: terms, term_starts, post_docs, post_tfs, doc_lens, doc_blob, doc_starts
+_SEARCH_HEADER = struct.Struct("<8s3Q14Q")
+_TOKEN_RE = re.compile(r"[^\W_]+")
+_QUERY_RE = re.compile(r"([^\W_]+)(\*?)")
+PREFIX_TERMS = 50   # most frequent expansions kept per prefix
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.casefold())
+
+
+class SearchHit(NamedTuple):
+    score: float
+    position: int        # index into the events list the index was built from
+    id: str
+    title: str
+    date: str
+    city: str
+
+
+def pack_search_index(events: Iterable[Event]) -> bytes:
+    """Serialize an inverted index over ``SEARCH_FIELDS`` of ``events``.
+
+    Postings are flat uint32 doc / uint16 weighted-tf arrays grouped by term,
+    with terms sorted so prefixes are contiguous ranges. Arrays use native
+    byte order.
+    """
+    postings: Dict[str, Tuple[array, array]] = {}
+    doc_lens = array("I")
+    doc_starts = array("Q", [0])
+    doc_blob = bytearray()
+    total = 0
+    for n, e in enumerate(events):
+        tf: Counter = Counter()
+        for name, weight in SEARCH_FIELDS:
+            text = getattr(e, name)
+            if text:
+                for tok in tokenize(text):
+                    tf[tok] += weight
+        length = sum(tf.values())
+        doc_lens.append(length)
+        total += length
+        for tok, count in tf.items():
+            p = postings.get(tok)
+            if p is None:
+                p = postings[tok] = (array("I"), array("H"))
+            p[0].append(n)
+            p[1].append(min(count, 0xFFFF))
+        doc_blob += "\x1f".join((v or "").replace("\x1f", " ") for v in (e.id, e.title, e.date, e.city)).encode()
+        doc_starts.append(len(doc_blob))
+    terms = sorted(postings)
+    term_starts = array("Q", [0])
+    post_docs, post_tfs = array("I"), array("H")
+    for t in terms:
+        docs, tfs = postings[t]
+        post_docs += docs
+        post_tfs += tfs
+        term_starts.append(len(post_docs))
+    sections = ["\n".join(terms).encode(), term_starts.tobytes(), post_docs.tobytes(), post_tfs.tobytes(),
+                doc_lens.tobytes(), bytes(doc_blob), doc_starts.tobytes()]
+    out = bytearray(_SEARCH_HEADER.size)
+    offsets = []
+    for sec in sections:
+        out += b"\0" * (-len(out) % 8)   # keep every array 8-byte aligned
+        offsets += [len(out), len(out) + len(sec)]
+        out += sec
+    _SEARCH_HEADER.pack_into(out, 0, SEARCH_MAGIC, len(doc_lens), len(terms), total, *offsets)
+    return bytes(out)
+
+
+class SearchIndex:
+    """BM25-ranked full-text search over a ``pack_search_index`` buffer.
+
+    ``SearchIndex.open(path)`` memory-maps the file: only the term list is
+    decoded up front, and postings are read in place. Query words match
+    exact terms; a word ending in ``*``, or the last word while it is still
+    being typed (no trailing space), also matches every term it prefixes.
+    """
+
+    K1, B = 1.2, 0.75
+
+    def __init__(self, buf):
+        self.buf = buf
+        if len(buf) < _SEARCH_HEADER.size:
+            raise ValueError("not an events search index")
+        magic, self.n_docs, n_terms, total, *offsets = _SEARCH_HEADER.unpack_from(buf)
+        if magic != SEARCH_MAGIC:
+            raise ValueError("not an events search index")
+        mv = memoryview(buf)
+        terms, starts, docs, tfs, lens, blob, doc_starts = (mv[a:b] for a, b in zip(offsets[::2], offsets[1::2]))
+        self.terms = bytes(terms).decode().split("\n") if n_terms else []
+        self._starts = starts.cast("Q")
+        self._docs = docs.cast("I")
+        self._tfs = tfs.cast("H")
+        self._lens = lens.cast("I")
+        self._blob = blob
+        self._doc_starts = doc_starts.cast("Q")
+        self.avgdl = total / self.n_docs if self.n_docs else 1.0
+
+    @classmethod
+    def from_events(cls, events: Iterable[Event]) -> "SearchIndex":
+        return cls(pack_search_index(events))
+
+    @classmethod
+    def open(cls, path: str) -> "SearchIndex":
+        import mmap
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def save(self, path: str):
+        with atomic_open(path, binary=True) as f:
+            f.write(self.buf)
+
+    def __len__(self):
+        return self.n_docs
+
+    def _expand(self, word: str, prefix: bool) -> List[int]:
+        i = bisect.bisect_left(self.terms, word)
+        if not prefix:
+            return [i] if i < len(self.terms) and self.terms[i] == word else []
+        j = bisect.bisect_left(self.terms, word[:-1] + chr(ord(word[-1]) + 1), i)
+        if j - i <= PREFIX_TERMS:
+            return list(range(i, j))
+        return heapq.nlargest(PREFIX_TERMS, range(i, j), key=lambda t: self._starts[t + 1] - self._starts[t])
+
+    def _idf(self, t: int) -> float:
+        df = self._starts[t + 1] - self._starts[t]
+        return math.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+
+    def _tf(self, t: int, doc: int) -> int:
+        lo, hi = self._starts[t], self._starts[t + 1]
+        i = bisect.bisect_left(self._docs, doc, lo, hi)
+        return self._tfs[i] if i < hi and self._docs[i] == doc else 0
+
+    def _scores(self, terms: List[int], docs: Optional[Dict[int, float]] = None) -> Dict[int, float]:
+        """doc -> best BM25 score among ``terms`` (the expansions of one query word).
+
+        Restricted to ``docs`` when given: a few candidates are binary-searched
+        in the postings, many are checked while walking them.
+        """
+        k1, lens = self.K1, self._lens
+        norm_a, norm_b = k1 * (1 - self.B), k1 * self.B / self.avgdl
+        scores: Dict[int, float] = {}
+        for t in terms:
+            idf = self._idf(t) * (k1 + 1)
+            lo, hi = self._starts[t], self._starts[t + 1]
+            if docs is None:
+                pairs = zip(self._docs[lo:hi], self._tfs[lo:hi])
+            elif len(docs) * 16 < hi - lo:
+                pairs = ((doc, tf) for doc in docs if (tf := self._tf(t, doc)))
+            else:
+                pairs = ((doc, tf) for doc, tf in zip(self._docs[lo:hi], self._tfs[lo:hi]) if doc in docs)
+            for doc, tf in pairs:
+                s = idf * tf / (tf + norm_a + norm_b * lens[doc])
+                if s > scores.get(doc, 0.0):
+                    scores[doc] = s
+        return scores
+
+    def hit(self, position: int, score=0.0) -> SearchHit:
+        a, b = self._doc_starts[position], self._doc_starts[position + 1]
+        return SearchHit(score, position, *bytes(self._blob[a:b]).decode().split("\x1f"))
+
+    def search(self, query: str, limit: Optional[int] = 20, match_all=True) -> List[SearchHit]:
+        """Best hits for ``query``, highest score first.
+
+        With ``match_all`` every query word must match. Candidates then come
+        from the rarest word's postings and the other words are looked up by
+        binary search, so common words cost little.
+        """
+        query = query.casefold()
+        words = list(_QUERY_RE.finditer(query))
+        groups = [self._expand(m.group(1), bool(m.group(2)) or (m.end() == len(query) and n == len(words) - 1))
+                  for n, m in enumerate(words)]
+        if not groups or (match_all and not all(groups)):
+            return []
+        if match_all:
+            df = [sum(self._starts[t + 1] - self._starts[t] for t in g) for g in groups]
+            rarest = df.index(min(df))
+            scores = self._scores(groups[rarest])
+            for g in groups[:rarest] + groups[rarest + 1:]:
+                more = self._scores(g, scores)
+                scores = {doc: s + more[doc] for doc, s in scores.items() if doc in more}
+        else:
+            scores = Counter()
+            for g in groups:
+                scores.update(self._scores(g))
+        key = lambda kv: (kv[1], -kv[0])
+        ranked = sorted(scores.items(), key=key, reverse=True) if limit is None else \
+            heapq.nlargest(limit, scores.items(), key=key)
+        return [self.hit(doc, round(s, 4)) for doc, s in ranked]
+
+
+# ==================== LIVE FETCH ====================
+@dataclass
+class FetchResult:
+    source: str
+    url: str
+    status: Optional[int] = None
+    body: Optional[bytes] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+    error: Optional[str] = None
+    attempts: int = 1
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status == 200
+
+
+class FetchCache:
+    """On-disk record of each page's ETag, Last-Modified, body hash and parsed events.
+
+    Each entry records the ``parser_key`` its events came from; an entry from
+    another parser version or selector set is a miss. Entries not confirmed
+    for ``max_age_days`` are dropped on save, and beyond ``max_entries`` the
+    least recently confirmed ones go first.
+    """
+
+    def __init__(self, path=".cache/fetch_cache.json", max_age_days=30.0, max_entries=5000):
+        self.path = path
+        self.max_age = max_age_days * 86400
+        self.max_entries = max_entries
+        self.entries: Dict[str, dict] = {}
+        self.hits = self.misses = 0
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def validators(self, url) -> Dict[str, str]:
+        entry = self.entries.get(url) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def require_parser(self, url, parser: str):
+        """Invalidate ``url``'s entry unless its events came from ``parser``.
+
+        The page is then fetched without validators and re-parsed; its change
+        history is kept.
+        """
+        entry = self.entries.get(url)
+        if entry and entry.get("parser") != parser:
+            entry.update(etag=None, last_modified=None, sha256=None, parser=None, events=None)
+
+    def lookup(self, page: FetchResult, parser: str) -> Tuple[Optional[List[dict]], Optional[str]]:
+        """Cached events if ``page`` is a 304 or unchanged body parsed by ``parser``, plus the body hash."""
+        entry = self.entries.get(page.url)
+        digest = hashlib.sha256(page.body).hexdigest() if page.body is not None else None
+        if (entry and entry.get("parser") == parser
+                and (page.status == 304 or (page.ok and digest == entry["sha256"]))):
+            entry["checked_at"] = time.time()
+            entry["checks"] = entry.get("checks", 0) + 1
+            self.hits += 1
+            return entry["events"], digest
+        self.misses += 1
+        return None, digest
+
+    def store(self, page: FetchResult, digest, parser: str, events: List[dict]):
+        old = self.entries.get(page.url) or {}
+        self.entries[page.url] = {
+            "etag": page.headers.get("ETag"),
+            "last_modified": page.headers.get("Last-Modified"),
+            "sha256": digest,
+            "parser": parser,
+            "checked_at": time.time(),
+            "checks": old.get("checks", 0) + 1,
+            "changes": old.get("changes", 0) + 1,
+            "events": events,
+        }
+
+    def change_rate(self, url) -> float:
+        """Smoothed share of past checks that found the page changed; 1.0 for unseen pages."""
+        entry = self.entries.get(url)
+        if not entry:
+            return 1.0
+        return (entry.get("changes", 0) + 1) / (entry.get("checks", 0) + 1)
+
+    def evict(self):
+        cutoff = time.time() - self.max_age
+        live = sorted(((k, v) for k, v in self.entries.items() if v["checked_at"] >= cutoff),
+                      key=lambda kv: kv[1]["checked_at"], reverse=True)
+        self.entries = dict(live[:self.max_entries])
+
+    def save(self):
+        self.evict()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with atomic_open(self.path) as f:
+            json.dump(self.entries, f)
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` requests per second, bursts up to ``burst``.
+
+    ``hold`` pauses the bucket (Retry-After); ``slow_down`` halves the rate
+    after a throttling response and ``speed_up`` creeps back toward the
+    ceiling on success, so a host settles just below its limit.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = self.max_rate = rate
+        self.min_rate = rate / 16
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.not_before = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline: Optional[float] = None) -> bool:
+        """Wait for a token; False if it would not come before ``deadline`` (monotonic)."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.not_before and self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = max(self.not_before - now, (1 - self.tokens) / self.rate)
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def hold(self, seconds: float):
+        with self._lock:
+            self.not_before = max(self.not_before, time.monotonic() + seconds)
+            self.tokens = 0
+
+    def limit(self, rate: float):
+        with self._lock:
+            self.rate = self.max_rate = min(self.max_rate, rate)
+            self.min_rate = min(self.min_rate, self.rate)
+            self.burst = 1
+
+    def slow_down(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def speed_up(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+def retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class _Host:
+    def __init__(self, session, per_host, rate, burst):
+        self.session = session
+        self.slots = threading.BoundedSemaphore(per_host)
+        self.bucket = TokenBucket(rate, burst)
+        self.robots: Optional["RobotFileParser"] = None
+        self.lock = threading.Lock()
+
+
+class Fetcher:
+    """Pulls source pages concurrently, politely.
+
+    A thread pool of ``max_workers`` caps total in-flight requests. Each host
+    gets its own pooled ``requests.Session`` limited to ``per_host``
+    connections and a token bucket of ``rate`` requests per second, lowered to
+    its robots.txt Crawl-delay. Disallowed pages are not fetched. 429 and 5xx
+    answers and dropped connections are retried up to ``retries`` times with
+    full-jitter exponential backoff, waiting at least the Retry-After, which
+    also pauses the whole host for up to one page budget. Every page has a
+    wall-clock budget (``timeout`` or ``timeouts[source key]``) covering queueing for the host, connect, body read and
+    retries. ``base_url`` rewrites ``https://host/path?query`` to
+    ``base_url/host/path?query`` so a run can be replayed against
+    ``python -m http.server`` serving recorded pages. With a ``cache``,
+    requests are made conditional on the stored validators and pages that
+    change often are fetched first.
+    """
+
+    def __init__(self, max_workers=16, per_host=4, timeout=15.0, timeouts=None, base_url=None, cache=None,
+                 rate=2.0, burst=4, retries=3, backoff=0.5, robots=True):
+        self.cache: Optional[FetchCache] = cache
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.timeouts = timeouts or {}
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.robots = robots
+        self._hosts: Dict[str, _Host] = {}
+        self._lock = threading.Lock()
+
+    def _host(self, host) -> _Host:
+        import requests
+        from requests.adapters import HTTPAdapter
+        with self._lock:
+            if host not in self._hosts:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.per_host)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers["User-Agent"] = USER_AGENT
+                self._hosts[host] = _Host(session, self.per_host, self.rate, self.burst)
+            return self._hosts[host]
+
+    def _target(self, url):
+        if not self.base_url:
+            return url
+        parts = urlsplit(url)
+        return f"{self.base_url}/{parts.netloc}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else "")
+
+    def _robots(self, url, host: _Host, deadline: float) -> Tuple[Optional["RobotFileParser"], Optional[str]]:
+        """The host's robots.txt rules, fetched once, or ``(None, reason)``.
+
+        A 4xx means allow all and 401/403 deny all. A 5xx or unreachable
+        robots.txt is a temporary failure: nothing is fetched from the host
+        for this page, nothing is remembered, and the host's next page asks again.
+        """
+        import requests
+        from urllib.robotparser import RobotFileParser
+        with host.lock:
+            if host.robots is None:
+                parts = urlsplit(url)
+                if not host.bucket.acquire(deadline):
+                    return None, "robots.txt not reachable within the time budget"
+                try:
+                    r = host.session.get(self._target(f"{parts.scheme}://{parts.netloc}/robots.txt"),
+                                         timeout=max(0.1, deadline - time.monotonic()))
+                except requests.RequestException as e:
+                    return None, f"robots.txt unreachable ({e})"
+                if r.status_code >= 500:
+                    return None, f"robots.txt unavailable ({r.status_code})"
+                rules = RobotFileParser()
+                if r.status_code in (401, 403):
+                    rules.disallow_all = True
+                elif r.status_code == 200:
+                    rules.parse(r.text.splitlines())
+                else:
+                    rules.allow_all = True
+                delay = rules.crawl_delay(USER_AGENT)
+                if delay:
+                    host.bucket.limit(1 / float(delay))
+                    logger.info(f"{parts.netloc}: robots.txt Crawl-delay {delay}s")
+                host.robots = rules
+            return host.robots, None
+
+    def fetch(self, source, url) -> FetchResult:
+        """Fetch one page within its budget; queueing for the host counts against it."""
+        start = time.perf_counter()
+        budget = self.timeouts.get(source, self.timeout)
+        deadline = time.monotonic() + budget
+        target = self._target(url)
+        host = self._host(urlsplit(url).netloc)
+        if self.robots:
+            rules, reason = self._robots(url, host, deadline)
+            if rules is None or not rules.can_fetch(USER_AGENT, url):
+                return FetchResult(source, url, error=reason or "disallowed by robots.txt",
+                                   elapsed=time.perf_counter() - start)
+        headers = self.cache.validators(url) if self.cache else {}
+        if not host.bucket.acquire(deadline):
+            return FetchResult(source, url, error="no request slot for the host within the time budget",
+                               elapsed=time.perf_counter() - start)
+        attempt = 0
+        while True:
+            result, retry = self._get(host, source, url, target, headers, deadline)
+            result.attempts = attempt + 1
+            if not retry:
+                host.bucket.speed_up()
+                break
+            wait = random.uniform(0, self.backoff * 2 ** attempt)
+            if result.status in (429, 503):
+                host.bucket.slow_down()
+                hinted = retry_after(result.headers.get("Retry-After"))
+                if hinted is not None:
+                    # a server may ask for hours; pause the host for at most one page budget
+                    host.bucket.hold(min(hinted, budget))
+                    wait = max(wait, hinted)
+            attempt += 1
+            if attempt > self.retries or time.monotonic() + wait >= deadline:
+                break
+            logger.info(f"Retrying {url} in {wait:.2f}s ({result.error or result.status})")
+            time.sleep(wait)
+            if not host.bucket.acquire(deadline):
+                break
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def _get(self, host: _Host, source, url, target, headers, deadline) -> Tuple[FetchResult, bool]:
+        """One request within ``deadline``, and whether it is worth retrying."""
+        import requests
+        if not host.slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            return FetchResult(source, url, error="no connection to the host within the time budget"), False
+        try:
+            with host.session.get(target, headers=headers, timeout=max(0.1, deadline - time.monotonic()),
+                                  stream=True) as r:
+                chunks = []
+                for chunk in r.iter_content(65536):
+                    chunks.append(chunk)
+                    if time.monotonic() > deadline:
+                        raise requests.Timeout("exceeded budget reading body")
+                return (FetchResult(source, url, r.status_code, b"".join(chunks), dict(r.headers)),
+                        r.status_code in RETRY_STATUSES)
+        except requests.ConnectionError as e:
+            return FetchResult(source, url, error=str(e)), True
+        except requests.RequestException as e:
+            return FetchResult(source, url, error=str(e)), False
+        finally:
+            host.slots.release()
+
+    def fetch_all(self, targets: Iterable[Tuple[str, str]]) -> Dict[str, FetchResult]:
+        """Fetch every (source, url) pair once; returns results keyed by url.
+
+        Pages are queued by how often they changed on past runs, most
+        volatile first, so they get the hosts' tokens before stable ones.
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        results: Dict[str, FetchResult] = {}
+        unique = {url: source for source, url in targets}
+        order = sorted(unique, key=self.cache.change_rate, reverse=True) if self.cache else list(unique)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(self.fetch, unique[url], url) for url in order]
+            for fut in as_completed(futures):
+                res = fut.result()
+                results[res.url] = res
+                if res.ok:
+                    logger.info(f"Fetched {res.url} ({len(res.body)} bytes, {res.elapsed:.2f}s)")
+                elif res.status == 304:
+                    logger.info(f"Not modified: {res.url} ({res.elapsed:.2f}s)")
+                else:
+                    logger.warning(f"Fetch failed for {res.url}: {res.error or res.status}")
+        return results
+
+    def close(self):
+        for host in self._hosts.values():
+            host.session.close()
+
+
+def _jsonld_events(blocks: Iterable[str]) -> List[dict]:
+    """schema.org Event objects in the text of JSON-LD script blocks."""
+    found = []
+    stack = []
+    for block in blocks:
+        try:
+            stack.append(json.loads(block))
+        except ValueError:
+            continue
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, dict):
+            types = node.get("@type")
+            types = types if isinstance(types, list) else [types]
+            if any(isinstance(t, str) and t.endswith("Event") for t in types):
+                found.append(node)
+            elif "@graph" in node:
+                stack.append(node["@graph"])
+    return found
+
+
+def _split_iso(value) -> Tuple[Optional[str], Optional[str]]:
+    """'2026-05-02T08:15:00-05:00' -> ('May 2, 2026', '8:15 AM')"""
+    if not isinstance(value, str) or not value:
+        return None, None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return value, None
+    day = f"{dt.strftime('%B')} {dt.day}, {dt.year}"
+    if len(value) <= 10:
+        return day, None
+    return day, dt.strftime("%I:%M %p").lstrip("0")
+
+
+# ==================== HTML PARSING ====================
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Per-layout XPath, compiled once. "item" is tested on each closed element
+# that has the "attr" attribute; the other expressions run relative to a
+# matched item and fill the JSON-LD-shaped node of the same name.
+SELECTORS = {
+    # schema.org microdata (itemscope/itemprop), the default for every source
+    "microdata": {
+        "attr": "itemscope",
+        "item": "self::*[contains(@itemtype, 'schema.org/') and contains(@itemtype, 'Event')]",
+        "name": "(.//*[@itemprop='name'][not(ancestor::*[@itemprop='location'])])[1]",
+        "startDate": "(.//*[@itemprop='startDate'])[1]",
+        "endDate": "(.//*[@itemprop='endDate'])[1]",
+        "url": "(.//*[@itemprop='url'][not(ancestor::*[@itemprop='location'])])[1]",
+        "description": "(.//*[@itemprop='description'])[1]",
+        "venue": "(.//*[@itemprop='location']//*[@itemprop='name'])[1]",
+        "city": "(.//*[@itemprop='addressLocality'])[1]",
+    },
+    # The Events Calendar (WordPress) list view
+    "tribe": {
+        "attr": "class",
+        "item": f"self::*[{_has_class('tribe-events-calendar-list__event')}]",
+        "name": f"normalize-space((.//*[{_has_class('tribe-events-calendar-list__event-title')}]//a)[1])",
+        "startDate": f"(.//time[{_has_class('tribe-events-calendar-list__event-datetime')}]/@datetime)[1]",
+        "url": f"(.//*[{_has_class('tribe-events-calendar-list__event-title')}]//a/@href)[1]",
+        "description": f"(.//*[{_has_class('tribe-events-calendar-list__event-description')}])[1]",
+        "venue": f"(.//*[{_has_class('tribe-events-calendar-list__event-venue-title')}])[1]",
+        "city": f"(.//*[{_has_class('tribe-locality')}])[1]",
+    },
+}
+
+
+class CompiledSelectors(NamedTuple):
+    attr: str
+    item: "etree.XPath"
+    fields: Dict[str, "etree.XPath"]
+
+
+@lru_cache(maxsize=None)
+def compile_selectors(name: str) -> CompiledSelectors:
+    from lxml import etree
+    spec = SELECTORS[name]
+    return CompiledSelectors(spec["attr"], etree.XPath(spec["item"]),
+                             {k: etree.XPath(v, smart_strings=False) for k, v in spec.items()
+                              if k not in ("attr", "item")})
+
+
+@lru_cache(maxsize=None)
+def parser_key(selectors: str) -> str:
+    """Identity of the parser and selector set behind cached events: version, name and spec hash."""
+    spec = json.dumps(SELECTORS[selectors], sort_keys=True).encode("utf-8")
+    return f"{PARSER_VERSION}:{selectors}:{hashlib.blake2b(spec, digest_size=4).hexdigest()}"
+
+
+_ATTR_VALUES = {"meta": "content", "a": "href", "link": "href", "area": "href", "img": "src", "time": "datetime"}
+
+
+def _xpath_value(found) -> Optional[str]:
+    """Text of an XPath result; elements follow the microdata value rules."""
+    if isinstance(found, list):
+        if not found:
+            return None
+        found = found[0]
+    if isinstance(found, str):
+        value = found
+    else:
+        value = found.get(_ATTR_VALUES.get(found.tag, "content")) or "".join(found.itertext())
+    value = " ".join(value.split())
+    return value or None
+
+
+def _html_node(el, fields: Dict[str, "etree.XPath"]) -> dict:
+    v = {k: _xpath_value(xp(el)) for k, xp in fields.items()}
+    return {"name": v.get("name"), "startDate": v.get("startDate"), "endDate": v.get("endDate"),
+            "url": v.get("url"), "description": v.get("description"),
+            "location": {"name": v.get("venue"), "address": {"addressLocality": v.get("city")}}}
+
+
+def iter_html(chunks: Iterable[bytes], selectors="microdata") -> Iterator[Tuple[str, object]]:
+    """Stream a page through lxml, yielding ``("jsonld", text)`` for JSON-LD
+    script blocks and ``("item", node)`` for markup matching ``selectors``.
+
+    Matched items and scripts are cleared, along with everything before them,
+    as soon as they close, so a long calendar page is never held as a full tree.
+    """
+    from lxml import etree
+    sel = compile_selectors(selectors)
+    parser = etree.HTMLPullParser(events=("end",), encoding="utf-8")
+
+    def drain():
+        for _, el in parser.read_events():
+            if el.tag == "script":
+                if "ld+json" in (el.get("type") or ""):
+                    yield "jsonld", el.text or ""
+            elif el.get(sel.attr) is not None and sel.item(el):
+                yield "item", _html_node(el, sel.fields)
+            else:
+                continue
+            el.clear(keep_tail=True)
+            parent = el.getparent()
+            while parent is not None and el.getprevious() is not None:
+                del parent[0]
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+
+def page_events(body: bytes, selectors="microdata", chunk_size=1 << 16) -> List[dict]:
+    """JSON-LD-shaped event nodes from a page.
+
+    Embedded JSON-LD wins; the markup selectors are the fallback for pages
+    that only describe their events in HTML.
+    """
+    blocks, items = [], []
+    chunks = (body[i:i + chunk_size] for i in range(0, len(body), chunk_size))
+    for kind, value in iter_html(chunks, selectors):
+        (blocks if kind == "jsonld" else items).append(value)
+    return _jsonld_events(blocks) or items
+
+
+# ==================== METRICS ====================
+SOURCE_METRICS = {
+    # name: (prometheus type, help)
+    "fetch_seconds": ("gauge", "Wall-clock time fetching the source's live pages"),
+    "fetch_bytes": ("gauge", "Bytes downloaded for the source's live pages"),
+    "fetch_errors": ("gauge", "Live pages that failed or returned a non-200/304 status"),
+    "fetch_retries": ("gauge", "Extra attempts after 429/5xx answers or dropped connections"),
+    "cache_hits": ("gauge", "Live pages answered 304 or unchanged, served from the fetch cache"),
+    "cache_misses": ("gauge", "Live pages that had to be parsed"),
+    "parse_seconds": ("gauge", "Time parsing the source's live pages"),
+    "run_seconds": ("gauge", "Total time running the source task"),
+    "events_emitted": ("gauge", "Events the source produced after the date filter"),
+    "dropped_past": ("gauge", "Events the source produced that had already ended"),
+    "failed": ("gauge", "1 if the source raised or timed out"),
+}
+
+
+class RunMetrics:
+    """Counters and timings for one scrape run.
+
+    Per-source values are plain float adds into nested dicts and stages are
+    timed with ``perf_counter``, so collection costs next to nothing and is
+    always on. ``to_json`` writes the run report; ``to_prometheus`` renders
+    the same numbers in Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.sources: Dict[str, Dict[str, float]] = {}
+        self.stages: Dict[str, float] = {}
+        self.counters: Dict[str, float] = defaultdict(float)
+
+    def add(self, source: str, name: str, value: float = 1):
+        values = self.sources.get(source)
+        if values is None:
+            values = self.sources[source] = dict.fromkeys(SOURCE_METRICS, 0.0)
+        values[name] += value
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def to_dict(self) -> dict:
+        return {
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(),
+            "stages": {k: round(v, 6) for k, v in self.stages.items()},
+            "counters": dict(self.counters),
+            "sources": {k: {m: round(v, 6) for m, v in vals.items()} for k, vals in self.sources.items()},
+        }
+
+    def to_json(self, filename="run_metrics.json"):
+        with atomic_open(filename) as f:
+            json.dump(self.to_dict(), f, indent=2)
+        logger.info(f"Saved to {filename}")
+
+    def to_prometheus(self, prefix="iowa_events") -> str:
+        lines = [f"# HELP {prefix}_run_started_seconds Unix time the run started",
+                 f"# TYPE {prefix}_run_started_seconds gauge",
+                 f"{prefix}_run_started_seconds {self.started_at:.3f}",
+                 f"# HELP {prefix}_stage_seconds Wall-clock time per pipeline stage",
+                 f"# TYPE {prefix}_stage_seconds gauge"]
+        lines += [f'{prefix}_stage_seconds{{stage="{k}"}} {v:.6f}' for k, v in self.stages.items()]
+        for name, value in self.counters.items():
+            lines += [f"# TYPE {prefix}_{name} gauge", f"{prefix}_{name} {value:g}"]
+        for metric, (kind, help_text) in SOURCE_METRICS.items():
+            lines += [f"# HELP {prefix}_source_{metric} {help_text}", f"# TYPE {prefix}_source_{metric} {kind}"]
+            lines += [f'{prefix}_source_{metric}{{source="{k}"}} {vals[metric]:g}' for k, vals in self.sources.items()]
+        return "\n".join(lines) + "\n"
+
+    def save_prometheus(self, filename="run_metrics.prom"):
+        with atomic_open(filename) as f:
+            f.write(self.to_prometheus())
+        logger.info(f"Saved to {filename}")
+
+
+# ==================== SOURCE REGISTRY ====================
+class Page(NamedTuple):
+    name: str
+    url: str
+    city: Optional[str]
+    category: str
+
+
+@dataclass(frozen=True)
+class Source:
+    key: str
+    name: str
+    url: str
+    parser: str                 # IowaEventsScraper method that adds the static events
+    category: str
+    city: Optional[str] = None
+    extra_pages: Tuple[Page, ...] = ()
+    enabled: bool = True
+    selectors: str = "microdata"  # SELECTORS layout used for markup without JSON-LD
+    region: str = DEFAULT_REGION  # REGIONS key: location suffix and geocoder
+
+    @property
+    def pages(self) -> Tuple[Page, ...]:
+        """Live pages fetched for this source with --live."""
+        return (Page(self.name, self.url, self.city, self.category),) + self.extra_pages
+
+
+SOURCES: Dict[str, Source] = {}
+
+
+def register_source(key, name, url, category, city=None, extra_pages=(), enabled=True, selectors="microdata",
+                    region=DEFAULT_REGION):
+    """Register the decorated ``IowaEventsScraper`` method as source ``key``."""
+    if selectors not in SELECTORS:
+        raise ValueError(f"Unknown selectors {selectors!r} for source {key}")
+    if region not in REGIONS:
+        raise ValueError(f"Unknown region {region!r} for source {key}")
+
+    def decorate(method):
+        SOURCES[key] = Source(key, name, url, method.__name__, category, city,
+                              tuple(Page(*p) for p in extra_pages), enabled, selectors, region)
+        return method
+    return decorate
+
+
+def source_settings(config: Optional[dict], section: str) -> Dict[str, float]:
+    """Per-source seconds from ``config[section]``, e.g. ``{"timeouts": {"tbk": 30}}``."""
+    settings = (config or {}).get(section) or {}
+    unknown = sorted(k for k in settings if k not in SOURCES)
+    if unknown:
+        raise ValueError(f"Unknown source(s) in {section}: {', '.join(unknown)}")
+    bad = sorted(k for k, v in settings.items()
+                 if isinstance(v, bool) or not isinstance(v, (int, float)) or not 0 < v < float("inf"))
+    if bad:
+        raise ValueError(f"{section} must be positive seconds: {', '.join(bad)}")
+    return {k: float(v) for k, v in settings.items()}
+
+
+def select_sources(only: Iterable[str] = (), skip: Iterable[str] = (), config: Optional[dict] = None) -> List[Source]:
+    """Enabled sources in registry order.
+
+    ``config`` is ``{"sources": {"<key>": true|false}}``; ``only`` then
+    restricts the run to the listed keys and ``skip`` turns keys off.
+    """
+    only, skip = list(only), list(skip)
+    toggles = (config or {}).get("sources", {})
+    unknown = sorted(k for k in [*only, *skip, *toggles] if k not in SOURCES)
+    if unknown:
+        raise ValueError(f"Unknown source(s): {', '.join(unknown)}")
+    enabled = {k: bool(toggles.get(k, s.enabled)) for k, s in SOURCES.items()}
+    if only:
+        enabled = {k: k in only for k in SOURCES}
+    for k in skip:
+        enabled[k] = False
+    return [s for k, s in SOURCES.items() if enabled[k]]
+
+
+@dataclass
+class SourceResult:
+    key: str
+    events: List[Event] = field(default_factory=list)
+    parsed: Dict[str, List[dict]] = field(default_factory=dict)   # url -> freshly parsed events, for the cache
+    elapsed: float = 0.0
+    parse_seconds: float = 0.0
+    dropped_past: int = 0
+    error: Optional[str] = None
+
+
+def run_source(source: Source, inputs=(), today: Optional[date] = None,
+               deadline: Optional[float] = None) -> SourceResult:
+    """Run one source in isolation: its live pages, then its static table.
+
+    ``inputs`` holds ``(page, body, cached)`` per fetched page, where ``cached``
+    is the previously parsed events of an unchanged page. Events are collected
+    on a fresh scraper for the source's region, so concurrently running
+    sources share no state. ``today`` is passed explicitly because worker
+    processes do not see the parent's ``TODAY``. Events come back without
+    coordinates; the parent geocodes them, so the geocoder caches and their
+    counters live in one process.
+
+    ``deadline`` is a ``time.time()`` value checked before each page and
+    before the static table; a source past it stops there and comes back
+    with an error and no events.
+    """
+    def check_deadline():
+        if deadline is not None and time.time() > deadline:
+            raise TimeoutError(f"Source {source.key} passed its deadline")
+
+    start = time.perf_counter()
+    collector = IowaEventsScraper(today=today, region=source.region, geocode=False)
+    result = SourceResult(source.key)
+    try:
+        for page, body, cached in inputs:
+            check_deadline()
+            if cached is None:
+                t = time.perf_counter()
+                events = collector._parse_page(body, page.name, page.url, page.city, page.category,
+                                               source.selectors)
+                result.parse_seconds += time.perf_counter() - t
+                result.parsed[page.url] = [asdict(e) for e in events]
+            else:
+                events = [Event(**e) for e in cached]
+                logger.info(f"{page.name}: unchanged, reusing {len(events)} cached events")
+            kept = [e for e in events if collector._is_future_event(e.date)]
+            collector.dropped_past += len(events) - len(kept)
+            collector.events.extend(kept)
+        check_deadline()
+        getattr(collector, source.parser)()
+    except TimeoutError as e:
+        logger.warning(str(e))
+        result.error = repr(e)
+        collector.events.clear()
+    except Exception as e:
+        logger.exception(f"Source {source.key} failed")
+        result.error = repr(e)
+    result.events = collector.events
+    result.dropped_past = collector.dropped_past
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def run_sources(tasks, workers=8, executor="thread", timeout=None, today: Optional[date] = None
+                ) -> Dict[str, SourceResult]:
+    """Run ``(source, inputs)`` tasks on a thread or process pool.
+
+    Sources still running after ``timeout`` seconds are logged and dropped
+    rather than holding up the rest of the run. Threads and processes cannot
+    be killed, so the timeout is also handed to each worker as a deadline:
+    an abandoned worker stops after the page it is parsing instead of
+    running to the end of its source.
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+    pool = (ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor)(max_workers=workers)
+    deadline = time.time() + timeout if timeout is not None else None
+    futures = {pool.submit(run_source, src, inputs, today, deadline): src.key for src, inputs in tasks}
+    done, pending = wait(futures, timeout=timeout)
+    for fut in pending:
+        logger.warning(f"Source {futures[fut]} still running after {timeout}s, skipping it")
+    pool.shutdown(wait=not pending, cancel_futures=True)
+    results = {}
+    for fut in done:
+        res = fut.result()
+        results[res.key] = res
+    return results
 
 
 class IowaEventsScraper:
     
-    def __init__(self):
+    def __init__(self, today: Optional[date] = None, region: str = DEFAULT_REGION, geocode=True):
+        self.today = today                 # cutoff for past events; None follows the global TODAY
+        self.region = REGIONS[region]
+        self.geocode = geocode             # False leaves coordinates to the caller (see run_source)
         self.events: List[Event] = []
+        self.by_source: Dict[str, List[Event]] = {}   # each source's events before dedup, for incremental refreshes
+        self.dropped_past = 0
+        self.metrics = RunMetrics()
+        self.search: Optional[SearchIndex] = None
     
-    def _get_coords(self, city: str) -> tuple:
-        return IOWA_COORDS.get(city, (None, None))
+    def _get_coords(self, city: str, venue: Optional[str] = None) -> tuple:
+        return default_geocoder(self.region.code).lookup(city, venue)
     
     def _is_future_event(self, date_str: str) -> bool:
+        """True unless the event has already ended; unparseable dates are kept."""
         if not date_str:
             return True
-        months = {
-            'january': 1, 'february': 2, 'march': 3, 'april': 4,
-            'may': 5, 'june': 6, 'july': 7, 'august': 8,
-            'september': 9, 'october': 10, 'november': 11, 'december': 12,
-            'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'jun': 6,
-            'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-        }
-        date_lower = date_str.lower()
-        for month_name, month_num in months.items():
-            if month_name in date_lower:
-                year_match = re.search(r'20(\d{2})', date_str)
-                if year_match:
-                    year = int(f"20{year_match.group(1)}")
-                    day_match = re.search(r'(\d{1,2})', date_str)
-                    day = int(day_match.group(1)) if day_match else 1
-                    try:
-                        event_date = date(year, month_num, min(day, 28))
-                        return event_date >= TODAY
-                    except:
-                        pass
-        return True
+        rng = parse_date_range(date_str)
+        return rng is None or rng.end >= (self.today or TODAY)
+
+    def _make(self, title, dt, tm, city, venue, cat, subcat, src, url, desc=None, age=None, age_group=None) -> Event:
+        lat, lng = self._get_coords(city, venue) if self.geocode else (None, None)
+        return Event(
+            title=title, date=_intern(dt), time=_intern(tm), location=sys.intern(f"{city}, {self.region.code}"),
+            venue=_intern(venue), category=_intern(cat), subcategory=_intern(subcat),
+            source=_intern(src), source_url=_intern(url), city=_intern(city),
+            description=desc, age_group=_intern(age_group or age), latitude=lat, longitude=lng,
+            recurrence=_intern(infer_recurrence(title, dt))
+        )
 
     def _add(self, title, dt, tm, city, venue, cat, subcat, src, url, desc=None, age=None, age_group=None):
         if not self._is_future_event(dt):
+            self.dropped_past += 1
             return
-        lat, lng = self._get_coords(city)
-        self.events.append(Event(
-            title=title, date=dt, time=tm, location=f"{city}, IA",
-            venue=venue, category=cat, subcategory=subcat,
-            source=src, source_url=url, city=city,
-            description=desc, age_group=age_group or age, latitude=lat, longitude=lng
-        ))
+        self.events.append(self._make(title, dt, tm, city, venue, cat, subcat, src, url, desc, age, age_group))
+
+    def _add_static(self, key):
+        for r in static_tables()[key]:
+            self._add(r["title"], r.get("date"), r.get("time"), r.get("city"), r.get("venue"), r["category"],
+                      r.get("subcategory"), r["source"], r["source_url"], r.get("description"),
+                      age_group=r.get("age_group"))
+
+    # ==================== LIVE SOURCES ====================
+    def _parse_page(self, body, src, url, default_city, cat, selectors="microdata") -> List[Event]:
+        events = []
+        for node in page_events(body, selectors):
+            title = node.get("name")
+            dt, tm = _split_iso(node.get("startDate"))
+            end, _ = _split_iso(node.get("endDate"))
+            if not title or not dt:
+                continue
+            if end and end != dt:
+                dt = f"{dt.rsplit(',', 1)[0]} - {end}"
+            loc = node.get("location") or {}
+            loc = loc[0] if isinstance(loc, list) and loc else loc
+            venue = loc.get("name") if isinstance(loc, dict) else None
+            addr = loc.get("address") if isinstance(loc, dict) else None
+            city = addr.get("addressLocality") if isinstance(addr, dict) else None
+            link = node.get("url")
+            events.append(self._make(title, dt, tm, city or default_city, venue, cat, None, src,
+                                     urljoin(url, link) if isinstance(link, str) else url,
+                                     desc=node.get("description")))
+        return events
+
+    @staticmethod
+    def _record_page(record_dir, url, body):
+        parts = urlsplit(url)
+        path = os.path.join(record_dir, parts.netloc, parts.path.strip("/"), "index.html")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(body)
 
     # ==================== TBK BANK SPORTS COMPLEX ====================
+    @register_source("tbk", "TBK Bank Sports Complex", "https://www.tbkbanksportscomplex.com/events/",
+                     "kids_athletics", "Bettendorf")
     def add_tbk_events(self):
         logger.info("Adding TBK Bank Sports Complex events...")
-        src, url = "TBK Bank Sports Complex", "https://www.tbkbanksportscomplex.com/events/"
-        events = [
-            ("New Year's Pickleball Tournament", "January 3, 2026", "8:00 AM", "pickleball", "All ages"),
-            ("1v1 Goalkeeper Tournament", "January 2-4, 2026", "All day", "soccer", "8-18 yrs"),
-            ("Blizzard Bash Indoor Softball", "January 9-11, 2026", "All day", "softball", "All ages"),
-            ("LOVB Challenge Volleyball", "January 10, 2026", "All day", "volleyball", "10U+"),
-            ("MLK Classic Indoor Softball", "January 16-17, 2026", "All day", "softball", "All ages"),
-            ("MLK Classic Weekend 2", "January 18-19, 2026", "All day", "softball", "All ages"),
-            ("Winter Soccer Futsal", "January 23-25, 2026", "All day", "soccer", "9U-19U"),
-            ("Frozen Ropes Frenzy Softball", "January 30 - February 1, 2026", "All day", "softball", "All ages"),
-            ("Winter Warm-Up Softball", "January 30 - February 2, 2026", "All day", "softball", "All ages"),
-            ("President's Day Slugfest", "February 13-16, 2026", "All day", "softball", "All ages"),
-            ("High School Warm-Up Softball", "February 27 - March 1, 2026", "All day", "softball", "High School"),
-            ("LOVB Challenge #8", "February 28, 2026", "All day", "volleyball", "All ages"),
-            ("GameTime Basketball", "May 2-3, 2026", "8:15 AM", "basketball", "Youth"),
-            ("GameTime Basketball", "May 30-31, 2026", "8:15 AM", "basketball", "Youth"),
-            ("GameTime Basketball", "June 13-14, 2026", "8:15 AM", "basketball", "Youth"),
-            ("Summer Basketball Tournament", "June 27-28, 2026", "8:15 AM", "basketball", "All ages"),
-            ("Great River Classic Soccer", "September 24-26, 2026", "8:00 AM", "soccer", "Youth"),
-        ]
-        for t, d, tm, sub, age in events:
-            self._add(t, d, tm, "Bettendorf", "TBK Bank Sports Complex", "kids_athletics", sub, src, url, age_group=age)
+        self._add_static("tbk")
 
     # ==================== XTREAM ARENA (CORALVILLE) ====================
+    @register_source("xtream_arena", "Xtream Arena", "https://xtreamarena.com/", "sports", "Coralville")
     def add_xtream_arena_events(self):
         logger.info("Adding Xtream Arena events...")
-        src, url = "Xtream Arena", "https://xtreamarena.com/"
-        events = [
-            ("Iowa Heartlanders vs Toledo", "January 16, 2026", "7:00 PM", "hockey"),
-            ("Iowa Heartlanders Y2K Night", "January 30, 2026", "7:00 PM", "hockey"),
-            ("Iowa Heartlanders EmpowerHER Night", "January 31, 2026", "6:00 PM", "hockey"),
-            ("Iowa Heartlanders Video Game Night", "February 1, 2026", "3:00 PM", "hockey"),
-            ("Iowa Heartlanders vs Kalamazoo", "February 11, 2026", "7:00 PM", "hockey"),
-            ("Iowa Heartlanders Hockey For All Night", "February 13, 2026", "7:00 PM", "hockey"),
-            ("Iowa Heartlanders ARTlanders Night", "February 14, 2026", "6:00 PM", "hockey"),
-            ("Iowa Heartlanders vs Wichita", "February 18, 2026", "7:00 PM", "hockey"),
-            ("Iowa Heartlanders Margaritaville Night", "February 20, 2026", "7:00 PM", "hockey"),
-            ("Iowa Heartlanders Cornfed Night", "February 21, 2026", "6:00 PM", "hockey"),
-            ("NCAA Women's Wrestling Championships", "March 6, 2026", "10:00 AM", "wrestling"),
-            ("MVC Women's Basketball Championship", "March 12-15, 2026", "All day", "basketball"),
-            ("Battle By The River Rodeo", "2026", "Evening", "rodeo"),
-        ]
-        for t, d, tm, sub in events:
-            self._add(t, d, tm, "Coralville", "Xtream Arena", "sports", sub, src, url)
+        self._add_static("xtream_arena")
 
     # ==================== WELLS FARGO ARENA / CASEY'S CENTER ====================
+    @register_source("wells_fargo", "Iowa Events Center", "https://www.iowaeventscenter.com/events/",
+                     "sports", "Des Moines")
     def add_wells_fargo_events(self):
         logger.info("Adding Wells Fargo Arena / Casey's Center events...")
-        src, url = "Iowa Events Center", "https://www.iowaeventscenter.com/events/"
-        events = [
-            ("Iowa Wild vs Toronto Marlies", "January 16, 2026", "7:00 PM", "hockey"),
-            ("Iowa Wild vs Toronto Marlies", "January 17, 2026", "6:00 PM", "hockey"),
-            ("Iowa Wolves vs Long Island Nets", "January 18, 2026", "7:00 PM", "basketball"),
-            ("Iowa Wolves vs Long Island Nets", "January 19, 2026", "4:00 PM", "basketball"),
-            ("IHSAA State Wrestling Tournament", "February 19-21, 2026", "All day", "wrestling"),
-            ("IGHSAU State Basketball Tournament", "March 2-7, 2026", "All day", "basketball"),
-            ("IHSAA State Basketball Tournament", "March 9-14, 2026", "All day", "basketball"),
-            ("Iowa Barnstormers Arena Football", "Spring 2026", "7:00 PM", "football"),
-            ("Monster Jam", "April 11-12, 2026", "1:00 PM & 7:00 PM", "entertainment"),
-        ]
-        for t, d, tm, sub in events:
-            self._add(t, d, tm, "Des Moines", "Wells Fargo Arena", "sports", sub, src, url)
+        self._add_static("wells_fargo")
 
     # ==================== ADVENTURELAND ====================
+    @register_source("adventureland", "Adventureland", "https://www.adventurelandresort.com/",
+                     "family", "Altoona")
     def add_adventureland_events(self):
         logger.info("Adding Adventureland events...")
-        src, url = "Adventureland", "https://www.adventurelandresort.com/"
-        events = [
-            ("Adventureland Season Opens", "May 16, 2026", "10:00 AM", "opening"),
-            ("Paul Bunyan Lumberjack Show", "June 1-14, 2026", "All day", "show"),
-            ("Canine Stars Stunt Dog Show", "June 17-30, 2026", "All day", "show"),
-            ("Father's Day Belly Flop Contest", "June 20, 2026", "All day", "contest"),
-            ("America's 250th Birthday Fireworks", "July 4, 2026", "9:00 PM", "fireworks"),
-            ("Daniel Tiger Meet & Greets", "July 2026 (Sundays/Mondays)", "All day", "kids"),
-            ("Neon Nights at Adventure Bay", "July 10 - August 15, 2026", "Evening", "waterpark"),
-            ("Oktoberfest", "September 2026", "All day", "festival"),
-            ("Phantom Fall Fest", "September 26 - October 31, 2026", "All day", "halloween"),
-        ]
-        for t, d, tm, sub in events:
-            self._add(t, d, tm, "Altoona", "Adventureland", "family", sub, src, url, age_group="All ages")
+        self._add_static("adventureland")
 
     # ==================== MAJOR RACES ====================
+    @register_source("races", "Dam to DSM", "https://www.damtodsm.com/", "running", "Des Moines",
+                     extra_pages=[("Bix 7", "https://bix7.com/", "Davenport", "running")])
     def add_races(self):
         logger.info("Adding major races...")
-        races = [
-            ("EMC Dam to DSM Half Marathon", "May 30, 2026", "7:00 AM", "Des Moines", "Saylorville Dam to Downtown", "Dam to DSM", "https://www.damtodsm.com/"),
-            ("Quad-City Times Bix 7", "July 25, 2026", "8:00 AM", "Davenport", "Downtown Davenport", "Bix 7", "https://bix7.com/"),
-            ("Jr Bix", "July 24, 2026", "6:00 PM", "Davenport", "Downtown Davenport", "Bix 7", "https://bix7.com/"),
-            ("Quick Bix 2-Mile", "July 25, 2026", "8:00 AM", "Davenport", "Downtown Davenport", "Bix 7", "https://bix7.com/"),
-            ("Sr Bix", "July 21, 2026", "Evening", "Davenport", "Downtown", "Bix 7", "https://bix7.com/"),
-            ("Brady Street Sprints", "July 23, 2026", "7:00 PM", "Davenport", "Brady Street", "Bix 7", "https://bix7.com/"),
-            ("Living History Farms Race", "November 2026", "All day", "Urbandale", "Living History Farms", "LHF Race", "https://www.lhf.org/"),
-            ("Des Moines Turkey Trot", "November 26, 2026", "8:00 AM", "Des Moines", "Downtown", "RipRoar Events", "https://www.damtodsm.com/"),
-            ("Des Moines Women's Half Marathon", "2026", "Morning", "Des Moines", "Downtown", "RipRoar Events", "https://www.damtodsm.com/"),
-        ]
-        for t, d, tm, city, venue, src, url in races:
-            self._add(t, d, tm, city, venue, "running", "race", src, url)
+        self._add_static("races")
 
     # ==================== COUNTY FAIRS ====================
+    @register_source("county_fairs", "Iowa Fairs Association", "https://iowafairs.com/", "fair")
     def add_county_fairs(self):
         logger.info("Adding county fairs...")
-        src, url = "Iowa Fairs Association", "https://iowafairs.com/"
-        fairs = [
-            ("Wapello County Regional Fair", "June 17-21, 2026", "Eldon"),
-            ("Linn County Fair", "June 24-29, 2026", "Central City"),
-            ("Winneshiek County Fair", "July 8-12, 2026", "Decorah"),
-            ("Ringgold County Fair", "July 7-12, 2026", "Mount Ayr"),
-            ("Shelby County Fair", "July 8-12, 2026", "Harlan"),
-            ("Lee County Fair", "July 9-14, 2026", "Donnellson"),
-            ("Sioux County Youth Fair", "July 10-17, 2026", "Sioux Center"),
-            ("Marion County Fair", "July 11-17, 2026", "Knoxville"),
-            ("Polk County 4-H & FFA Fair", "July 12-18, 2026", "Des Moines"),
-            ("Tama County Fair", "July 13-19, 2026", "Gladbrook"),
-            ("Poweshiek County Fair", "July 14-19, 2026", "Grinnell"),
-            ("Southern Iowa Fair (Mahaska)", "July 14-19, 2026", "Oskaloosa"),
-            ("Story County 4-H Fair", "July 15-19, 2026", "Nevada"),
-            ("Taylor County Fair", "July 15-19, 2026", "Bedford"),
-            ("Van Buren County Fair", "July 15-20, 2026", "Keosauqua"),
-            ("Pottawattamie County Fair", "July 15-20, 2026", "Avoca"),
-            ("Madison County Fair", "July 16-20, 2026", "Winterset"),
-            ("Muscatine County Fair", "July 16-20, 2026", "West Liberty"),
-            ("Palo Alto County Fair", "July 16-20, 2026", "Emmetsburg"),
-            ("Pocahontas County Fair", "July 16-21, 2026", "Pocahontas"),
-            ("Lyon County Fair", "July 19-24, 2026", "Rock Rapids"),
-            ("O'Brien County Fair", "July 19-24, 2026", "Primghar"),
-            ("Lucas County Fair", "July 19-23, 2026", "Chariton"),
-            ("Page County Fair", "July 21-27, 2026", "Clarinda"),
-            ("Great Jones County Fair", "July 22-26, 2026", "Monticello"),
-            ("Louisa County Fair", "July 22-29, 2026", "Columbus Junction"),
-            ("Westfair (Pottawattamie)", "July 22-27, 2026", "Council Bluffs"),
-            ("Plymouth County Fair", "July 23-27, 2026", "Le Mars"),
-            ("Union County Fair", "July 23-29, 2026", "Afton"),
-            ("Kossuth County Fair", "July 27 - August 2, 2026", "Algona"),
-            ("Sac County Fair", "July 28 - August 1, 2026", "Sac City"),
-            ("Mississippi Valley Fair (Scott)", "August 4-9, 2026", "Davenport"),
-            ("Iowa State Fair", "August 13-23, 2026", "Des Moines"),
-            ("Clay County Fair", "September 12-20, 2026", "Spencer"),
-        ]
-        for name, dt, city in fairs:
-            self._add(name, dt, "All day", city, f"{city} Fairgrounds", "fair", "county_fair", src, url, age_group="All ages")
+        self._add_static("county_fairs")
 
     # ==================== CEDAR RAPIDS ====================
+    @register_source("cedar_rapids", "Cedar Rapids Economic Alliance", "https://www.cedarrapids.org/events-calendar/",
+                     "community", "Cedar Rapids", extra_pages=[
+                         ("CR Events Live", "https://www.creventslive.com/", "Cedar Rapids", "entertainment"),
+                         ("Hawkeye Downs", "https://www.hawkeyedowns.org/", "Cedar Rapids", "community"),
+                     ])
     def add_cedar_rapids_events(self):
         logger.info("Adding Cedar Rapids events...")
-        src, url = "Cedar Rapids Economic Alliance", "https://www.cedarrapids.org/events-calendar/"
-        events = [
-            ("Economic Alliance Annual Meeting", "January 29, 2026", "11:30 AM - 1:00 PM"),
-            ("Capitol Conversations", "January 30, 2026", "7:30 AM - 9:00 AM"),
-            ("Impact CR: Orchestra Iowa Happy Hour", "February 4, 2026", "5:00 PM - 7:00 PM"),
-            ("Collective Voice Day at the Capitol", "February 11, 2026", "1:00 PM - 7:00 PM"),
-            ("February BizMix", "February 19, 2026", "4:00 PM - 6:00 PM"),
-            ("Cedar Rapids Restaurant Week", "February 20 - March 1, 2026", "All day"),
-            ("Hiawatha Business Summit", "February 24, 2026", "8:00 AM - 9:00 AM"),
-            ("March BizMix at CR Kernels", "March 19, 2026", "4:00 PM - 6:00 PM"),
-            ("Celebration of Agriculture", "March 26, 2026", "5:30 PM - 9:00 PM"),
-            ("Cedar Rapids Freedom Festival", "July 2026", "All day"),
-        ]
-        for t, d, tm in events:
-            self._add(t, d, tm, "Cedar Rapids", None, "community", "chamber", src, url)
-        
-        # Concerts & entertainment
-        concerts = [
-            ("Fitz and The Tantrums", "January 29, 2026", "8:00 PM", "Riverside Casino"),
-            ("Dane Cook Comedy", "February 13, 2026", "8:00 PM", "Riverside Casino"),
-            ("Warrant ft. Firehouse", "February 14, 2026", "8:00 PM", "Riverside Casino"),
-            ("Carly Pearce", "March 7, 2026", "8:00 PM", "Riverside Casino"),
-            ("Tracy Lawrence", "March 26, 2026", "8:00 PM", "Riverside Casino"),
-            ("Skillet", "March 27, 2026", "8:00 PM", "Riverside Casino"),
-            ("Sevendust", "April 17, 2026", "7:00 PM", "Riverside Casino"),
-            ("Jeff Foxworthy", "June 13, 2026", "8:00 PM", "Riverside Casino"),
-            ("Kenny Wayne Shepherd Band", "November 20, 2026", "8:00 PM", "Riverside Casino"),
-        ]
-        for t, d, tm, v in concerts:
-            self._add(t, d, tm, "Cedar Rapids", v, "entertainment", "concert", "CR Events Live", "https://www.creventslive.com/")
-        
-        # Hawkeye Downs
-        hd_events = [
-            ("Made for Her Women's Market", "March 14, 2026", "10:00 AM - 4:00 PM"),
-            ("AACA Auto Parts Swap Meet", "March 2026", "All day"),
-            ("Gun Show", "May 29-31, 2026", "9:00 AM - 5:00 PM"),
-            ("Midwest Shredfest Drift Event", "May 30-31, 2026", "12:00 PM"),
-        ]
-        for t, d, tm in hd_events:
-            self._add(t, d, tm, "Cedar Rapids", "Hawkeye Downs", "community", "expo", "Hawkeye Downs", "https://www.hawkeyedowns.org/")
+        self._add_static("cedar_rapids")
 
     # ==================== SIOUX CITY ====================
+    @register_source("sioux_city", "Explore Siouxland", "https://exploresiouxland.com/events/",
+                     "community", "Sioux City")
     def add_sioux_city_events(self):
         logger.info("Adding Sioux City events...")
-        events = [
-            ("Charlie Berens Comedy", "January 23, 2026", "7:00 PM", "Orpheum Theatre", "comedy"),
-            ("Sioux City Musketeers Hockey", "January 23, 2026", "7:05 PM", "Tyson Events Center", "hockey"),
-            ("Cardboard Sled Races", "February 1, 2026", "12:00 PM", "Cone Park", "family"),
-            ("Sioux City Symphony", "February 7, 2026", "7:00 PM", "Orpheum Theatre", "music"),
-            ("The Offspring with Bad Religion", "February 7, 2026", "7:00 PM", "Tyson Events Center", "concert"),
-            ("Monster Jam", "February 20-21, 2026", "7:00 PM", "Tyson Events Center", "entertainment"),
-            ("Pride Appreciation", "June 4, 2026", "7:00 PM", "Downtown", "community"),
-            ("Saturday in the Park", "July 2026", "All day", "Grandview Park", "festival"),
-            ("ArtSplash", "September 2026", "All day", "Downtown", "arts"),
-        ]
-        for t, d, tm, v, sub in events:
-            self._add(t, d, tm, "Sioux City", v, "community", sub, "Explore Siouxland", "https://exploresiouxland.com/events/")
+        self._add_static("sioux_city")
 
     # ==================== DUBUQUE ====================
+    @register_source("dubuque", "Dubuque Chamber", "https://www.dubuquechamber.com", "community", "Dubuque")
     def add_dubuque_events(self):
         logger.info("Adding Dubuque events...")
-        src, url = "Dubuque Chamber", "https://www.dubuquechamber.com"
-        events = [
-            ("Winter Bounce at Five Flags", "January 23-25, 2026", "All day", "Five Flags Center", "family"),
-            ("Beer with a Boss", "January 29, 2026", "Evening", "Various", "networking"),
-            ("YP Next Up - Leadership", "February 19, 2026", "6:30 PM", "University of Dubuque", "professional"),
-            ("Five Flags Movie Series", "Winter 2026", "Evening", "Five Flags Theater", "entertainment"),
-            ("Packers Tailgate Tour - Field of Dreams", "April 16, 2026", "All day", "Field of Dreams", "sports"),
-        ]
-        for t, d, tm, v, sub in events:
-            self._add(t, d, tm, "Dubuque", v, "community", sub, src, url)
+        self._add_static("dubuque")
 
     # ==================== DES MOINES METRO ====================
+    @register_source("des_moines", "Catch Des Moines", "https://www.catchdesmoines.com/events/",
+                     "community", "Des Moines", extra_pages=[
+                         ("WDM Chamber", "https://wdmchamber.org/", "West Des Moines", "community"),
+                         ("Urbandale Chamber", "https://uniquelyurbandale.com/", "Urbandale", "community"),
+                     ])
     def add_des_moines_events(self):
         logger.info("Adding Des Moines metro events...")
-        
-        # Catch Des Moines
-        dsm = [
-            ("Drake Relays", "April 23-26, 2026", "All day", "Drake Stadium", "track"),
-            ("Des Moines Arts Festival", "June 26-28, 2026", "All day", "Western Gateway Park", "arts"),
-            ("Principal Charity Classic (PGA)", "June 2026", "All day", "Wakonda Club", "golf"),
-            ("World Food & Music Festival", "September 2026", "All day", "Western Gateway Park", "festival"),
-            ("Holidazzle", "November-December 2026", "Evening", "Downtown", "holiday"),
-        ]
-        for t, d, tm, v, sub in dsm:
-            self._add(t, d, tm, "Des Moines", v, "community", sub, "Catch Des Moines", "https://www.catchdesmoines.com/events/")
-        
-        # West Des Moines Chamber
-        wdm = [
-            ("Rush Hour: Aura Restaurant", "January 2026", "5:00 PM - 7:00 PM", "Aura Restaurant"),
-            ("WDM Annual Dinner - Mission: Possible", "February 26, 2026", "6:00 PM", "Val Air Ballroom"),
-            ("Breakfast B4 Business (monthly)", "2026", "7:30 AM", "Various"),
-            ("Tri-Chamber Golf Outing", "August 24, 2026", "All day", "Beaver Creek Golf Course"),
-            ("Best of the West Awards", "December 1, 2026", "5:00 PM - 7:00 PM", None),
-        ]
-        for t, d, tm, v in wdm:
-            self._add(t, d, tm, "West Des Moines", v, "community", "chamber", "WDM Chamber", "https://wdmchamber.org/")
-        
-        # Urbandale
-        urb = [
-            ("Membership Luncheon", "January 2026", "12:00 PM", None),
-            ("Talk with Officials", "January 31, 2026", "Morning", None),
-            ("genYP Events", "2026 Monthly", "Various", None),
-        ]
-        for t, d, tm, v in urb:
-            self._add(t, d, tm, "Urbandale", v, "community", "chamber", "Urbandale Chamber", "https://uniquelyurbandale.com/")
+        self._add_static("des_moines")
 
     # ==================== ANKENY ====================
+    @register_source("ankeny", "Ankeny Chamber", "https://www.ankeny.org/", "community", "Ankeny")
     def add_ankeny_events(self):
         logger.info("Adding Ankeny events...")
-        src, url = "Ankeny Chamber", "https://www.ankeny.org/"
-        events = [
-            ("AYP St. Patrick's Day Party", "March 12, 2026", "5:30 PM - 7:30 PM", "Ankeny Chamber", "networking"),
-            ("Ankeny Chamber SummerFest", "July 10-12, 2026", "All day", "The District at Prairie Trail", "festival"),
-            ("SummerFest Carnival", "July 9, 2026", "4:00 PM - 9:00 PM", "The District", "carnival"),
-            ("SummerFest Grand Parade", "July 11, 2026", "10:00 AM", "Ankeny", "parade"),
-            ("SummerFest Fireworks", "July 11, 2026", "10:00 PM", "Prairie Trail", "fireworks"),
-            ("Witches Night Out", "October 2026", "Evening", "Various", "festival"),
-        ]
-        for t, d, tm, v, sub in events:
-            self._add(t, d, tm, "Ankeny", v, "community", sub, src, url)
+        self._add_static("ankeny")
 
     # ==================== STATEWIDE FESTIVALS ====================
+    @register_source("festivals", "Travel Iowa", "https://www.traveliowa.com/events/", "community")
     def add_festivals(self):
         logger.info("Adding statewide festivals...")
-        festivals = [
-            ("Clear Lake Kite Festival", "February 2026", "All day", "Clear Lake", "festival"),
-            ("Tulip Time Festival", "May 2026", "All day", "Pella", "festival"),
-            ("Tivoli Fest", "May 2026", "All day", "Elk Horn", "festival"),
-            ("Sioux Center Summer Celebration", "June 4-6, 2026", "All day", "Sioux Center", "festival"),
-            ("Iowa City Jazz Festival", "July 3-5, 2026", "All day", "Iowa City", "music"),
-            ("AJ's Independence Day (Clear Lake)", "July 4, 2026", "All day", "Clear Lake", "festival"),
-            ("Hinterland Music Festival", "July 30 - August 2, 2026", "All day", "St. Charles", "music"),
-            ("Iowa Irish Fest", "July 31 - August 2, 2026", "All day", "Waterloo", "festival"),
-            ("National Balloon Classic", "August 2026", "All day", "Indianola", "festival"),
-            ("Bix Beiderbecke Jazz Festival", "August 2026", "All day", "Davenport", "music"),
-            ("RAGBRAI", "July 2026", "All week", "Across Iowa", "cycling"),
-            ("Iowa Games Summer", "July 2026", "All day", "Ames", "multi-sport"),
-            ("Iowa Games Winter", "February 2026", "All day", "Various", "multi-sport"),
-        ]
-        for t, d, tm, city, sub in festivals:
-            self._add(t, d, tm, city, None, "community", sub, "Travel Iowa", "https://www.traveliowa.com/events/")
+        self._add_static("festivals")
 
     # ==================== IOWA HAWKEYES ====================
+    @register_source("hawkeyes", "Iowa Hawkeyes", "https://hawkeyesports.com/", "college_sports", "Iowa City")
     def add_hawkeyes(self):
         logger.info("Adding Hawkeyes events...")
-        games = [
-            ("Iowa Football vs Northern Illinois", "September 5, 2026", "TBD"),
-            ("Iowa Football vs Iowa State", "September 12, 2026", "TBD"),
-            ("Iowa Football vs UNI", "September 19, 2026", "TBD"),
-        ]
-        for t, d, tm in games:
-            self._add(t, d, tm, "Iowa City", "Kinnick Stadium", "college_sports", "football", "Iowa Hawkeyes", "https://hawkeyesports.com/")
+        self._add_static("hawkeyes")
 
     # ==================== HIGH SCHOOL STATE TOURNAMENTS ====================
+    @register_source("high_school", "IHSAA/IGHSAU", "https://www.iahsaa.org", "high_school_sports", "Des Moines")
     def add_high_school(self):
         logger.info("Adding high school state tournaments...")
-        events = [
-            ("IHSAA State Wrestling", "February 2026", "All day", "Des Moines", "Wells Fargo Arena", "wrestling", "Boys"),
-            ("IGHSAU State Basketball", "March 2026", "All day", "Des Moines", "Wells Fargo Arena", "basketball", "Girls"),
-            ("IHSAA State Basketball", "March 2026", "All day", "Des Moines", "Wells Fargo Arena", "basketball", "Boys"),
-            ("IHSAA/IGHSAU State Track", "May 2026", "All day", "Des Moines", "Drake Stadium", "track", "All"),
-            ("IHSAA State Baseball", "July 2026", "All day", "Des Moines", "Principal Park", "baseball", "Boys"),
-            ("IGHSAU State Softball", "July 2026", "All day", "Fort Dodge", "Harlan Rogers Park", "softball", "Girls"),
-            ("IGHSAU State Volleyball", "November 2026", "All day", "Cedar Rapids", "Xtream Arena", "volleyball", "Girls"),
-            ("IHSAA State Football", "November 2026", "All day", "Cedar Falls", "UNI-Dome", "football", "Boys"),
-        ]
-        for t, d, tm, city, v, sub, age in events:
-            self._add(t, d, tm, city, v, "high_school_sports", sub, "IHSAA/IGHSAU", "https://www.iahsaa.org", age_group=f"High School {age}")
+        self._add_static("high_school")
 
     # ==================== FAMILY ATTRACTIONS ====================
+    @register_source("family_attractions", "Blank Park Zoo", "https://www.blankparkzoo.com/",
+                     "family", "Des Moines", extra_pages=[
+                         ("Science Center of Iowa", "https://www.sciowa.org/", "Des Moines", "family"),
+                         ("Living History Farms", "https://www.lhf.org/", "Urbandale", "family"),
+                     ])
     def add_family_attractions(self):
         logger.info("Adding family attraction events...")
-        # Blank Park Zoo
-        zoo = [
-            ("Zoo Brew", "Summer 2026", "Evening", "adults"),
-            ("Boo at the Zoo", "October 2026", "All day", "family"),
-            ("Wild Lights", "November-December 2026", "Evening", "holiday"),
-        ]
-        for t, d, tm, sub in zoo:
-            self._add(t, d, tm, "Des Moines", "Blank Park Zoo", "family", sub, "Blank Park Zoo", "https://www.blankparkzoo.com/")
-        
-        # Science Center of Iowa
-        sci = [
-            ("Science Center Exhibits", "2026", "All day", "exhibit"),
-            ("Summer Science Camps", "June-August 2026", "All day", "camp"),
-        ]
-        for t, d, tm, sub in sci:
-            self._add(t, d, tm, "Des Moines", "Science Center of Iowa", "family", sub, "Science Center of Iowa", "https://www.sciowa.org/")
-        
-        # Living History Farms
-        lhf = [
-            ("Opening Day", "May 2026", "9:00 AM", "opening"),
-            ("Independence Day Celebration", "July 4, 2026", "All day", "holiday"),
-            ("Fall Harvest Festival", "October 2026", "All day", "festival"),
-            ("Legends & Lanterns Halloween", "October 2026", "Evening", "halloween"),
-        ]
-        for t, d, tm, sub in lhf:
-            self._add(t, d, tm, "Urbandale", "Living History Farms", "family", sub, "Living History Farms", "https://www.lhf.org/")
+        self._add_static("family_attractions")
 
     # ==================== MAIN ====================
-    def scrape_all(self) -> List[Event]:
+    def scrape_all(self, fetcher: Optional[Fetcher] = None, record_dir=None, sources: Optional[List[Source]] = None,
+                   workers=8, executor="thread", timeout=None, search=True) -> List[Event]:
         logger.info("Starting Iowa Events Scraper v5 - COMPREHENSIVE...")
-        logger.info(f"Today: {TODAY}")
+        logger.info(f"Today: {self.today or TODAY}")
         
-        self.add_tbk_events()
-        self.add_xtream_arena_events()
-        self.add_wells_fargo_events()
-        self.add_adventureland_events()
-        self.add_races()
-        self.add_county_fairs()
-        self.add_cedar_rapids_events()
-        self.add_sioux_city_events()
-        self.add_dubuque_events()
-        self.add_des_moines_events()
-        self.add_ankeny_events()
-        self.add_festivals()
-        self.add_hawkeyes()
-        self.add_high_school()
-        self.add_family_attractions()
+        sources = select_sources() if sources is None else sources
+        metrics = self.metrics
+        pages: Dict[str, FetchResult] = {}
+        cache = fetcher.cache if fetcher else None
+        if fetcher:
+            targets = [(src.key, p.url) for src in sources for p in src.pages]
+            if cache:
+                for src in sources:
+                    for p in src.pages:
+                        cache.require_parser(p.url, parser_key(src.selectors))
+            logger.info(f"Fetching {len(targets)} live pages...")
+            with metrics.stage("fetch"):
+                pages = fetcher.fetch_all(targets)
         
-        self.events = self._deduplicate(self.events)
+        tasks, fresh = [], {}
+        for src in sources:
+            inputs = []
+            for page in src.pages if fetcher else ():
+                res = pages.get(page.url)
+                if res:
+                    metrics.add(src.key, "fetch_seconds", res.elapsed)
+                    metrics.add(src.key, "fetch_bytes", len(res.body or b""))
+                    metrics.add(src.key, "fetch_retries", res.attempts - 1)
+                if not res or not (res.ok or (res.status == 304 and cache)):
+                    metrics.add(src.key, "fetch_errors")
+                    continue
+                cached, digest = cache.lookup(res, parser_key(src.selectors)) if cache else (None, None)
+                metrics.add(src.key, "cache_misses" if cached is None else "cache_hits")
+                if cached is None:
+                    if res.body is None:
+                        continue
+                    if record_dir:
+                        self._record_page(record_dir, page.url, res.body)
+                    fresh[page.url] = (res, digest, parser_key(src.selectors))
+                inputs.append((page, res.body if cached is None else None, cached))
+            tasks.append((src, inputs))
+        
+        with metrics.stage("sources"):
+            results = run_sources(tasks, workers, executor, timeout, self.today)
+        for src in sources:
+            res = results.get(src.key)
+            if res is None or res.error:
+                metrics.add(src.key, "failed")
+            if res is None:
+                continue
+            self.events.extend(res.events)
+            if not res.error:
+                self.by_source[src.key] = res.events
+            self.dropped_past += res.dropped_past
+            metrics.add(src.key, "run_seconds", res.elapsed)
+            metrics.add(src.key, "parse_seconds", res.parse_seconds)
+            metrics.add(src.key, "events_emitted", len(res.events))
+            metrics.add(src.key, "dropped_past", res.dropped_past)
+            logger.info(f"{src.key}: {len(res.events)} events in {res.elapsed * 1000:.1f} ms")
+            for url, parsed in res.parsed.items():
+                if cache and url in fresh:
+                    cache.store(*fresh[url], parsed)
+        if cache:
+            logger.info(f"Fetch cache: {cache.hits} unchanged, {cache.misses} re-parsed")
+            metrics.counters["fetch_cache_hits"] = cache.hits
+            metrics.counters["fetch_cache_misses"] = cache.misses
+            cache.save()
+        with metrics.stage("geocode"):
+            for src in sources:
+                if src.key in results:
+                    default_geocoder(src.region).locate(results[src.key].events)
+        geocoders = [default_geocoder(code) for code in sorted({src.region for src in sources} | {self.region.code})]
+        metrics.counters["geocode_cache_hits"] = sum(g.hits for g in geocoders)
+        metrics.counters["geocode_cache_misses"] = sum(g.misses for g in geocoders)
+        for geocoder in geocoders:
+            geocoder.save()
+        
+        with metrics.stage("dedup"):
+            before = len(self.events)
+            self.events = self._deduplicate(self.events)
+        metrics.counters["events_dropped_past"] = self.dropped_past
+        metrics.counters["events_dropped_duplicate"] = before - len(self.events)
+        metrics.counters["events_total"] = len(self.events)
+        assign_ids(self.events)
+        if search:
+            with metrics.stage("search_index"):
+                self.search = SearchIndex.from_events(self.events)
         logger.info(f"Total events: {len(self.events)}")
         return self.events
     
     def _deduplicate(self, events):
-        seen = set()
-        unique = []
-        for e in events:
-            key = f"{e.title.lower()[:50]}|{e.date}|{e.city}"
-            if key not in seen:
-                seen.add(key)
-                unique.append(e)
+        unique = deduplicate(events)
+        if len(unique) < len(events):
+            logger.info(f"Merged {len(events) - len(unique)} duplicate events")
         return unique
     
-    def save_to_json(self, filename="iowa_events.json"):
-        data = {"scraped_at": datetime.now().isoformat(), "total_events": len(self.events), "events": [asdict(e) for e in self.events]}
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+    def save_to_json(self, filename="iowa_events.json", events: Optional[Iterable[Event]] = None, indent=True):
+        with atomic_open(filename) as f:
+            write_json(f, self.events if events is None else events, datetime.now().isoformat(), indent)
+        logger.info(f"Saved to {filename}")
+    
+    def save_to_jsonl(self, filename="iowa_events.jsonl", events: Optional[Iterable[Event]] = None):
+        with atomic_open(filename) as f:
+            write_jsonl(f, self.events if events is None else events)
+        logger.info(f"Saved to {filename}")
+    
+    def save_to_csv(self, filename="iowa_events.csv", events: Optional[Iterable[Event]] = None):
+        with atomic_open(filename, newline='') as f:
+            write_csv(f, self.events if events is None else events)
+        logger.info(f"Saved to {filename}")
+    
+    def export(self, filenames: Iterable[str], events: Optional[Iterable[Event]] = None, indent=True) -> int:
+        """Write JSON/JSONL/CSV files (``.gz`` too) in parallel from one serialization pass."""
+        filenames = list(filenames)
+        n = export(filenames, self.events if events is None else events, datetime.now().isoformat(), indent)
+        logger.info(f"Saved to {', '.join(filenames)}")
+        return n
+    
+    def save_to_parquet(self, filename="iowa_events.parquet", events: Optional[Iterable[Event]] = None):
+        with atomic_open(filename, binary=True) as f:
+            write_parquet(f, self.events if events is None else events)
         logger.info(f"Saved to {filename}")
     
-    def save_to_csv(self, filename="iowa_events.csv"):
-        fields = ['title','date','time','location','venue','category','subcategory','source','source_url','description','city','teams','age_group','registration_url','latitude','longitude']
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            w = csv.DictWriter(f, fieldnames=fields)
-            w.writeheader()
-            for e in self.events:
-                w.writerow(asdict(e))
+    def save_to_sqlite(self, filename="iowa_events.db", events: Optional[Iterable[Event]] = None):
+        import sqlite3
+        conn = sqlite3.connect(filename)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")   # dashboards can keep reading during the upsert
+            counts = write_sqlite(conn, self.events if events is None else events, datetime.now().isoformat())
+        finally:
+            conn.close()
+        logger.info(f"Saved to {filename} (+{counts['added']} ~{counts['updated']} -{counts['removed']})")
+    
+    def save_search_index(self, filename="iowa_events.search"):
+        """Persist the index ``scrape_all`` built; positions match ``save_to_json``'s event order."""
+        (self.search or SearchIndex.from_events(self.events)).save(filename)
         logger.info(f"Saved to {filename}")
+    
+    def save_changes(self, filename="iowa_events_changes.json", previous="iowa_events.json",
+                     tracker: Optional[ChangeTracker] = None):
+        """Write the added/updated/removed changeset against the ``previous`` snapshot.
 
+        Call before ``save_to_json`` overwrites that snapshot, or pass the
+        ``tracker`` the exported events already streamed through.
+        """
+        if tracker is None:
+            tracker = ChangeTracker.from_snapshot(previous)
+            for _ in tracker.watch(self.events):
+                pass
+        changes = tracker.changes()
+        for kind, items in changes.items():
+            self.metrics.counters[f"changes_{kind}"] = len(items)
+        with atomic_open(filename) as f:
+            json.dump({"scraped_at": datetime.now().isoformat(), "previous_scraped_at": tracker.previous_at,
+                       **changes}, f, indent=2)
+        logger.info(f"Saved to {filename} (+{len(changes['added'])} ~{len(changes['updated'])} "
+                    f"-{len(changes['removed'])})")
 
-def main():
-    scraper = IowaEventsScraper()
-    events = scraper.scrape_all()
-    scraper.save_to_json()
-    scraper.save_to_csv()
-    
+
+# ==================== SERVICE ====================
+class Snapshot:
+    """One immutable refresh result, shared read-only by every request thread.
+
+    Indexes, the full compact JSON body and its ETag are built up front;
+    filtered responses are built on first request and memoized until the
+    snapshot is replaced.
+    """
+
+    MAX_RESPONSES = 512
+
+    def __init__(self, events: List[Event], scraped_at: Optional[str], metrics: Optional[RunMetrics] = None):
+        self.events = events
+        self.scraped_at = scraped_at
+        self.metrics = metrics
+        self.index = EventIndex(events)
+        self.geo = GeoIndex(events)
+        self.search = SearchIndex.from_events(events)
+        buf = io.StringIO()
+        write_json(buf, events, scraped_at or "", indent=False)
+        self.body = buf.getvalue().encode("utf-8")
+        # Hash past the leading "scraped_at" member, so a refresh that finds
+        # nothing new keeps the ETag and clients keep getting 304s.
+        self.etag = hashlib.blake2b(self.body.split(b",", 1)[-1], digest_size=8).hexdigest()
+        self._responses: Dict[tuple, bytes] = {}
+        self._lock = threading.Lock()
+
+    def cached(self, key, build) -> bytes:
+        body = self._responses.get(key)
+        if body is None:
+            body = build()
+            with self._lock:
+                if len(self._responses) >= self.MAX_RESPONSES:
+                    self._responses.pop(next(iter(self._responses)))
+                self._responses[key] = body
+        return body
+
+
+class EventService:
+    """Keeps the deduplicated event set in memory and refreshes it in the background.
+
+    Each source is re-run when its interval (``intervals[key]`` or
+    ``interval`` seconds) has passed. The other sources' events are carried
+    over, the union is re-deduplicated, and the new ``Snapshot`` replaces
+    ``self.snapshot`` in a single assignment. Readers always see a complete
+    snapshot and never wait on a refresh. ``today`` is called on every
+    refresh for the past-event cutoff, so a long-running service moves with
+    the calendar.
+    """
+
+    def __init__(self, fetcher: Optional[Fetcher] = None, sources: Optional[List[Source]] = None,
+                 interval=3600.0, intervals: Optional[Dict[str, float]] = None, workers=8, executor="thread",
+                 timeout=None, today: Callable[[], date] = date.today):
+        self.fetcher = fetcher
+        self.today = today
+        self.sources = select_sources() if sources is None else sources
+        self.interval = interval
+        self.intervals = intervals or {}
+        self.workers, self.executor, self.timeout = workers, executor, timeout
+        self.by_source: Dict[str, List[Event]] = {}
+        self.refreshed: Dict[str, float] = {}
+        self.snapshot = Snapshot([], None)
+        self._stop = threading.Event()
+
+    def _next_due(self, src: Source) -> float:
+        return self.refreshed.get(src.key, float("-inf")) + self.intervals.get(src.key, self.interval)
+
+    def refresh(self, sources: Optional[List[Source]] = None) -> Snapshot:
+        due = self.sources if sources is None else sources
+        scraper = IowaEventsScraper(today=self.today())
+        scraper.scrape_all(self.fetcher, sources=due, workers=self.workers, executor=self.executor,
+                           timeout=self.timeout, search=False)
+        now = time.monotonic()
+        for src in due:
+            self.refreshed[src.key] = now
+        self.by_source.update(scraper.by_source)
+        # copies: assign_ids sets .id, and the live snapshot still holds the carried-over events
+        events = [replace(e) for src in self.sources for e in self.by_source.get(src.key, ())
+                  if scraper._is_future_event(e.date)]
+        snapshot = Snapshot(assign_ids(deduplicate(events)), datetime.now().isoformat(), scraper.metrics)
+        self.snapshot = snapshot
+        logger.info(f"Snapshot {snapshot.etag}: {len(snapshot.events)} events "
+                    f"({', '.join(s.key for s in due)} refreshed)")
+        return snapshot
+
+    def run(self):
+        """Refresh due sources until ``stop``; meant for a background thread."""
+        while not self._stop.is_set():
+            now = time.monotonic()
+            due = [src for src in self.sources if self._next_due(src) <= now]
+            if due:
+                try:
+                    self.refresh(due)
+                except Exception:
+                    logger.exception("Refresh failed; keeping the previous snapshot")
+                    for src in due:
+                        self.refreshed[src.key] = now
+            wait = min(self._next_due(src) for src in self.sources) - time.monotonic()
+            self._stop.wait(max(1.0, wait))
+
+    def stop(self):
+        self._stop.set()
+
+
+class EventAPIHandler:
+    """``GET /events``, ``/facets``, ``/health`` and ``/metrics`` over the current snapshot.
+
+    ``/events`` takes any of ``INDEXED_FIELDS`` (repeat or comma-separate for
+    several values), ``q`` (full-text search, best matches first),
+    ``start``/``end`` (YYYY-MM-DD), ``near=lat,lng`` with ``miles`` (default
+    25, results nearest first), ``offset`` and ``limit``.
+    ``/facets`` takes the same filters plus ``fields``; ``/occurrences`` lists
+    the dated instances inside a required ``start``/``end`` window, recurring
+    events expanded, in date order. Responses (except the live ``/health``)
+    carry an ETag derived from the snapshot and the query, honor If-None-Match, and
+    are gzipped when the client accepts it. This is a mixin; ``serve``
+    combines it with ``http.server.BaseHTTPRequestHandler``.
+    """
+
+    service: EventService = None
+    protocol_version = "HTTP/1.1"
+    EVENT_PARAMS = frozenset(INDEXED_FIELDS) | {"q", "start", "end", "near", "miles", "offset", "limit"}
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        params = {k: [x for v in vals for x in v.split(",") if x] for k, vals in parse_qs(parts.query).items()}
+        snap = self.service.snapshot
+        routes = {"/events": self._events, "/facets": self._facets, "/occurrences": self._occurrences,
+                  "/health": self._health, "/metrics": self._metrics}
+        path = parts.path.rstrip("/") or "/"
+        route = routes.get(path)
+        if route is None:
+            return self._send(404, b'{"error": "not found"}')
+        live = path == "/health"   # source ages advance between snapshots, so never memoize
+        key = (parts.path, tuple(sorted((k, tuple(v)) for k, v in params.items())))
+        etag = None if live else f'"{snap.etag}-{hashlib.blake2b(repr(key).encode(), digest_size=4).hexdigest()}"'
+        if etag and path != "/metrics" and etag in self.headers.get("If-None-Match", ""):
+            return self._send(304, b"", etag=etag)
+        try:
+            body = route(snap, params) if live else snap.cached(key, lambda: route(snap, params))
+        except (ValueError, TypeError, OverflowError) as e:
+            return self._send(400, json.dumps({"error": str(e)}).encode())
+        ctype = "text/plain; version=0.0.4" if path == "/metrics" else "application/json"
+        if len(body) > 1024 and "gzip" in self.headers.get("Accept-Encoding", ""):
+            import gzip
+            if live:
+                return self._send(200, gzip.compress(body, 6), etag, ctype, "gzip")
+            return self._send(200, snap.cached(key + ("gzip",), lambda: gzip.compress(body, 6)), etag, ctype, "gzip")
+        self._send(200, body, etag, ctype)
+
+    @staticmethod
+    def _filters(params, allowed) -> Tuple[dict, Optional[date], Optional[date]]:
+        unknown = sorted(params.keys() - allowed)
+        if unknown:
+            raise ValueError(f"unknown parameter(s): {', '.join(unknown)}")
+        filters = {k: v[0] if len(v) == 1 else v for k, v in params.items() if k in INDEXED_FIELDS}
+        start, end = (date.fromisoformat(params[k][0]) if k in params else None for k in ("start", "end"))
+        return filters, start, end
+
+    @staticmethod
+    def _count(params, name) -> Optional[int]:
+        """A non-negative integer parameter, or None when absent."""
+        if name not in params:
+            return None
+        value = int(params[name][0])
+        if value < 0:
+            raise ValueError(f"{name} must be non-negative")
+        return value
+
+    def _events(self, snap: Snapshot, params) -> bytes:
+        filters, start, end = self._filters(params, self.EVENT_PARAMS)
+        events = snap.index.select(start, end, **filters) if (filters or start or end) else snap.events
+        if "q" in params:
+            keep = None if events is snap.events else set(map(id, events))
+            hits = (snap.events[h.position] for h in snap.search.search(" ".join(params["q"]), limit=None))
+            events = [e for e in hits if keep is None or id(e) in keep]
+        if "near" in params:
+            lat, lng = map(float, params["near"])
+            miles = float(params.get("miles", ["25"])[0])
+            if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+                raise ValueError("near must be lat,lng in degrees")
+            keep = None if events is snap.events else set(map(id, events))
+            events = [e for _, e in snap.geo.within(lat, lng, miles) if keep is None or id(e) in keep]
+        elif events is snap.events and "offset" not in params and "limit" not in params:
+            return snap.body
+        offset, limit = self._count(params, "offset") or 0, self._count(params, "limit")
+        buf = io.StringIO()
+        write_json(buf, events[offset:None if limit is None else offset + limit], snap.scraped_at or "", indent=False)
+        return buf.getvalue().encode("utf-8")
+
+    def _occurrences(self, snap: Snapshot, params) -> bytes:
+        filters, start, end = self._filters(params, frozenset(INDEXED_FIELDS) | {"start", "end", "limit"})
+        if not (start and end):
+            raise ValueError("start and end are required")
+        limit = self._count(params, "limit")
+        pairs = iter_occurrences(snap.index.select(start, end, **filters), start, end)
+        rows = [{"start": occ.start.isoformat(), "end": occ.end.isoformat(), "precision": occ.precision,
+                 "id": e.id, "title": e.title, "time": e.time, "city": e.city, "venue": e.venue}
+                for occ, e in itertools.islice(pairs, limit)]
+        return json.dumps({"scraped_at": snap.scraped_at, "occurrences": rows}).encode("utf-8")
+
+    def _facets(self, snap: Snapshot, params) -> bytes:
+        fields = params.pop("fields", ["category", "city"])
+        filters, start, end = self._filters(params, frozenset(INDEXED_FIELDS) | {"start", "end"})
+        facets = snap.index.facets(fields, start, end, **filters)
+        return json.dumps({"scraped_at": snap.scraped_at, "facets": facets}).encode("utf-8")
+
+    def _health(self, snap: Snapshot, params) -> bytes:
+        now = time.monotonic()
+        return json.dumps({"scraped_at": snap.scraped_at, "events": len(snap.events), "etag": snap.etag,
+                           "sources": {k: round(now - t) for k, t in self.service.refreshed.items()}}).encode()
+
+    def _metrics(self, snap: Snapshot, params) -> bytes:
+        return (snap.metrics or RunMetrics()).to_prometheus().encode("utf-8")
+
+    def _send(self, status, body: bytes, etag=None, ctype="application/json", encoding=None):
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Vary", "Accept-Encoding")
+        if etag:
+            self.send_header("ETag", etag)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        logger.debug(f"{self.address_string()} {fmt % args}")
+
+
+def serve(service: EventService, host="127.0.0.1", port=8080):
+    """Load the first snapshot, then serve the API while refreshing in the background."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    service.refresh()
+    handler = type("Handler", (EventAPIHandler, BaseHTTPRequestHandler), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    refresher = threading.Thread(target=service.run, name="refresh", daemon=True)
+    refresher.start()
+    logger.info(f"Serving {len(service.snapshot.events)} events on http://{host}:{server.server_port}/events")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+
+
+def _source_args() -> argparse.ArgumentParser:
+    """Options shared by ``scrape`` and ``serve``: source selection, fetching and execution."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--live", action="store_true", help="also fetch and parse each source's live page")
+    parser.add_argument("--workers", type=int, default=16, help="max concurrent requests overall")
+    parser.add_argument("--per-host", type=int, default=4, help="max concurrent requests per host")
+    parser.add_argument("--timeout", type=float, default=15.0,
+                        help="fetch budget per page in seconds (per-source overrides in --config)")
+    parser.add_argument("--rate", type=float, default=2.0, help="max requests per second per host")
+    parser.add_argument("--burst", type=int, default=4, help="requests a host may receive back to back")
+    parser.add_argument("--retries", type=int, default=3, help="retries after 429/5xx or a dropped connection")
+    parser.add_argument("--ignore-robots", action="store_true", help="skip robots.txt rules and Crawl-delay")
+    parser.add_argument("--source-base", help="fetch from BASE/<host>/<path> instead (local fixture server)")
+    parser.add_argument("--cache", default=".cache/fetch_cache.json", help="conditional-request cache file")
+    parser.add_argument("--no-cache", action="store_true", help="always re-fetch and re-parse every page")
+    parser.add_argument("--cache-max-age", type=float, default=30.0, help="drop cache entries unconfirmed for N days")
+    parser.add_argument("--cache-max-entries", type=int, default=5000, help="keep at most N cache entries")
+    parser.add_argument("--sources", help="comma-separated source keys to run (default: all enabled)")
+    parser.add_argument("--skip", help="comma-separated source keys to leave out")
+    parser.add_argument("--region", help=f"comma-separated regions to run (of {', '.join(REGIONS)}; default: all)")
+    parser.add_argument("--config", help='JSON file like {"sources": {"tbk": false}, "refresh": {"tbk": 86400}, '
+                                         '"timeouts": {"tbk": 30}}')
+    parser.add_argument("--list-sources", action="store_true", help="print the source registry and exit")
+    parser.add_argument("--executor", choices=("thread", "process"), default="thread", help="pool that runs sources")
+    parser.add_argument("--source-workers", type=int, default=8, help="sources run at the same time")
+    parser.add_argument("--source-timeout", type=float, help="drop sources still running after N seconds (checked between pages)")
+    return parser
+
+
+def _output_args() -> argparse.ArgumentParser:
+    """Output options shared by ``scrape`` and ``merge``."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--compact", action="store_true", help="write iowa_events.json without indentation")
+    parser.add_argument("--jsonl", action="store_true", help="also write iowa_events.jsonl (one event per line)")
+    parser.add_argument("--gzip", action="store_true", help="also write .gz copies of the JSON/CSV/JSONL outputs")
+    parser.add_argument("--changes", default="iowa_events_changes.json",
+                        help="changeset against the previous iowa_events.json (added/updated/removed)")
+    parser.add_argument("--no-changes", action="store_true", help="skip writing the changeset")
+    parser.add_argument("--parquet", action="store_true", help="also write iowa_events.parquet (needs pyarrow)")
+    parser.add_argument("--sqlite", metavar="FILE",
+                        help="also upsert events into a SQLite database (keeps run history)")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="write the JSON run report (per-source timings, drops, cache)")
+    parser.add_argument("--prometheus", metavar="FILE", help="write run metrics in Prometheus text format")
+    return parser
+
+
+def _fetcher(args, timeouts: Optional[Dict[str, float]] = None) -> Optional[Fetcher]:
+    if not (args.live or args.source_base):
+        return None
+    cache = None if args.no_cache else FetchCache(args.cache, args.cache_max_age, args.cache_max_entries)
+    return Fetcher(max_workers=args.workers, per_host=args.per_host, timeout=args.timeout, timeouts=timeouts,
+                   base_url=args.source_base, cache=cache, rate=args.rate, burst=args.burst,
+                   retries=args.retries, robots=not args.ignore_robots)
+
+
+def _save_metrics(scraper: IowaEventsScraper, args):
+    if args.metrics:
+        scraper.metrics.to_json(args.metrics)
+    if args.prometheus:
+        scraper.metrics.save_prometheus(args.prometheus)
+
+
+def _export_paths(args) -> List[str]:
+    outputs = ["iowa_events.json", "iowa_events.csv"] + (["iowa_events.jsonl"] if args.jsonl else [])
+    return outputs + ([f"{p}.gz" for p in outputs] if args.gzip else [])
+
+
+def _save_outputs(scraper: IowaEventsScraper, args) -> List[str]:
+    """The export stage of ``scrape``; returns the files written."""
+    with scraper.metrics.stage("export"):
+        if not args.no_changes:
+            scraper.save_changes(args.changes)
+        outputs = _export_paths(args)
+        scraper.export(outputs, indent=not args.compact)
+        scraper.save_search_index()
+        outputs.append("iowa_events.search")
+        if args.parquet:
+            scraper.save_to_parquet()
+        if args.sqlite:
+            scraper.save_to_sqlite(args.sqlite)
+    _save_metrics(scraper, args)
+    return outputs + ([] if args.no_changes else [args.changes])
+
+
+def _tally(events: Iterable[Event], facets: Dict[str, Counter], sample: List[Event], keep=10) -> Iterator[Event]:
+    """Pass ``events`` through, counting ``facets`` fields and keeping the first ``keep``."""
+    for e in events:
+        for name, counts in facets.items():
+            value = getattr(e, name)
+            if value is not None:
+                counts[value] += 1
+        if len(sample) < keep:
+            sample.append(e)
+        yield e
+
+
+def _save_merged(scraper: IowaEventsScraper, args, facets: Dict[str, Counter], sample: List[Event]
+                 ) -> Tuple[int, List[str]]:
+    """The export stage of ``merge``; returns the event count and the files written.
+
+    The k-way merge of the partials streams through the changeset tracker
+    straight into the exports, so the merged events are never held at once.
+    The search index, Parquet and SQLite outputs each re-read the partials.
+    """
+    tracker = None if args.no_changes else ChangeTracker.from_snapshot("iowa_events.json")
+    with scraper.metrics.stage("merge"):
+        events = _tally(merge_partials(args.partials), facets, sample)
+        outputs = _export_paths(args)
+        total = scraper.export(outputs, tracker.watch(events) if tracker else events, indent=not args.compact)
+        if tracker:
+            scraper.save_changes(args.changes, tracker=tracker)
+        scraper.search = SearchIndex.from_events(merge_partials(args.partials))
+        scraper.save_search_index()
+        outputs.append("iowa_events.search")
+        if args.parquet:
+            scraper.save_to_parquet(events=merge_partials(args.partials))
+        if args.sqlite:
+            scraper.save_to_sqlite(args.sqlite, merge_partials(args.partials))
+    scraper.metrics.counters["events_total"] = total
+    _save_metrics(scraper, args)
+    return total, outputs + ([] if args.no_changes else [args.changes])
+
+
+def _print_summary(total: int, facets: Dict[str, Dict[str, int]], sample: List[Event], outputs: List[str]):
     print("\n" + "="*60)
     print("IOWA EVENTS SCRAPER v5 - COMPREHENSIVE")
     print("="*60)
-    print(f"Total events: {len(events)}")
+    print(f"Total events: {total}")
     
-    cats = {}
-    for e in events:
-        cats[e.category] = cats.get(e.category, 0) + 1
+    facets = {name: dict(sorted(counts.items(), key=lambda kv: -kv[1])) for name, counts in facets.items()}
     print("\nBy Category:")
-    for c, n in sorted(cats.items(), key=lambda x: -x[1]):
+    for c, n in facets["category"].items():
         print(f"  {c}: {n}")
     
-    cities = {}
-    for e in events:
-        if e.city:
-            cities[e.city] = cities.get(e.city, 0) + 1
     print("\nTop 15 Cities:")
-    for c, n in sorted(cities.items(), key=lambda x: -x[1])[:15]:
+    for c, n in list(facets["city"].items())[:15]:
         print(f"  {c}: {n}")
     
     print("\nSample Events:")
-    for e in events[:10]:
+    for e in sample:
         print(f"  {e.title} | {e.date} | {e.city}")
     
-    print(f"\nOutput: iowa_events.json, iowa_events.csv")
+    print(f"\nOutput: {', '.join(outputs)}")
+
+
+def main(argv: Optional[List[str]] = None):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Scrape Iowa events into iowa_events.json / iowa_events.csv, "
+                                                 "or serve them over HTTP")
+    commands = parser.add_subparsers(dest="command")
+    shared, outputs = _source_args(), _output_args()
+    scrape = commands.add_parser("scrape", parents=[shared, outputs], help="one-shot scrape to files (default)")
+    scrape.add_argument("--record", metavar="DIR", help="save fetched pages under DIR/<host>/<path>/index.html")
+    scrape.add_argument("--today", type=date.fromisoformat, help="drop events that ended before this YYYY-MM-DD")
+    scrape.add_argument("--shard", metavar="I/N", help="run only shard I of N of the sources and write a partial file")
+    scrape.add_argument("--partial", metavar="FILE", help="partial file for --shard "
+                                                          "(default iowa_events.part-I-of-N.jsonl)")
+    merge_cmd = commands.add_parser("merge", parents=[outputs], help="combine --shard partial files into the outputs")
+    merge_cmd.add_argument("partials", nargs="+", metavar="PARTIAL", help="partial files written by scrape --shard")
+    serve_cmd = commands.add_parser("serve", parents=[shared], help="keep events in memory and serve a JSON API")
+    serve_cmd.add_argument("--host", default="127.0.0.1", help="address to bind")
+    serve_cmd.add_argument("--port", type=int, default=8080, help="port to bind")
+    serve_cmd.add_argument("--interval", type=float, default=3600.0,
+                           help="seconds between refreshes of a source (per-source overrides in --config)")
+    compile_cmd = commands.add_parser("compile-static", help="re-resolve dates in data/static_events.json")
+    compile_cmd.add_argument("--path", default=STATIC_PATH, help="static tables file to rewrite")
+    search_cmd = commands.add_parser("search", help="full-text search over the last scrape's events")
+    search_cmd.add_argument("query", help='words to find, e.g. "hockey des moines" or "jazz fest*"')
+    search_cmd.add_argument("--index", default="iowa_events.search", help="index written by scrape")
+    search_cmd.add_argument("--limit", type=int, default=20, help="number of hits to show")
+    search_cmd.add_argument("--any", action="store_true", help="rank events matching any word, not only all")
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] not in ("scrape", "merge", "serve", "compile-static", "search", "-h", "--help"):
+        argv.insert(0, "scrape")
+    args = parser.parse_args(argv)
+    if args.command == "compile-static":
+        print(f"Resolved {compile_static_tables(args.path)} date strings into {args.path}")
+        return
+    if args.command == "search":
+        if not os.path.isfile(args.index):
+            search_cmd.error(f"{args.index}: no such index; run a scrape first or pass --index")
+        try:
+            index = SearchIndex.open(args.index)
+        except (OSError, ValueError) as e:
+            search_cmd.error(f"{args.index}: {e}")
+        for hit in index.search(args.query, args.limit, match_all=not args.any):
+            print(f"{hit.score:7.3f}  {hit.title} | {hit.date} | {hit.city}  [{hit.id}]")
+        return
+    command = {"scrape": scrape, "merge": merge_cmd}.get(args.command, serve_cmd)
+    if args.command != "serve" and args.parquet:
+        try:
+            _pyarrow()
+        except ImportError as e:
+            command.error(str(e))
+    if args.command == "merge":
+        scraper = IowaEventsScraper()
+        facets, sample = {"category": Counter(), "city": Counter()}, []
+        try:
+            total, outputs = _save_merged(scraper, args, facets, sample)
+        except (OSError, ValueError) as e:
+            command.error(str(e))
+        logger.info(f"Merged {len(args.partials)} partials into {total} events")
+        _print_summary(total, facets, sample, outputs)
+        return
+
+    config = None
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            config = json.load(f)
+    try:
+        sources = select_sources((args.sources or "").split(",") if args.sources else (),
+                                 args.skip.split(",") if args.skip else (), config)
+        intervals, timeouts = source_settings(config, "refresh"), source_settings(config, "timeouts")
+        if args.region:
+            regions = [r.strip().upper() for r in args.region.split(",")]
+            unknown = sorted(set(regions) - set(REGIONS))
+            if unknown:
+                raise ValueError(f"Unknown region(s): {', '.join(unknown)}")
+            sources = [s for s in sources if s.region in regions]
+        shard = parse_shard(args.shard) if getattr(args, "shard", None) else None
+    except ValueError as e:
+        command.error(str(e))
+    if shard:
+        sources = shard_sources(sources, *shard)
+    if args.list_sources:
+        for key, src in SOURCES.items():
+            mark = "x" if src in sources else " "
+            print(f"[{mark}] {key:20s} {src.region:3s} {src.name:32s} {src.url}")
+        return
+
+    if args.command == "serve":
+        fetcher = _fetcher(args, timeouts)
+        service = EventService(fetcher, sources, interval=args.interval,
+                               intervals=intervals, workers=args.source_workers,
+                               executor=args.executor, timeout=args.source_timeout)
+        try:
+            serve(service, args.host, args.port)
+        finally:
+            if fetcher:
+                fetcher.close()
+        return
+
+    scraper = IowaEventsScraper(today=args.today)
+    fetcher = _fetcher(args, timeouts)
+    try:
+        events = scraper.scrape_all(fetcher, record_dir=args.record, sources=sources, workers=args.source_workers,
+                                    executor=args.executor, timeout=args.source_timeout, search=shard is None)
+    finally:
+        if fetcher:
+            fetcher.close()
+    if shard:
+        path = args.partial or f"iowa_events.part-{shard[0]}-of-{shard[1]}.jsonl"
+        with scraper.metrics.stage("export"):
+            write_partial(path, events, {"shard": args.shard, "sources": [s.key for s in sources],
+                                         "today": (args.today or TODAY).isoformat(),
+                                         "scraped_at": datetime.now().isoformat()})
+        logger.info(f"Saved to {path}")
+        _save_metrics(scraper, args)
+        print(f"Shard {args.shard}: {len(events)} events from {len(sources)} sources -> {path}")
+        return
+    outputs = _save_outputs(scraper, args)
+    facets = {name: Counter(v for e in events if (v := getattr(e, name)) is not None) for name in ("category", "city")}
+    _print_summary(len(events), facets, events[:10], outputs)
 
 
 if __name__ == "__main__":
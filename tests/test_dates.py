@@ -0,0 +1,48 @@
+from datetime import date
+
+import pytest
+
+from scraper_v5_comprehensive import DateRange, IowaEventsScraper, parse_date_range
+
+
+@pytest.mark.parametrize("text, start, end, precision", [
+    ("May 2, 2026", date(2026, 5, 2), date(2026, 5, 2), "day"),
+    ("June 6-7, 2026", date(2026, 6, 6), date(2026, 6, 7), "day"),
+    ("January 30 - February 1, 2026", date(2026, 1, 30), date(2026, 2, 1), "day"),
+    ("December 30, 2025 - January 2, 2026", date(2025, 12, 30), date(2026, 1, 2), "day"),
+    ("Dec 28 - Jan 3, 2026", date(2025, 12, 28), date(2026, 1, 3), "day"),
+    ("February 29, 2026", date(2026, 2, 28), date(2026, 2, 28), "day"),
+    ("June 5 & 12, 2026", date(2026, 6, 5), date(2026, 6, 12), "day"),
+    ("June 26, 30 and July 3, 2026", date(2026, 6, 26), date(2026, 7, 3), "day"),
+    ("December 28 & January 4, 2026", date(2025, 12, 28), date(2026, 1, 4), "day"),
+    ("2026-05-02", date(2026, 5, 2), date(2026, 5, 2), "day"),
+    ("2026-05-02T19:00:00", date(2026, 5, 2), date(2026, 5, 2), "day"),
+    ("2026-05-02 - 2026-05-04", date(2026, 5, 2), date(2026, 5, 4), "day"),
+    ("June-August 2026", date(2026, 6, 1), date(2026, 8, 31), "month"),
+    ("November-February 2027", date(2026, 11, 1), date(2027, 2, 28), "month"),
+    ("Winter 2026", date(2025, 12, 1), date(2026, 2, 28), "season"),
+    ("2026 Monthly", date(2026, 1, 1), date(2026, 12, 31), "year"),
+])
+def test_parses(text, start, end, precision):
+    assert parse_date_range(text) == DateRange(start, end, precision)
+
+
+@pytest.mark.parametrize("text", [
+    "May 2, 0000",
+    "Winter 0001",
+    "2026-02-30",
+    "2026-13-01",
+    "2026-05-04 - 2026-05-02",
+    "May 0, 2026",
+    "TBA",
+    "",
+])
+def test_rejects(text):
+    assert parse_date_range(text) is None
+
+
+def test_invalid_year_does_not_fail_the_filter():
+    scraper = IowaEventsScraper(today=date(2026, 6, 1))
+    assert scraper._is_future_event("May 2, 0000")          # unparseable dates are kept
+    assert not scraper._is_future_event("May 5 & 12, 2026")
+    assert scraper._is_future_event("May 26 & June 2, 2026")
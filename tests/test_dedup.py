@@ -0,0 +1,61 @@
+from dataclasses import replace
+
+import pytest
+
+import scraper_v5_comprehensive as scraper
+from scraper_v5_comprehensive import Event, deduplicate, titles_match, title_tokens
+
+
+BASE = Event(title="GameTime Basketball", date="", time=None, location="Bettendorf, IA",
+             venue="TBK", category="kids_athletics", subcategory=None, source="TBK",
+             source_url="https://example.com/gametime", city="Bettendorf")
+
+
+def dated(*dates, **changes):
+    return [replace(BASE, date=d, **changes) for d in dates]
+
+
+def test_same_event_across_sources_merges():
+    events = dated("May 2-3, 2026") + dated("May 2, 2026", source="Travel Iowa")
+    assert len(deduplicate(events)) == 1
+
+
+def test_disjoint_weekends_stay_apart():
+    events = dated("May 2-3, 2026", "June 6-7, 2026", "July 11-12, 2026")
+    assert [e.date for e in deduplicate(events)] == ["May 2-3, 2026", "June 6-7, 2026", "July 11-12, 2026"]
+
+
+def test_year_listing_does_not_chain_weekends():
+    events = dated("May 2-3, 2026", "June 6-7, 2026", "July 11-12, 2026") + dated("2026", source="Travel Iowa")
+    assert len(deduplicate(events)) == 3
+
+
+def test_month_listing_joins_one_cluster():
+    events = dated("March 7-8, 2026", "March 11-12, 2026") + dated("March 2026", source="Travel Iowa")
+    assert [e.date for e in deduplicate(events)] == ["March 7-8, 2026", "March 11-12, 2026"]
+
+
+def test_day_precise_members_share_a_day():
+    # each overlaps the next, but the first and last do not overlap
+    events = dated("May 1-3, 2026", "May 3-5, 2026", "May 5-7, 2026")
+    assert len(deduplicate(events)) == 2
+
+
+def test_exact_repeats_fold():
+    assert len(deduplicate(dated(*["2026"] * 50))) == 1
+    assert len(deduplicate(dated(*["TBA"] * 50))) == 1
+
+
+def test_titles_need_most_words_in_common():
+    assert titles_match(title_tokens("GameTime Basketball"), title_tokens("GameTime Basketball Tournament"))
+    assert not titles_match(title_tokens("Open Gym Night 1"), title_tokens("Open Gym Night 2"))
+
+
+@pytest.mark.parametrize("date", ["TBA", "2026"])
+def test_similar_titles_are_not_compared_pairwise(date, monkeypatch):
+    # every pair shares three of four words; only the rare fourth may make candidates
+    calls = []
+    monkeypatch.setattr(scraper, "titles_match", lambda a, b: calls.append(1) or titles_match(a, b))
+    events = [replace(BASE, title=f"Open Gym Night {i}", date=date) for i in range(6000)]
+    assert len(deduplicate(events)) == 6000
+    assert len(calls) <= len(events)
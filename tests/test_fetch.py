@@ -0,0 +1,231 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import benchmark
+from scraper_v5_comprehensive import FetchCache, Fetcher, FetchResult, parser_key, source_settings
+
+URL = "https://example.com/events"
+
+
+def page(status=200, body=b"<html></html>", etag='"v1"'):
+    return FetchResult("test", URL, status=status, body=body, headers={"ETag": etag})
+
+
+def cache_with_entry(tmp_path, parser):
+    cache = FetchCache(str(tmp_path / "fetch_cache.json"))
+    first = page()
+    _, digest = cache.lookup(first, parser)
+    cache.store(first, digest, parser, [{"title": "Cached"}])
+    return cache
+
+
+def test_not_modified_reuses_events(tmp_path):
+    cache = cache_with_entry(tmp_path, parser_key("microdata"))
+    assert cache.validators(URL) == {"If-None-Match": '"v1"'}
+    events, _ = cache.lookup(page(304, None), parser_key("microdata"))
+    assert events == [{"title": "Cached"}]
+
+
+def test_other_parser_is_a_miss(tmp_path):
+    cache = cache_with_entry(tmp_path, parser_key("microdata"))
+    events, _ = cache.lookup(page(), parser_key("tribe"))
+    assert events is None
+
+
+def test_stale_parser_drops_validators(tmp_path):
+    cache = cache_with_entry(tmp_path, "0:microdata:old")
+    cache.require_parser(URL, parser_key("microdata"))
+    assert cache.validators(URL) == {}
+    assert cache.lookup(page(304, None), parser_key("microdata"))[0] is None
+
+
+def test_parser_key_tracks_version_and_selectors(monkeypatch):
+    import scraper_v5_comprehensive as scraper
+
+    assert parser_key("microdata") != parser_key("tribe")
+    before = parser_key("microdata")
+    parser_key.cache_clear()
+    monkeypatch.setattr(scraper, "PARSER_VERSION", scraper.PARSER_VERSION + 1)
+    assert parser_key("microdata") != before
+    parser_key.cache_clear()
+
+
+def test_replay_keeps_query_string():
+    fetcher = Fetcher(base_url="http://127.0.0.1:8000/")
+    assert fetcher._target("https://example.com/events?page=2&cat=5") == \
+        "http://127.0.0.1:8000/example.com/events?page=2&cat=5"
+    assert fetcher._target("https://example.com") == "http://127.0.0.1:8000/example.com/"
+
+
+def test_timeouts_come_from_config_by_source_key():
+    assert source_settings({"timeouts": {"tbk": 30}}, "timeouts") == {"tbk": 30.0}
+    assert source_settings(None, "timeouts") == {}
+    for bad in ({"nope": 5}, {"tbk": 0}, {"tbk": "30"}, {"tbk": True}):
+        with pytest.raises(ValueError):
+            source_settings({"timeouts": bad}, "timeouts")
+
+
+class Origin(ThreadingHTTPServer):
+    """Scripted origin for ``Fetcher(base_url=...)``: ``routes["/host/path"]`` is
+    a list of ``(status, headers, body)`` answers, served in order (the last
+    one repeats); anything else is a 404. Request headers are recorded."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), OriginHandler)
+        self.routes = {}
+        self.requests = []
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class OriginHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        answers = self.server.routes.get(self.path) or [(404, {}, b"")]
+        status, headers, body = answers.pop(0) if len(answers) > 1 else answers[0]
+        if status == 200 and headers.get("ETag") and self.headers.get("If-None-Match") == headers["ETag"]:
+            status, body = 304, b""
+        self.send_response(status)
+        for k, v in {"Content-Length": str(len(body)), **headers}.items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serving(server):
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def origin():
+    server = serving(Origin())
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fetcher_for(origin):
+    fetchers = []
+
+    def make(**kwargs):
+        fetchers.append(Fetcher(base_url=origin.base_url, **{"backoff": 0.01, **kwargs}))
+        return fetchers[-1]
+
+    yield make
+    for f in fetchers:
+        f.close()
+
+
+def paths(origin, prefix):
+    return [p for p, _ in origin.requests if p.startswith(prefix)]
+
+
+def test_retries_server_errors_with_backoff(origin, fetcher_for):
+    origin.routes["/example.test/events"] = [(500, {}, b""), (502, {}, b""), (200, {}, b"<html>ok</html>")]
+    res = fetcher_for(retries=3).fetch("test", "https://example.test/events")
+    assert res.ok and res.body == b"<html>ok</html>"
+    assert res.attempts == 3
+
+
+def test_gives_up_after_retries(origin, fetcher_for):
+    origin.routes["/example.test/events"] = [(503, {}, b"")]
+    res = fetcher_for(retries=2).fetch("test", "https://example.test/events")
+    assert res.status == 503 and not res.ok
+    assert res.attempts == 3
+    assert len(paths(origin, "/example.test/events")) == 3
+
+
+def test_client_errors_are_not_retried(origin, fetcher_for):
+    origin.routes["/example.test/gone"] = [(404, {}, b"")]
+    res = fetcher_for(retries=3).fetch("test", "https://example.test/gone")
+    assert res.status == 404 and res.attempts == 1
+
+
+def test_retry_after_is_capped_by_the_page_budget(origin, fetcher_for):
+    origin.routes["/example.test/a"] = [(429, {"Retry-After": "3600"}, b"")]
+    origin.routes["/example.test/b"] = [(200, {}, b"ok")]
+    fetcher = fetcher_for(timeout=1.0, retries=5)
+    t = time.monotonic()
+    first = fetcher.fetch("test", "https://example.test/a")
+    second = fetcher.fetch("test", "https://example.test/b")
+    assert time.monotonic() - t < 3
+    assert first.status == 429 and not first.ok
+    assert not second.ok   # the host is paused...
+    time.sleep(1.1)
+    assert fetcher.fetch("test", "https://example.test/b").ok   # ...for one page budget, not an hour
+
+
+def test_throttling_server_is_eventually_satisfied():
+    server = serving(benchmark.ThrottlingServer(limit=2))
+    try:
+        fetcher = Fetcher(base_url=f"http://127.0.0.1:{server.server_port}", rate=100, burst=100, retries=5,
+                          backoff=0.01, timeout=10)
+        results = fetcher.fetch_all([("test", f"https://host0.test/page/{i}") for i in range(4)])
+        fetcher.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert all(r.ok for r in results.values())
+    assert server.counts[429] > 0
+    assert max(r.attempts for r in results.values()) > 1
+
+
+def test_not_modified_reuses_cached_events(origin, fetcher_for, tmp_path):
+    origin.routes["/example.test/events"] = [(200, {"ETag": '"v1"'}, b"<html>v1</html>")]
+    cache = FetchCache(str(tmp_path / "fetch_cache.json"))
+    parser = parser_key("microdata")
+    fetcher = fetcher_for(cache=cache)
+    first = fetcher.fetch("test", "https://example.test/events")
+    assert first.ok and cache.lookup(first, parser)[0] is None
+    cache.store(first, cache.lookup(first, parser)[1], parser, [{"title": "Parsed"}])
+    second = fetcher.fetch("test", "https://example.test/events")
+    assert second.status == 304
+    assert origin.requests[-1][1].get("If-None-Match") == '"v1"'
+    assert cache.lookup(second, parser)[0] == [{"title": "Parsed"}]
+
+
+def test_robots_disallow(origin, fetcher_for):
+    origin.routes["/example.test/robots.txt"] = [(200, {}, b"User-agent: *\nDisallow: /private\n")]
+    origin.routes["/example.test/public"] = [(200, {}, b"ok")]
+    fetcher = fetcher_for()
+    assert fetcher.fetch("test", "https://example.test/public").ok
+    blocked = fetcher.fetch("test", "https://example.test/private/page")
+    assert blocked.error == "disallowed by robots.txt"
+    assert not paths(origin, "/example.test/private")
+    assert len(paths(origin, "/example.test/robots.txt")) == 1   # fetched once per host
+
+
+def test_missing_robots_allows_all(origin, fetcher_for):
+    origin.routes["/example.test/page"] = [(200, {}, b"ok")]
+    assert fetcher_for().fetch("test", "https://example.test/page").ok
+
+
+def test_forbidden_robots_denies_all(origin, fetcher_for):
+    origin.routes["/example.test/robots.txt"] = [(403, {}, b"")]
+    origin.routes["/example.test/page"] = [(200, {}, b"ok")]
+    assert not fetcher_for().fetch("test", "https://example.test/page").ok
+    assert not paths(origin, "/example.test/page")
+
+
+def test_robots_server_error_is_temporary(origin, fetcher_for):
+    origin.routes["/example.test/robots.txt"] = [(503, {}, b""), (200, {}, b"User-agent: *\nDisallow:\n")]
+    origin.routes["/example.test/page"] = [(200, {}, b"ok")]
+    fetcher = fetcher_for()
+    first = fetcher.fetch("test", "https://example.test/page")
+    assert first.error == "robots.txt unavailable (503)"
+    assert not paths(origin, "/example.test/page")
+    assert fetcher.fetch("test", "https://example.test/page").ok   # asked again, not remembered
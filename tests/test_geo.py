@@ -0,0 +1,36 @@
+import math
+
+import pytest
+
+from scraper_v5_comprehensive import Event, GeoIndex
+
+
+def point(lat, lng):
+    return Event(title="Event", date="", time=None, location="", venue="", category="", subcategory=None,
+                 source="Test", source_url="", latitude=lat, longitude=lng)
+
+
+@pytest.fixture
+def geo():
+    return GeoIndex([point(41.5 + i * 0.01, -93.6) for i in range(100)])
+
+
+def test_within_nearest_first(geo):
+    hits = geo.within(41.5, -93.6, 5, limit=3)
+    assert [round(e.latitude, 2) for _, e in hits] == [41.5, 41.51, 41.52]
+
+
+def test_huge_radius_covers_everything(geo):
+    assert len(geo.within(41.6, -93.6, 20000)) == 100
+    assert len(geo.within(41.6, -93.6, 1e300)) == 100
+
+
+@pytest.mark.parametrize("miles", [math.inf, math.nan, -1])
+def test_invalid_radius_rejected(geo, miles):
+    with pytest.raises(ValueError):
+        geo.within(41.6, -93.6, miles)
+
+
+def test_negative_limit_rejected(geo):
+    with pytest.raises(ValueError):
+        geo.within(41.6, -93.6, 25, limit=-1)
@@ -0,0 +1,43 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import scraper_v5_comprehensive as scraper
+
+
+def test_default_geocoder_built_once(monkeypatch):
+    monkeypatch.setattr(scraper, "_GEOCODERS", {})
+    with ThreadPoolExecutor(8) as pool:
+        geocoders = set(map(id, pool.map(lambda _: scraper.default_geocoder(), range(32))))
+    assert len(geocoders) == 1
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parent_geocodes_and_saves_cache(tmp_path, monkeypatch, executor):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(scraper, "_GEOCODERS", {})
+    s = scraper.IowaEventsScraper(today=scraper.date(2026, 1, 1))
+    events = s.scrape_all(executor=executor, search=False)
+    placed = [e for e in events if e.city not in ("Across Iowa", "Statewide", "Various")]
+    assert placed and all(e.latitude is not None for e in placed)
+    counters = s.metrics.counters
+    assert counters["geocode_cache_hits"] + counters["geocode_cache_misses"] > 0
+    assert os.path.exists(tmp_path / ".cache" / "geocode_cache.json")
+
+
+@pytest.mark.parametrize("place", ["Across Iowa", "Statewide", "Various", "Various, IA"])
+def test_placeholder_places_have_no_coordinates(place):
+    geocoder = scraper.Geocoder(cache_path=None)
+    assert geocoder.lookup(place) == (None, None)
+    assert geocoder.lookup("Dubuque", place) == geocoder.lookup("Dubuque")
+
+
+def test_cache_from_another_gazetteer_is_dropped(tmp_path):
+    path = tmp_path / "geocode_cache.json"
+    path.write_text(json.dumps({"Statewide": [42.0751, -93.496]}))   # unversioned cache from older runs
+    geocoder = scraper.Geocoder(cache_path=str(path))
+    assert geocoder.lookup("Statewide") == (None, None)
+    geocoder.save()
+    assert scraper.Geocoder(cache_path=str(path)).cache == {"Statewide": None}
@@ -0,0 +1,22 @@
+import pytest
+
+from scraper_v5_comprehensive import infer_recurrence
+
+
+@pytest.mark.parametrize("title, date, rule", [
+    ("Farmers Market", "July 2026 (Sundays/Mondays)", "FREQ=WEEKLY;BYDAY=MO,SU"),
+    ("Trivia Night (monthly)", "2026", "FREQ=MONTHLY"),
+    ("Weekends at the Zoo", "Summer 2026", "FREQ=WEEKLY;BYDAY=SA,SU"),
+])
+def test_coarse_dates_get_rules(title, date, rule):
+    assert infer_recurrence(title, date) == rule
+
+
+@pytest.mark.parametrize("title, date", [
+    ("Sunday Funday", "May 3, 2026"),
+    ("Weekly Open Gym", "June 6-7, 2026"),
+    ("Monthly Meetup", "TBA"),
+    ("Daily Tours", None),
+])
+def test_exact_or_unknown_dates_get_none(title, date):
+    assert infer_recurrence(title, date) is None
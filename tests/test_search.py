@@ -0,0 +1,14 @@
+import pytest
+
+from scraper_v5_comprehensive import main
+
+
+@pytest.mark.parametrize("content", [None, b"", b"not an index"])
+def test_unusable_index_is_a_usage_error(tmp_path, capsys, content):
+    path = tmp_path / "events.search"
+    if content is not None:
+        path.write_bytes(content)
+    with pytest.raises(SystemExit) as exc:
+        main(["search", "hockey", "--index", str(path)])
+    assert exc.value.code == 2
+    assert f"{path}:" in capsys.readouterr().err
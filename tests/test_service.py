@@ -0,0 +1,90 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scraper_v5_comprehensive import Event, EventAPIHandler, EventService, Snapshot
+
+
+def event(i):
+    return Event(title=f"Event {i}", date="July 4, 2027", time=None, location="Ames, IA", venue="Park",
+                 category="festival", subcategory=None, source="Test", source_url="", city="Ames",
+                 latitude=42.0 + i * 0.01, longitude=-93.6, id=f"e{i}")
+
+
+@pytest.fixture(scope="module")
+def api():
+    service = EventService(sources=[])
+    service.snapshot = Snapshot([event(i) for i in range(10)], "2026-06-01T00:00:00")
+    handler = type("Handler", (EventAPIHandler, BaseHTTPRequestHandler), {"service": service})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def get(path):
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}{path}", timeout=5) as r:
+                return r.status, json.loads(r.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    get.service = service
+    yield get
+    server.shutdown()
+    server.server_close()
+
+
+def test_near_nearest_first(api):
+    status, body = api("/events?near=42.05,-93.6&miles=2&limit=3")
+    assert status == 200
+    assert [e["id"] for e in body["events"]] == ["e5", "e4", "e6"]
+
+
+def test_offset_and_limit(api):
+    status, body = api("/events?offset=8&limit=5")
+    assert status == 200
+    assert [e["id"] for e in body["events"]] == ["e8", "e9"]
+
+
+@pytest.mark.parametrize("query", [
+    "near=42,-93.6&miles=inf", "near=42,-93.6&miles=nan", "near=42,-93.6&miles=-5",
+    "near=inf,-93.6", "near=95,-93.6", "near=42", "limit=-1", "offset=-3", "limit=abc",
+])
+def test_invalid_numbers_are_400(api, query):
+    status, body = api(f"/events?{query}")
+    assert status == 400
+    assert "error" in body
+
+
+def test_huge_radius(api):
+    status, body = api("/events?near=42,-93.6&miles=20000")
+    assert status == 200
+    assert len(body["events"]) == 10
+
+
+def test_health_ages_advance(api):
+    api.service.refreshed["test"] = time.monotonic() - 5
+    assert 5 <= api("/health")[1]["sources"]["test"] <= 6
+    api.service.refreshed["test"] = time.monotonic() - 50
+    assert 50 <= api("/health")[1]["sources"]["test"] <= 51
+
+
+def test_refresh_copies_carried_over_events():
+    import scraper_v5_comprehensive as scraper
+
+    today = scraper.TODAY
+    clock = [scraper.date(2027, 1, 1)]
+    service = EventService(sources=scraper.select_sources(["tbk"]), today=lambda: clock[0])
+    carried = [event(1), event(2)]
+    service.by_source["tbk"] = carried
+    first = service.refresh(sources=[])
+    second = service.refresh(sources=[])
+    assert scraper.TODAY is today
+    assert len(first.events) == 2
+    assert {e.id for e in second.events} == {e.id for e in first.events}
+    assert not {id(e) for e in first.events} & {id(e) for e in carried + second.events}
+    clock[0] = scraper.date(2027, 8, 1)
+    assert service.refresh(sources=[]).events == []
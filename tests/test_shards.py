@@ -0,0 +1,33 @@
+import json
+
+import scraper_v5_comprehensive as scraper
+from scraper_v5_comprehensive import Event, main, write_partial
+
+
+def event(title, city, date="July 4, 2027", source="Test"):
+    return Event(title=title, date=date, time=None, location=f"{city}, IA", venue="Park", category="festival",
+                 subcategory=None, source=source, source_url="", city=city)
+
+
+def test_merge_streams_partials_into_outputs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_partial("a.jsonl", [event("Fireworks Show", "Ames"), event("Rodeo", "Boone")], {"shard": "1/2"})
+    write_partial("b.jsonl", [event("Fireworks Show", "Ames", source="Other"), event("Parade", "Ames")],
+                  {"shard": "2/2"})
+    consumed = []
+    real_export = scraper.export
+
+    def export(paths, events, *args, **kwargs):
+        consumed.append(type(events))
+        return real_export(paths, events, *args, **kwargs)
+
+    monkeypatch.setattr(scraper, "export", export)
+    main(["merge", "a.jsonl", "b.jsonl", "--jsonl"])
+    assert consumed and not issubclass(consumed[0], (list, tuple))
+    with open("iowa_events.json", encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["total_events"] == 3
+    assert sorted(e["title"] for e in data["events"]) == ["Fireworks Show", "Parade", "Rodeo"]
+    with open("iowa_events_changes.json", encoding="utf-8") as f:
+        assert len(json.load(f)["added"]) == 3
+    assert len(scraper.SearchIndex.open("iowa_events.search")) == 3
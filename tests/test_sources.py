@@ -0,0 +1,32 @@
+import threading
+import time
+from datetime import date
+
+from scraper_v5_comprehensive import SOURCES, Page, run_source, run_sources
+
+PAGE = Page("Slow page", "https://example.com/slow", "Ames", "festival")
+
+
+def slow_pages(n, delay):
+    for _ in range(n):
+        time.sleep(delay)
+        yield PAGE, "", []
+
+
+def test_source_past_its_deadline_stops_without_events():
+    res = run_source(SOURCES["tbk"], (), deadline=time.time() - 1)
+    assert "TimeoutError" in res.error and res.events == []
+    assert run_source(SOURCES["tbk"], (), date(2026, 1, 1), deadline=time.time() + 60).events
+
+
+def test_abandoned_worker_stops_at_the_next_page():
+    before = threading.active_count()
+    t = time.perf_counter()
+    results = run_sources([(SOURCES["tbk"], slow_pages(100, 0.05))], workers=1, timeout=0.2)
+    assert results == {} and time.perf_counter() - t < 1
+    # without the deadline the worker would go on for the remaining ~5s of pages
+    for _ in range(40):
+        if threading.active_count() <= before:
+            break
+        time.sleep(0.05)
+    assert threading.active_count() <= before
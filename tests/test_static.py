@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+import scraper_v5_comprehensive as scraper
+from scraper_v5_comprehensive import RESOLVED_DATES, parse_date_range, static_tables
+
+
+@pytest.fixture
+def fresh_tables():
+    def reset():
+        RESOLVED_DATES.clear()
+        parse_date_range.cache_clear()
+        static_tables.cache_clear()
+
+    reset()
+    yield
+    reset()
+
+
+def test_shipped_table_matches_the_parser(fresh_tables):
+    with open(scraper.STATIC_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["parser_version"] == scraper.PARSER_VERSION
+    for text, compiled in data["dates"].items():
+        rng = parse_date_range(text)
+        assert compiled == ([rng.start.isoformat(), rng.end.isoformat(), rng.precision] if rng else None), text
+
+
+def test_stale_table_is_ignored(tmp_path, monkeypatch, fresh_tables):
+    path = tmp_path / "static_events.json"
+    path.write_text(json.dumps({"parser_version": scraper.PARSER_VERSION - 1, "sources": {},
+                                "dates": {"May 2, 2026": ["1999-01-01", "1999-01-01", "day"]}}))
+    monkeypatch.setattr(scraper, "STATIC_PATH", str(path))
+    static_tables()
+    assert parse_date_range("May 2, 2026").start == scraper.date(2026, 5, 2)